@@ -0,0 +1,261 @@
+"""
+Benchmarks do sistema gráfico sobre cenas sintéticas em escala crescente.
+
+Mede leitura/escrita de .obj, tesselação por tipo de objeto, cada algoritmo de clipping,
+projeção 3D e o redraw completo, com caches quentes, no renderizador headless. O resultado
+é emitido em JSON para comparar regressões entre commits.
+
+Uso:
+    python benchmark.py --scales 10 100 1000 --repeat 5 --output resultados.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+from objects import GraphicObject, Point, Line, Polygon, Curve2D, BSpline, Objeto3D, BezierPatch, BSplineSurface
+from descritor_obj import DescritorOBJ
+from clipping import clip_polygons_sutherland_hodgman, clip_polylines
+from scene import Scene
+from headless import HeadlessRenderer
+from viewing import Camera
+
+WINDOW = {"xmin": -367.5, "ymin": -171.5, "xmax": 367.5, "ymax": 171.5, "rotation": 0}
+WORLD_SIZE = 1000.0  # Os objetos são espalhados em [-WORLD_SIZE, WORLD_SIZE], em parte fora da window
+WARM_PREFIXES = ("redraw.", "raster.")  # Casos que recebem uma execução de aquecimento fora da medição
+
+
+def _cube(center, size):
+    cx, cy, cz = center
+    h = size / 2
+    v = [(cx + dx * h, cy + dy * h, cz + dz * h) for dx in (-1, 1) for dy in (-1, 1) for dz in (-1, 1)]
+    edges = [(0, 1), (2, 3), (4, 5), (6, 7), (0, 2), (1, 3), (4, 6), (5, 7), (0, 4), (1, 5), (2, 6), (3, 7)]
+    return [(v[a], v[b]) for a, b in edges]
+
+
+def make_scene(scale, seed=0):
+    """
+    Gera um display file sintético com 'scale' objetos de cada tipo 2D e menos objetos 3D,
+    que são bem mais caros por instância. Retorna {tipo: [objetos]}.
+    """
+    rng = np.random.default_rng(seed)
+
+    def coords(n, dims=2, spread=WORLD_SIZE, radius=60.0):
+        center = rng.uniform(-spread, spread, dims)
+        return [tuple(p) for p in (center + rng.uniform(-radius, radius, (n, dims))).tolist()]
+
+    GraphicObject.reset_counter()
+    scene = {
+        "Ponto": [Point(coords(1)) for _ in range(scale)],
+        "Linha": [Line(coords(2, radius=150.0)) for _ in range(scale)],
+        "Polígono": [Polygon(coords(int(rng.integers(3, 9))), filled=bool(rng.integers(2))) for _ in range(scale)],
+        "Curva Bezier": [Curve2D(coords(7, radius=120.0)) for _ in range(scale)],
+        "B-Spline": [BSpline(coords(8, radius=120.0)) for _ in range(scale)],
+        "Objeto3D": [Objeto3D(_cube(tuple(rng.uniform(-300, 300, 3).tolist()), float(rng.uniform(20, 80))))
+                     for _ in range(max(1, scale // 10))],
+    }
+
+    patches = []
+    for _ in range(max(1, scale // 100)):
+        origin = rng.uniform(-300, 300, 3)
+        patches.append(BezierPatch([tuple((origin + (i * 30, j * 30, rng.uniform(-40, 40))).tolist())
+                                    for i in range(4) for j in range(4)]))
+    scene["Retalho Bézier"] = patches
+
+    surfaces = []
+    for _ in range(max(1, scale // 100)):
+        origin = rng.uniform(-300, 300, 3)
+        surfaces.append(BSplineSurface([[tuple((origin + (i * 25, j * 25, rng.uniform(-40, 40))).tolist())
+                                         for j in range(6)] for i in range(6)]))
+    scene["Superfície B-Spline"] = surfaces
+    return scene
+
+
+def _time(func, repeat, warmup=False):
+    """
+    Executa 'func' 'repeat' vezes e retorna estatísticas em segundos; com 'warmup', antes faz uma
+    execução que não entra na medição. Erros são registrados no resultado (e tornam não nulo o
+    código de saída de main), sem interromper os outros casos.
+    """
+    samples = []
+    try:
+        if warmup:
+            func()
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            samples.append(time.perf_counter() - start)
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+    return {"min": min(samples), "median": float(np.median(samples)), "mean": float(np.mean(samples))}
+
+
+def _io_cases(display_file, directory):
+    path = os.path.join(directory, "cena.obj")
+    DescritorOBJ.write_obj(display_file, path)
+    return {
+        "io.write_obj": (lambda: DescritorOBJ.write_obj(display_file, path), len(display_file)),
+        "io.read_obj": (lambda: DescritorOBJ.read_obj(path), len(display_file)),
+    }
+
+
+def _tessellation_cases(scene):
+    curves, bsplines = scene["Curva Bezier"], scene["B-Spline"]
+    patches, surfaces = scene["Retalho Bézier"], scene["Superfície B-Spline"]
+
+    def curve2d():
+        for curve in curves:
+            for segment in curve.get_bezier_segments():
+                curve.compute_bezier_points(segment)
+
+    def bspline():
+        for curve in bsplines:
+            curve._compute_entire_curve(curve.coordinates)
+
+    def bezier_patch():
+        for patch in patches:
+            patch._compute_surface_points()
+
+    def bspline_surface():
+        for surface in surfaces:
+            surface._compute_all_patches()
+
+    return {
+        "tessellate.Curva Bezier": (curve2d, len(curves)),
+        "tessellate.B-Spline": (bspline, len(bsplines)),
+        "tessellate.Retalho Bézier": (bezier_patch, len(patches)),
+        "tessellate.Superfície B-Spline": (bspline_surface, len(surfaces)),
+    }
+
+
+def _clipping_cases(scene):
+    segments = np.asarray([line.coordinates for line in scene["Linha"]], dtype=float)
+    polygons = scene["Polígono"]
+    vertices = np.concatenate([np.asarray(p.coordinates, dtype=float) for p in polygons])
+    offsets = np.concatenate([[0], np.cumsum([len(p.coordinates) for p in polygons])])
+    curves = scene["Curva Bezier"]
+    polylines = [curve.curve_points for curve in scene["B-Spline"]]
+    polyline_points = np.concatenate(polylines)
+    polyline_offsets = np.concatenate([[0], np.cumsum([len(p) for p in polylines])])
+
+    cases = {
+        f"clip.{name}": ((lambda clipper=clipper: clipper(segments, WINDOW)), len(segments))
+        for name, clipper in Scene.SEGMENT_CLIPPERS.items()
+    }
+    cases["clip.Sutherland-Hodgman"] = (lambda: clip_polygons_sutherland_hodgman(vertices, offsets, WINDOW), len(polygons))
+    cases["clip.polylines"] = (lambda: clip_polylines(polyline_points, polyline_offsets, WINDOW), len(polylines))
+
+    # As curvas guardam o último clip em cache: invalida a geometria a cada repetição para medir o clip
+    def bezier():
+        for curve in curves:
+            curve.invalidate_geometry()
+            curve.clip(WINDOW)
+    cases["clip.Curva Bezier"] = (bezier, len(curves))
+
+    def bezier_analytic():
+        for curve in curves:
+            curve.invalidate_geometry()
+            curve.clip_analytic(WINDOW)
+    cases["clip.Curva Bezier.analytic"] = (bezier_analytic, len(curves))
+    return cases
+
+
+def _projection_cases(scene):
+    points = np.concatenate([obj.vertex_array for obj in scene["Objeto3D"]])
+    cases = {}
+    for projection in ("parallel", "perspective"):
+        camera = Camera()
+        camera.update(WINDOW, projection, Camera.DEFAULT_D)
+        cases[f"project.{projection}"] = ((lambda camera=camera: camera.project(points)), len(points))
+    return cases
+
+
+def _redraw_cases(scene, display_file):
+    """
+    Redraws repetidos com a window parada. Depois do aquecimento (WARM_PREFIXES), os caches de clip
+    das curvas e os itens do canvas retido já estão prontos, então os casos medem o quadro quente
+    mesmo com --repeat 1.
+    """
+    cases = {}
+    for projection in ("parallel", "perspective"):
+        renderer = HeadlessRenderer(display_file, window=WINDOW, projection=projection)
+        cases[f"redraw.warm.{projection}"] = (renderer.redraw, len(display_file))
+    # Custo por tipo, para localizar regressões de um único objeto
+    for type_name, objects in scene.items():
+        renderer = HeadlessRenderer(objects, window=WINDOW)
+        cases[f"redraw.warm.{type_name}"] = (renderer.redraw, len(objects))
+    renderer = HeadlessRenderer(display_file, window=WINDOW)
+    cases["raster.render"] = (renderer.render, len(display_file))
+    return cases
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       cwd=os.path.dirname(os.path.abspath(__file__)),
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(scales=(10, 100, 1000), repeat=5, seed=0, only=None):
+    """Executa todos os benchmarks (ou os que começam com algum prefixo de 'only') e retorna o relatório."""
+    results = []
+    with tempfile.TemporaryDirectory(prefix="benchmark_") as directory:
+        for scale in scales:
+            scene = make_scene(scale, seed)
+            display_file = [obj for objects in scene.values() for obj in objects]
+            cases = {}
+            cases.update(_io_cases(display_file, directory))
+            cases.update(_tessellation_cases(scene))
+            cases.update(_clipping_cases(scene))
+            cases.update(_projection_cases(scene))
+            cases.update(_redraw_cases(scene, display_file))
+
+            for name, (func, size) in cases.items():
+                if only and not any(name.startswith(prefix) for prefix in only):
+                    continue
+                result = {"benchmark": name, "scale": scale, "n": size}
+                result.update(_time(func, repeat, warmup=name.startswith(WARM_PREFIXES)))
+                results.append(result)
+
+    return {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "repeat": repeat,
+        "seed": seed,
+        "results": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks do sistema gráfico em cenas sintéticas.")
+    parser.add_argument("--scales", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", nargs="+", help="prefixos de benchmarks a executar (ex.: clip. redraw.)")
+    parser.add_argument("--output", help="arquivo JSON de saída (padrão: stdout)")
+    args = parser.parse_args(argv)
+
+    report = run(args.scales, args.repeat, args.seed, args.only)
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    failed = [f"{r['benchmark']} (escala {r['scale']})" for r in report["results"] if "error" in r]
+    if failed:
+        print(f"Benchmarks com erro: {', '.join(failed)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
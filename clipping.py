@@ -0,0 +1,350 @@
+import math
+import numpy as np
+
+INSIDE, LEFT, RIGHT, BOTTOM, TOP = 0, 1, 2, 4, 8
+BOUNDS_OUTSIDE, BOUNDS_PARTIAL, BOUNDS_INSIDE = -1, 0, 1
+
+
+def _window_rotation(window, inverse):
+    cx = (window["xmin"] + window["xmax"]) / 2
+    cy = (window["ymin"] + window["ymax"]) / 2
+    theta = window.get("rotation", 0)
+    if inverse:
+        theta = -theta
+    return cx, cy, math.cos(theta), math.sin(theta)
+
+
+def _rotate(points, cx, cy, cos_t, sin_t):
+    points = np.asarray(points, dtype=float)
+    x = points[..., 0] - cx
+    y = points[..., 1] - cy
+    result = np.empty(points.shape[:-1] + (2,))
+    result[..., 0] = x * cos_t - y * sin_t + cx
+    result[..., 1] = x * sin_t + y * cos_t + cy
+    return result
+
+
+def world_to_window_local(points, window):
+    """Converte um array (...,2) de coordenadas mundiais para o sistema local da window (considera rotação)"""
+    return _rotate(points, *_window_rotation(window, inverse=True))
+
+
+def window_local_to_world(points, window):
+    """Converte um array (...,2) de coordenadas locais da window de volta para o sistema mundial"""
+    return _rotate(points, *_window_rotation(window, inverse=False))
+
+
+def classify_bounds(bbox, window):
+    """
+    Aceitação/rejeição trivial de uma bbox (xmin, ymin, xmax, ymax) contra a window (considera rotação).
+    Retorna BOUNDS_INSIDE se a bbox está toda dentro, BOUNDS_OUTSIDE se está toda fora e
+    BOUNDS_PARTIAL caso contrário, quando é preciso clipar vértice a vértice.
+    """
+    xmin, ymin, xmax, ymax = bbox
+    corners = world_to_window_local([(xmin, ymin), (xmax, ymin), (xmax, ymax), (xmin, ymax)], window)
+    lxmin, lymin = corners.min(axis=0)
+    lxmax, lymax = corners.max(axis=0)
+    if lxmax < window["xmin"] or lxmin > window["xmax"] or lymax < window["ymin"] or lymin > window["ymax"]:
+        return BOUNDS_OUTSIDE
+    if lxmin >= window["xmin"] and lxmax <= window["xmax"] and lymin >= window["ymin"] and lymax <= window["ymax"]:
+        return BOUNDS_INSIDE
+    return BOUNDS_PARTIAL
+
+
+def compute_out_codes(x, y, window):
+    """Versão vetorizada do outcode de Cohen-Sutherland para arrays de coordenadas locais."""
+    codes = np.full(np.shape(x), INSIDE, dtype=np.int8)
+    codes |= np.where(x < window["xmin"], LEFT, np.where(x > window["xmax"], RIGHT, INSIDE)).astype(np.int8)
+    codes |= np.where(y < window["ymin"], BOTTOM, np.where(y > window["ymax"], TOP, INSIDE)).astype(np.int8)
+    return codes
+
+
+def clip_segments_cohen_sutherland(segments, window, stats=None):
+    """
+    Clipa um array (N,2,2) de segmentos contra a window usando Cohen-Sutherland em lote.
+    Os outcodes são calculados com operações de bits do NumPy e cada iteração
+    processa apenas os segmentos ainda não resolvidos (nem aceitos nem rejeitados).
+    Se 'stats' (dict) for dado, acumula nele as iterações do laço em "cs_iterations".
+    Retorna (segmentos clipados em coordenadas mundiais, máscara de visibilidade (N,)).
+    """
+    segments = np.asarray(segments, dtype=float).reshape(-1, 2, 2)
+    local = world_to_window_local(segments, window)
+    x1, y1 = local[:, 0, 0], local[:, 0, 1]
+    x2, y2 = local[:, 1, 0], local[:, 1, 1]
+
+    code_start = compute_out_codes(x1, y1, window)
+    code_end = compute_out_codes(x2, y2, window)
+    visible = np.zeros(len(segments), dtype=bool)
+    pending = np.arange(len(segments))
+
+    while pending.size:
+        if stats is not None:
+            stats["cs_iterations"] = stats.get("cs_iterations", 0) + 1
+        cs, ce = code_start[pending], code_end[pending]
+        accepted = (cs | ce) == 0
+        rejected = (cs & ce) != 0
+        visible[pending[accepted]] = True
+        pending = pending[~(accepted | rejected)]
+        if not pending.size:
+            break
+
+        cs, ce = code_start[pending], code_end[pending]
+        px1, py1, px2, py2 = x1[pending], y1[pending], x2[pending], y2[pending]
+        clip_start = cs != 0
+        code_out = np.where(clip_start, cs, ce)
+
+        dx = px2 - px1
+        dy = py2 - py1
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x_top = np.where(dy != 0, px1 + dx * (window["ymax"] - py1) / dy, px1)
+            x_bottom = np.where(dy != 0, px1 + dx * (window["ymin"] - py1) / dy, px1)
+            y_right = np.where(dx != 0, py1 + dy * (window["xmax"] - px1) / dx, py1)
+            y_left = np.where(dx != 0, py1 + dy * (window["xmin"] - px1) / dx, py1)
+
+        # Mesma prioridade de bordas da versão escalar: TOP, BOTTOM, RIGHT, LEFT
+        top = (code_out & TOP) != 0
+        bottom = ~top & ((code_out & BOTTOM) != 0)
+        right = ~top & ~bottom & ((code_out & RIGHT) != 0)
+        x = np.select([top, bottom, right], [x_top, x_bottom, np.full_like(px1, window["xmax"])],
+                      np.full_like(px1, window["xmin"]))
+        y = np.select([top, bottom, right], [np.full_like(px1, window["ymax"]), np.full_like(px1, window["ymin"]), y_right],
+                      y_left)
+
+        start_idx, end_idx = pending[clip_start], pending[~clip_start]
+        x1[start_idx], y1[start_idx] = x[clip_start], y[clip_start]
+        x2[end_idx], y2[end_idx] = x[~clip_start], y[~clip_start]
+        code_start[start_idx] = compute_out_codes(x1[start_idx], y1[start_idx], window)
+        code_end[end_idx] = compute_out_codes(x2[end_idx], y2[end_idx], window)
+
+    clipped = np.stack([np.stack([x1, y1], axis=-1), np.stack([x2, y2], axis=-1)], axis=1)
+    return window_local_to_world(clipped, window), visible
+
+
+def _liang_barsky_parameters(start, delta, window):
+    """
+    Parâmetros u1/u2 de Liang-Barsky de cada segmento start + u * delta, já no sistema local da
+    window, e a máscara dos segmentos com algum trecho visível.
+    """
+    x1, y1 = start[:, 0], start[:, 1]
+    dx, dy = delta[:, 0], delta[:, 1]
+
+    p = np.stack([-dx, dx, -dy, dy], axis=1)
+    q = np.stack([
+        x1 - window["xmin"],
+        window["xmax"] - x1,
+        y1 - window["ymin"],
+        window["ymax"] - y1
+    ], axis=1)
+
+    # Segmentos paralelos a uma borda e fora dela são rejeitados
+    visible = ~((p == 0) & (q < 0)).any(axis=1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        u = q / p
+    u1 = np.max(np.where(p < 0, u, 0.0), axis=1, initial=0.0)
+    u2 = np.min(np.where(p > 0, u, 1.0), axis=1, initial=1.0)
+    visible &= u1 <= u2
+    return u1, u2, visible
+
+
+def clip_segments_liang_barsky(segments, window, stats=None):
+    """
+    Clipa um array (N,2,2) de segmentos contra a window usando Liang-Barsky em lote.
+    Os pares p/q das quatro bordas e os parâmetros u1/u2 são calculados para todos
+    os segmentos de uma vez, no sistema local da window (considera rotação).
+    Não tem laço: 'stats' é aceito apenas pela interface comum com o Cohen-Sutherland.
+    Retorna (segmentos clipados em coordenadas mundiais, máscara de visibilidade (N,)).
+    """
+    segments = np.asarray(segments, dtype=float).reshape(-1, 2, 2)
+    local = world_to_window_local(segments, window)
+    start = local[:, 0]
+    delta = local[:, 1] - start
+    u1, u2, visible = _liang_barsky_parameters(start, delta, window)
+
+    clipped = np.stack([start + u1[:, None] * delta, start + u2[:, None] * delta], axis=1)
+    return window_local_to_world(clipped, window), visible
+
+
+def clip_polyline(points, window):
+    """
+    Clipa uma polilinha (N,2) contra a window (considera rotação). Retorna a lista de trechos
+    visíveis, arrays (M,2) em coordenadas mundiais (ver clip_polylines).
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    if len(points) < 2:
+        local = world_to_window_local(points, window)
+        inside = ((local[:, 0] >= window["xmin"]) & (local[:, 0] <= window["xmax"]) &
+                  (local[:, 1] >= window["ymin"]) & (local[:, 1] <= window["ymax"]))
+        return [points] if inside.all() and len(points) else []
+    return clip_polylines(points, [0, len(points)], window)
+
+
+def clip_polylines(points, offsets, window, clipper=None, stats=None):
+    """
+    Clipa em lote várias polilinhas contra a window (considera rotação), com todas as arestas de
+    uma vez. As polilinhas seguem o mesmo formato CSR do Sutherland-Hodgman: a i-ésima é
+    points[offsets[i]:offsets[i+1]]. Vértices não projetáveis (NaN) tornam invisíveis as arestas
+    que os usam.
+    Sem 'clipper', usa a forma paramétrica de Liang-Barsky direto sobre as arestas; com ele (um
+    clipador de segmentos em lote, como clip_segments_cohen_sutherland, que recebe 'stats'), as
+    arestas são clipadas como segmentos e depois reunidas em trechos.
+    Retorna a lista de trechos visíveis de todas as polilinhas, na ordem: arrays (M,2) em
+    coordenadas mundiais que começam e terminam nos pontos exatos de entrada/saída nas bordas.
+    Um trecho só continua de uma aresta para a seguinte quando o vértice compartilhado está
+    dentro da window.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    offsets = np.asarray(offsets, dtype=np.intp)
+    if len(points) < 2:
+        return []
+    local = world_to_window_local(points, window)
+    start = local[:-1]
+    delta = local[1:] - start
+    visible = np.isfinite(start).all(axis=1) & np.isfinite(delta).all(axis=1)
+
+    # Arestas entre o último vértice de uma polilinha e o primeiro da seguinte não existem;
+    # polilinhas vazias no início ou no fim não têm aresta de fronteira
+    boundaries = offsets[1:-1]
+    boundaries = boundaries[(boundaries > 0) & (boundaries < len(points))]
+    visible[boundaries - 1] = False
+
+    if clipper is None:
+        u1, u2, inside = _liang_barsky_parameters(start, delta, window)
+        visible &= inside
+        edges = np.flatnonzero(visible)
+        if not edges.size:
+            return []
+        # Uma aresta visível abre um novo trecho se não continua a aresta visível anterior
+        begins = np.ones(len(edges), dtype=bool)
+        begins[1:] = (np.diff(edges) != 1) | (u2[edges[:-1]] < 1.0) | (u1[edges[1:]] > 0.0)
+        entry = window_local_to_world(start[edges] + u1[edges, None] * delta[edges], window)
+        exit_ = window_local_to_world(start[edges] + u2[edges, None] * delta[edges], window)
+    else:
+        candidates = np.flatnonzero(visible)
+        if not candidates.size:
+            return []
+        segments = np.stack([points[candidates], points[candidates + 1]], axis=1)
+        clipped, inside = clipper(segments, window, stats)
+        edges = candidates[inside]
+        if not edges.size:
+            return []
+        # Os clipadores não movem extremos dentro da window: o trecho continua quando o vértice
+        # compartilhado com a aresta visível anterior está dentro
+        x, y = local[:, 0], local[:, 1]
+        vertex_inside = (x >= window["xmin"]) & (x <= window["xmax"]) & (y >= window["ymin"]) & (y <= window["ymax"])
+        begins = np.ones(len(edges), dtype=bool)
+        begins[1:] = (np.diff(edges) != 1) | ~vertex_inside[edges[1:]]
+        entry, exit_ = clipped[inside, 0], clipped[inside, 1]
+
+    # Cada aresta contribui com o ponto de saída; as que abrem trecho, também com o de entrada
+    clipped = np.stack([entry, exit_], axis=1).reshape(-1, 2)
+    keep = np.stack([begins, np.ones(len(edges), dtype=bool)], axis=1).ravel()
+    clipped = clipped[keep]
+
+    # Posição do ponto de entrada de cada trecho no array compactado
+    positions = np.cumsum(begins + 1) - (begins + 1)
+    return np.split(clipped, positions[begins][1:])
+
+
+def _clip_polygons_against_boundary(vertices, offsets, axis, value, sign):
+    """Uma etapa do Sutherland-Hodgman para todos os polígonos contra uma única borda."""
+    counts = np.diff(offsets)
+    if not len(vertices):
+        return vertices, np.zeros_like(offsets)
+
+    # Índice do vértice anterior de cada vértice, fechando o anel de cada polígono
+    poly_id = np.repeat(np.arange(len(counts)), counts)
+    prev = np.arange(len(vertices)) - 1
+    nonempty = counts > 0
+    prev[offsets[:-1][nonempty]] = offsets[1:][nonempty] - 1
+
+    current_inside = sign * (vertices[:, axis] - value) >= 0
+    previous_inside = current_inside[prev]
+    crossing = current_inside != previous_inside
+
+    # Interseção paramétrica da aresta (anterior -> atual) com a borda
+    p0 = vertices[prev]
+    edge = vertices - p0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = (value - p0[:, axis]) / edge[:, axis]
+        intersections = p0 + t[:, None] * edge
+    intersections[:, axis] = value
+
+    # Cada vértice emite a interseção (se cruzou a borda) seguida de si mesmo (se está dentro)
+    emitted = crossing.astype(np.intp) + current_inside
+    starts = np.cumsum(emitted) - emitted
+    clipped = np.empty((emitted.sum(), 2))
+    clipped[starts[crossing]] = intersections[crossing]
+    clipped[(starts + crossing)[current_inside]] = vertices[current_inside]
+
+    new_counts = np.bincount(poly_id, weights=emitted, minlength=len(counts)).astype(np.intp)
+    return clipped, np.concatenate([[0], np.cumsum(new_counts)])
+
+
+def clip_polygons_sutherland_hodgman(vertices, offsets, window):
+    """
+    Clipa um conjunto irregular de polígonos contra a window com Sutherland-Hodgman em lote.
+    'vertices' é o array (V,2) com os vértices de todos os polígonos concatenados e
+    'offsets' (P+1,) indica onde cada polígono começa, no estilo CSR.
+    As interseções são calculadas na forma paramétrica no sistema local da window.
+    Retorna (vértices clipados em coordenadas mundiais, novos offsets); polígonos
+    totalmente fora ficam vazios.
+    """
+    vertices = world_to_window_local(np.asarray(vertices, dtype=float).reshape(-1, 2), window)
+    offsets = np.asarray(offsets, dtype=np.intp)
+
+    # Bordas na mesma ordem da versão escalar: esquerda, direita, baixo, topo
+    boundaries = [
+        (0, window["xmin"], 1),
+        (0, window["xmax"], -1),
+        (1, window["ymin"], 1),
+        (1, window["ymax"], -1)
+    ]
+    for axis, value, sign in boundaries:
+        vertices, offsets = _clip_polygons_against_boundary(vertices, offsets, axis, value, sign)
+
+    return window_local_to_world(vertices, window), offsets
+
+
+def bezier_visible_intervals(control_points, window):
+    """
+    Intervalos de parâmetro [t0, t1] em que um segmento cúbico de Bézier (4,2) está dentro da window.
+    As interseções com as quatro bordas são as raízes reais em (0, 1) dos polinômios x(t) - borda e
+    y(t) - borda, no sistema local da window; entre raízes consecutivas a curva fica inteiramente
+    dentro ou fora, o que é decidido pelo ponto médio. Intervalos vizinhos visíveis são unidos, então
+    há exatamente um intervalo por trecho visível da curva.
+    """
+    p0, p1, p2, p3 = world_to_window_local(np.asarray(control_points, dtype=float).reshape(4, 2), window)
+    # Coeficientes na base de potências: a t³ + b t² + c t + d
+    a = -p0 + 3 * p1 - 3 * p2 + p3
+    b = 3 * p0 - 6 * p1 + 3 * p2
+    c = -3 * p0 + 3 * p1
+    d = p0
+
+    params = [0.0, 1.0]
+    for axis, value in ((0, window["xmin"]), (0, window["xmax"]), (1, window["ymin"]), (1, window["ymax"])):
+        coefficients = np.array([a[axis], b[axis], c[axis], d[axis] - value])
+        nonzero = np.flatnonzero(np.abs(coefficients[:-1]) > 1e-12)
+        if not nonzero.size:
+            continue
+        roots = np.roots(coefficients[nonzero[0]:])
+        real = roots[np.abs(roots.imag) < 1e-9].real
+        params.extend(real[(real > 0) & (real < 1)].tolist())
+
+    params = np.unique(params)
+    midpoints = (params[:-1] + params[1:]) / 2
+    t = midpoints[:, None]
+    points = ((a * t + b) * t + c) * t + d
+    eps = 1e-9 * max(window["xmax"] - window["xmin"], window["ymax"] - window["ymin"], 1.0)
+    inside = ((points[:, 0] >= window["xmin"] - eps) & (points[:, 0] <= window["xmax"] + eps) &
+              (points[:, 1] >= window["ymin"] - eps) & (points[:, 1] <= window["ymax"] + eps))
+
+    intervals = []
+    for t0, t1, visible in zip(params[:-1], params[1:], inside):
+        if not visible:
+            continue
+        if intervals and intervals[-1][1] == t0:
+            intervals[-1] = (intervals[-1][0], float(t1))
+        else:
+            intervals.append((float(t0), float(t1)))
+    return intervals
@@ -1,5 +1,5 @@
 from objects import BSplineSurface, GraphicObject, Point, Line, Polygon, Curve2D, BSpline, BezierPatch, Objeto3D, Ponto3D, BezierSurface
-from tkinter import messagebox
+from registry import ObjectRegistry
 
 class DescritorOBJ:
     @staticmethod
@@ -19,7 +19,9 @@ class DescritorOBJ:
         color_map = {}
         fill_map = {}
         elements = []
+        last_bspline = None  # Opções do elemento 'b' da linha anterior, alvo de 'deg' e 'knots'
         bezier_patches = []
+        patch_registry = ObjectRegistry()  # Retalhos por nome, para montar as superfícies 'bs'
         objects_3d = []
         surfaces = []
         current_patches = []
@@ -36,6 +38,21 @@ class DescritorOBJ:
                 if not parts:
                     continue
 
+                # Grau e vetor de nós valem para o elemento 'b' imediatamente anterior
+                if parts[0] in ('deg', 'knots'):
+                    if last_bspline is None:
+                        print(f"Diretiva '{parts[0]}' ignorada: deve vir logo após um elemento 'b'")
+                    else:
+                        try:
+                            if parts[0] == 'deg':
+                                last_bspline['degree'] = int(parts[1])
+                            else:
+                                last_bspline['knots'] = [float(k) for k in parts[1:]]
+                        except (IndexError, ValueError) as e:
+                            print(f"Erro lendo '{parts[0]}': {str(e)}")
+                    continue
+                last_bspline = None
+
                 # Processamento de vértices
                 if parts[0] == 'v':
                     if len(parts[1:]) == 2:
@@ -56,6 +73,7 @@ class DescritorOBJ:
                         if len(control_points) == 16:
                             patch = BezierPatch(control_points)
                             bezier_patches.append(patch)
+                            patch_registry.add(patch)
                     except Exception as e:
                         print(f"Erro ao ler retalho Bézier: {str(e)}")
 
@@ -82,15 +100,14 @@ class DescritorOBJ:
                 # Processamento de objetos 3D
                 elif parts[0] == 'obj3d':
                     try:
-                        indices = [int(p.split('/')[0]) for p in parts[1:]]
+                        indices = [int(p.split('/')[0]) - 1 for p in parts[1:]]
                         if len(indices) % 2 != 0:
                             continue
-                        segments = []
-                        for i in range(0, len(indices), 2):
-                            v1 = vertices[indices[i]-1]
-                            v2 = vertices[indices[i+1]-1]
-                            segments.append((v1, v2))
-                        obj = Objeto3D(segments, "#00aaff")
+                        # Só os vértices usados pelo objeto, com as arestas reindexadas para eles
+                        used = list(dict.fromkeys(indices))
+                        local = {idx: i for i, idx in enumerate(used)}
+                        edges = [(local[indices[i]], local[indices[i+1]]) for i in range(0, len(indices), 2)]
+                        obj = Objeto3D(color="#00aaff", vertices=[vertices[idx] for idx in used], edges=edges)
                         display_file.append(obj)
                     except Exception as e:
                         print(f"Erro lendo Objeto3D: {str(e)}")
@@ -99,7 +116,7 @@ class DescritorOBJ:
                 elif parts[0] == 'bs':
                     try:
                         patch_names = parts[1:]
-                        patches = [p for p in bezier_patches if p.name in patch_names]
+                        patches = [patch_registry.get(name) for name in patch_names if name in patch_registry]
                         if patches:
                             surface = BezierSurface(patches, "#00aaff")
                             surfaces.append(surface)
@@ -108,7 +125,10 @@ class DescritorOBJ:
 
                 # Processamento de elementos gráficos 2D
                 elif parts[0] in ['p', 'l', 'f', 'c', 'b']:
-                    elements.append((parts[0], [int(p.split('/')[0]) for p in parts[1:]]))
+                    options = {}
+                    elements.append((parts[0], [int(p.split('/')[0]) for p in parts[1:]], options))
+                    if parts[0] == 'b':
+                        last_bspline = options
 
                 elif parts[0] == 'bspm':
                     try:
@@ -133,7 +153,7 @@ class DescritorOBJ:
 
         # Processar elementos 2D
         max_counter = 0
-        for i, (elem_type, indices) in enumerate(elements):
+        for i, (elem_type, indices, options) in enumerate(elements):
             coords = [vertices[idx-1] for idx in indices]
             obj = None
             color = "#00aaff"
@@ -148,8 +168,10 @@ class DescritorOBJ:
                     obj = Polygon([(p[0], p[1]) for p in coords], color, False)
                 elif elem_type == 'c' and len(coords) >= 4:
                     obj = Curve2D([(p[0], p[1]) for p in coords], color)
-                elif elem_type == 'b' and len(coords) >= 4:
-                    obj = BSpline([(p[0], p[1]) for p in coords], color)
+                elif elem_type == 'b':
+                    # Pontos insuficientes para o grau ou nós inválidos levantam ValueError
+                    obj = BSpline([(p[0], p[1]) for p in coords], color,
+                                  degree=options.get('degree', 3), knots=options.get('knots'))
 
                 if obj:
                     max_counter = max(max_counter, GraphicObject._counter)
@@ -169,7 +191,8 @@ class DescritorOBJ:
             if isinstance(obj, Polygon) and obj.name in fill_map:
                 obj.filled = fill_map[obj.name]
 
-        GraphicObject._counter = max_counter
+        # Nunca recua o contador, para que novos objetos não repitam nomes dos objetos lidos
+        GraphicObject._counter = max(max_counter, GraphicObject._counter)
         return display_file
     
     @staticmethod
@@ -206,9 +229,8 @@ class DescritorOBJ:
                         add_vertex(p)
                     
                     elif isinstance(obj, Objeto3D):
-                        for p1, p2 in obj.segments:
-                            add_vertex(p1)
-                            add_vertex(p2)
+                        for p in obj.coordinates:
+                            add_vertex(tuple(p))
                     
                     elif isinstance(obj, BezierPatch):
                         for p in obj.coordinates:
@@ -243,10 +265,8 @@ class DescritorOBJ:
                     
                     # Objeto3D
                     elif isinstance(obj, Objeto3D):
-                        indices = []
-                        for p1, p2 in obj.segments:
-                            indices.append(str(vertex_map[p1]))
-                            indices.append(str(vertex_map[p2]))
+                        vertex_indices = [vertex_map[tuple(p)] for p in obj.coordinates]
+                        indices = [str(vertex_indices[i]) for i in obj.edges.ravel().tolist()]
                         f.write(f"obj3d {' '.join(indices)}\n")
                     
                     # BezierPatch
@@ -291,6 +311,11 @@ class DescritorOBJ:
                             p = (coord[0], coord[1], 0.0)
                             indices.append(str(vertex_map[p]))
                         f.write(f"b {' '.join(indices)}\n")
+                        # 'deg' e 'knots' seguem o 'b' a que se referem, sem depender do nome do objeto
+                        if obj.degree != 3:
+                            f.write(f"deg {obj.degree}\n")
+                        if obj.knots is not None:
+                            f.write(f"knots {' '.join(repr(float(k)) for k in obj.knots)}\n")
                     
                     # Linha 2D
                     elif isinstance(obj, Line):
@@ -323,8 +348,8 @@ class DescritorOBJ:
                 f.write("\n# Fim do arquivo\n")
                 return True
 
-        except Exception as e:
+        except Exception:
+            # Quem chama decide como mostrar o erro (o GraphicsSystem usa uma caixa de diálogo)
             import traceback
             traceback.print_exc()
-            messagebox.showerror("Erro", f"Falha ao salvar:\n{str(e)}")
-            return False
\ No newline at end of file
+            raise
\ No newline at end of file
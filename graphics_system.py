@@ -3,17 +3,17 @@ from tkinter import ttk, messagebox
 from tkinter import filedialog
 import numpy as np
 import math
+import time
 from tkinter.colorchooser import askcolor
 from objects import GraphicObject, Point, Line, Polygon, Curve2D, BSpline, Ponto3D, Objeto3D, ObjectType, BezierPatch, BezierSurface, BSplineSurface
 from descritor_obj import DescritorOBJ
+from renderer import RetainedCanvas
+from scene import Scene
 
 
-class GraphicsSystem:
-    CANVAS_WIDTH = 775
-    CANVAS_HEIGHT = 383
-    INSIDE, LEFT, RIGHT, BOTTOM, TOP = 0, 1, 2, 4, 8
+class GraphicsSystem(Scene):
 
-    def __init__(self, root):
+    def __init__(self, root, max_fps=60):
         """
         Parte de interface grafica (parte de Tkinter, botoes inputs e etc, parte visual) foi gerada inteiramente por IAs
 
@@ -30,26 +30,11 @@ class GraphicsSystem:
         self.selected_color = "#00aaff"  # Cor padrão
         
         # Configurações iniciais
-        self.viewport = {"xmin": 20, "ymin": 20, "xmax": self.CANVAS_WIDTH - 20, "ymax": self.CANVAS_HEIGHT - 20}
-
-        vp_width = self.viewport["xmax"] - self.viewport["xmin"]
-        vp_height = self.viewport["ymax"] - self.viewport["ymin"]
-        half_width = vp_width / 2
-        half_height = vp_height / 2
-
-        self.window = {
-            "xmin": -half_width,
-            "ymin": -half_height,
-            "xmax": half_width,
-            "ymax": half_height,
-            "rotation": 0
-        }
-        self.original_window = self.window.copy()
-
-        self.display_file = []
+        self._init_scene(max_fps)
         self.move_step = 0.1
         self.temp_transformations = []  # Lista temporária para transformações
         self.line_clip_method = tk.StringVar(value="CS")
+        self.curve_clip_method = tk.StringVar(value="analytic")
         
         # Configuração do tema
         self.style = ttk.Style()
@@ -126,13 +111,9 @@ class GraphicsSystem:
                               bg="#1a1a1a",
                               highlightthickness=0)
         self.canvas.pack(pady=10, fill=tk.BOTH, expand=True)
+        # Os objetos desenham através do renderizador retido, que reaproveita os itens do canvas
+        self.renderer = RetainedCanvas(self.canvas)
     
-    def _draw_viewport(self):
-        self.canvas.create_rectangle(
-            self.viewport["xmin"], self.viewport["ymin"],
-            self.viewport["xmax"], self.viewport["ymax"],
-            outline="white", dash=(4, 2))
-
     def _create_object_list(self):
         self.list_frame = ttk.Frame(self.content_frame)
         self.list_frame.pack(side=tk.RIGHT, fill=tk.Y, padx=10)
@@ -173,7 +154,17 @@ class GraphicsSystem:
                 command=lambda: self.zoom_manual(1.1)).grid(row=2, column=0, pady=2)
         ttk.Button(view_frame, text="Resetar", 
                 command=self.reset_view).grid(row=3, column=0, pady=2)
-    
+
+        self.stats_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(view_frame, text="Estatísticas", variable=self.stats_var,
+                        command=self.toggle_stats_overlay).grid(row=4, column=0, pady=2)
+
+    def toggle_stats_overlay(self):
+        if self.stats_var.get():
+            self.enable_profiling(overlay=True)
+        else:
+            self.disable_profiling()
+
     def _create_projection_controls(self):
         projection_frame = ttk.Frame(self.control_frame)
         projection_frame.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
@@ -378,11 +369,29 @@ class GraphicsSystem:
             ttk.Radiobutton(clip_radio_frame, text="Cohen-Sutherland", variable=self.line_clip_method, value="CS").pack(side=tk.LEFT, padx=5)
             ttk.Radiobutton(clip_radio_frame, text="Liang-Barsky", variable=self.line_clip_method, value="LB").pack(side=tk.LEFT, padx=5)
         
+        elif type == ObjectType.CURVA_BEZIER:
+            ttk.Label(tab, text="Técnica de Clipagem de Curvas:", style="Title.TLabel").pack(pady=(10, 0))
+            clip_radio_frame = ttk.Frame(tab)
+            clip_radio_frame.pack(pady=5)
+
+            ttk.Radiobutton(clip_radio_frame, text="Analítica", variable=self.curve_clip_method, value="analytic").pack(side=tk.LEFT, padx=5)
+            ttk.Radiobutton(clip_radio_frame, text="Subdivisão", variable=self.curve_clip_method, value="subdivision").pack(side=tk.LEFT, padx=5)
+
         elif type == ObjectType.POLIGONO:
             self.fill_var = tk.BooleanVar()
             fill_checkbox = ttk.Checkbutton(tab, text="Preencher Polígono", variable=self.fill_var)
             fill_checkbox.pack(side=tk.TOP, pady=5)
 
+        elif type == ObjectType.B_SPLINE:
+            params_frame = ttk.Frame(tab)
+            params_frame.pack(side=tk.TOP, pady=5)
+            self.bspline_degree_var = tk.StringVar(value="3")
+            self.bspline_knots_var = tk.StringVar()
+            ttk.Label(params_frame, text="Grau:").pack(side=tk.LEFT, padx=2)
+            ttk.Entry(params_frame, textvariable=self.bspline_degree_var, width=4).pack(side=tk.LEFT, padx=2)
+            ttk.Label(params_frame, text="Nós (opcional, \"t0, t1, ...\"):").pack(side=tk.LEFT, padx=2)
+            ttk.Entry(params_frame, textvariable=self.bspline_knots_var, width=30).pack(side=tk.LEFT, padx=2)
+
         coord_entry = ttk.Entry(tab, width=40)
         coord_entry.pack(side=tk.TOP, padx=5, fill=tk.X, expand=False)
 
@@ -464,7 +473,7 @@ class GraphicsSystem:
         self.window["ymin"] = -half_height
         self.window["ymax"] = half_height
 
-        self.redraw()
+        self.request_redraw()
         
     def _update_object_list(self):
         self.object_tree.delete(*self.object_tree.get_children())
@@ -492,7 +501,7 @@ class GraphicsSystem:
         self.window["xmax"] += dx_rot
         self.window["ymin"] += dy_rot
         self.window["ymax"] += dy_rot
-        self.redraw()
+        self.request_redraw()
 
     def save_obj(self):
         filename = filedialog.asksaveasfilename(
@@ -512,7 +521,7 @@ class GraphicsSystem:
         filename = filedialog.askopenfilename(filetypes=[("OBJ files", "*.obj")])
         if filename:
             try:
-                self.display_file = DescritorOBJ.read_obj(filename)
+                self._set_display_file(DescritorOBJ.read_obj(filename))
                 self._update_object_list()
                 self.redraw()
             except Exception as e:
@@ -523,7 +532,7 @@ class GraphicsSystem:
         self.redraw()
 
     def clear_canvas(self):
-        self.display_file = []
+        self._set_display_file([])
         GraphicObject.reset_counter()
         self._update_object_list()
         self.redraw()
@@ -535,13 +544,12 @@ class GraphicsSystem:
             item_values = self.object_tree.item(selected_item, "values")
             selected_name = item_values[1]  # Obtém o nome do objeto
             
-            # Procura o objeto pelo nome na display_file
-            for i, obj in enumerate(self.display_file):
-                if obj.name == selected_name:
-                    del self.display_file[i]
-                    self._update_object_list()
-                    self.redraw()
-                    break
+            # Procura o objeto pelo nome no registro
+            obj = self.registry.get(selected_name)
+            if obj is not None:
+                self._remove_object(obj)
+                self._update_object_list()
+                self.redraw()
 
     def create_transformations_menu(self):
         selected_items = self.object_tree.selection()
@@ -551,7 +559,7 @@ class GraphicsSystem:
             selected_name = item_values[1]
 
             # Verifica se o objeto é 2D ou 3D
-            obj = next((o for o in self.display_file if o.name == selected_name), None)
+            obj = self.registry.get(selected_name)
             is_3d = isinstance(obj, (Ponto3D, Objeto3D))
 
             # Janela temporária para coletar transformações
@@ -612,37 +620,37 @@ class GraphicsSystem:
             combined_matrix = combined_matrix @ matrix
 
         # Aplica a matriz final ao objeto
-        for obj in self.display_file:
-            if obj.name == selected_name:
-                new_coords = []
+        obj = self.registry.get(selected_name)
+        if obj is not None:
+            new_coords = []
                 
-                # Verifica o tipo de objeto
-                if isinstance(obj, (Ponto3D, Objeto3D, BezierPatch, BezierSurface)):
-                    # Processamento para objetos 3D
-                    for coord in obj.coordinates:
-                        x, y, z = coord[:3]  # Pega os 3 primeiros valores
-                        point = np.array([x, y, z, 1])  # Coordenada homogênea
-                        transformed_point = point @ combined_matrix
-                        new_coords.append((
-                            transformed_point[0], 
-                            transformed_point[1], 
-                            transformed_point[2]
-                        ))
+            # Verifica o tipo de objeto
+            if isinstance(obj, (Ponto3D, Objeto3D, BezierPatch, BezierSurface, BSplineSurface)):
+                # Processamento para objetos 3D
+                for coord in obj.coordinates:
+                    x, y, z = coord[:3]  # Pega os 3 primeiros valores
+                    point = np.array([x, y, z, 1])  # Coordenada homogênea
+                    transformed_point = point @ combined_matrix
+                    new_coords.append((
+                        transformed_point[0], 
+                        transformed_point[1], 
+                        transformed_point[2]
+                    ))
                         
-                else:
-                    # Processamento para objetos 2D
-                    for coord in obj.coordinates:
-                        x, y = coord[:2]  # Pega apenas x,y
-                        point = np.array([x, y, 0, 1])  # Z=0 para 2D
-                        transformed_point = point @ combined_matrix
-                        new_coords.append((
-                            transformed_point[0], 
-                            transformed_point[1]
-                        ))
+            else:
+                # Processamento para objetos 2D
+                for coord in obj.coordinates:
+                    x, y = coord[:2]  # Pega apenas x,y
+                    point = np.array([x, y, 0, 1])  # Z=0 para 2D
+                    transformed_point = point @ combined_matrix
+                    new_coords.append((
+                        transformed_point[0], 
+                        transformed_point[1]
+                    ))
                 
-                obj.coordinates = new_coords
-                self.redraw()
-                break
+            obj.coordinates = new_coords
+            self._object_changed(obj)
+            self.redraw()
         
         window.destroy()
 
@@ -695,10 +703,7 @@ class GraphicsSystem:
         elif trans_type == "Escalonamento":
             sx = params["sx"]
             sy = params["sy"]
-            for obj in self.display_file:
-                if obj.name == selected_name:
-                    cx, cy = self.get_object_center(obj.coordinates)
-                    break
+            cx, cy = self.registry.get(selected_name).centroid
             return np.array([
                 [1, 0, 0],
                 [0, 1, 0],
@@ -718,10 +723,7 @@ class GraphicsSystem:
             if pivot_type == "Em torno da origem":
                 cx, cy = 0.0, 0.0
             elif pivot_type == "Em torno do centro do objeto":
-                for obj in self.display_file:
-                    if obj.name == selected_name:
-                        cx, cy = self.get_object_center(obj.coordinates)
-                        break
+                cx, cy = self.registry.get(selected_name).centroid
             else:
                 cx = params["x"]
                 cy = params["y"]
@@ -824,121 +826,6 @@ class GraphicsSystem:
         pivot_combobox.bind("<<ComboboxSelected>>", update_point_entry)
         update_point_entry(None)
 
-    def get_object_center(self, object_coordinates):
-        total_x, total_y = zip(*object_coordinates)
-        array_length = len(object_coordinates)
-        cx = sum(total_x) / array_length
-        cy = sum(total_y) / array_length
-        return cx, cy
-
-    def viewport_transform(self, x, y, z=None):
-        if z is None:  # Transformação 2D
-            # Calcular centro da window
-            cx = (self.window["xmin"] + self.window["xmax"]) / 2
-            cy = (self.window["ymin"] + self.window["ymax"]) / 2
-            
-            # Aplicar rotação inversa
-            theta = -self.window["rotation"]
-            x_rot = (x - cx) * math.cos(theta) - (y - cy) * math.sin(theta) + cx
-            y_rot = (x - cx) * math.sin(theta) + (y - cy) * math.cos(theta) + cy
-            
-            # Mapear para viewport
-            window_width = self.window["xmax"] - self.window["xmin"]
-            window_height = self.window["ymax"] - self.window["ymin"]
-            viewport_width = self.viewport["xmax"] - self.viewport["xmin"]
-            viewport_height = self.viewport["ymax"] - self.viewport["ymin"]
-            
-            scale_x = viewport_width / window_width
-            scale_y = viewport_height / window_height
-            scale = min(scale_x, scale_y)
-            
-            vx = self.viewport["xmin"] + (x_rot - self.window["xmin"]) * scale
-            vy = self.viewport["ymax"] - (y_rot - self.window["ymin"]) * scale
-            
-            return (vx, vy)
-        else:  # Transformação 3D
-            """
-            Solicitamos a ajuda de IA para aprender a fazer transformações 3D
-
-            DOC IAgen:
-            DeepSeek https://chat.deepseek.com
-
-            Prompt usado:
-            "Como fazer a transformação de um ponto 3D para uma viewport 2D, considerando rotação e perspectiva?"
-            """
-            try:
-                d = float(self.d_entry.get())
-            except ValueError:
-                d = 200
-
-            vrp = np.array([
-                (self.window["xmin"] + self.window["xmax"]) / 2,  # Centro X
-                (self.window["ymin"] + self.window["ymax"]) / 2,  # Centro Y
-                0  # Assumindo VRP no plano XY
-            ])
-            
-            # VPN (View Plane Normal) - apontando para o observador
-            vpn = np.array([0, 0, 1])
-            
-            # Vetor View Up (VUP) - orientação "para cima"
-            vup = np.array([0, 1, 0])
-            
-            # Calcula os eixos do sistema de coordenadas da view
-            n = vpn / np.linalg.norm(vpn)
-            u = np.cross(vup, n)
-            u = u / np.linalg.norm(u)
-            v = np.cross(n, u)
-            
-            # Matriz de rotação para alinhar com o sistema de coordenadas da view
-            R = np.array([
-                [u[0], u[1], u[2], 0],
-                [v[0], v[1], v[2], 0],
-                [n[0], n[1], n[2], 0],
-                [0,    0,    0,    1]
-            ])
-            
-            # Matriz de translação para mover o VRP para a origem
-            T = np.array([
-                [1, 0, 0, -vrp[0]],
-                [0, 1, 0, -vrp[1]],
-                [0, 0, 1, -vrp[2]],
-                [0, 0, 0, 1]
-            ])
-            
-            # Transformação completa (primeiro translação, depois rotação)
-            M = R @ T
-            
-            # Aplica a transformação ao ponto
-            point = np.array([x, y, z, 1])
-            transformed = M @ point
-            
-            if self.projection_type.get() == "parallel":
-                # Projeção Paralela Ortogonal - simplesmente descarta a coordenada Z
-                x_proj = transformed[0]
-                y_proj = transformed[1]
-            else:
-                # Projeção Perspectiva
-                if transformed[2] + d == 0:
-                    transformed[2] = -d + 0.0001
-                    
-                x_proj = (transformed[0] * d) / (transformed[2] + d)
-                y_proj = (transformed[1] * d) / (transformed[2] + d)
-            
-            # Mapeia para a viewport
-            window_width = self.window["xmax"] - self.window["xmin"]
-            window_height = self.window["ymax"] - self.window["ymin"]
-            viewport_width = self.viewport["xmax"] - self.viewport["xmin"]
-            viewport_height = self.viewport["ymax"] - self.viewport["ymin"]
-            
-            scale_x = viewport_width / window_width
-            scale_y = viewport_height / window_height
-            scale = min(scale_x, scale_y)
-            
-            vx = self.viewport["xmin"] + (x_proj - self.window["xmin"]) * scale
-            vy = self.viewport["ymax"] - (y_proj - self.window["ymin"]) * scale
-            
-            return (vx, vy)
-    
     def generate_matrix_3d(self, trans_type, params, selected_name):
         if trans_type == "Translação 3D":
             dx = params["dx"]
@@ -957,20 +844,12 @@ class GraphicsSystem:
             sz = params["sz"]
             
             # Encontra o centro do objeto
-            obj = next((o for o in self.display_file if o.name == selected_name), None)
+            obj = self.registry.get(selected_name)
             if not obj:
                 return np.identity(4)
                 
-            if isinstance(obj, Ponto3D):
-                cx, cy, cz = obj.coordinates[0]
-            elif isinstance(obj, Objeto3D):
-                # Calcula o centro médio de todos os pontos
-                all_points = []
-                for segment in obj.segments:
-                    all_points.extend(segment)
-                cx = sum(p[0] for p in all_points) / len(all_points)
-                cy = sum(p[1] for p in all_points) / len(all_points)
-                cz = sum(p[2] for p in all_points) / len(all_points)
+            # Centro médio dos vértices, em cache no objeto
+            cx, cy, cz = obj.centroid
             
             return np.array([
                 [1, 0, 0, 0],
@@ -998,19 +877,11 @@ class GraphicsSystem:
             if pivot_type == "Em torno da origem":
                 cx, cy, cz = 0, 0, 0
             else:
-                obj = next((o for o in self.display_file if o.name == selected_name), None)
+                obj = self.registry.get(selected_name)
                 if not obj:
                     return np.identity(4)
                     
-                if isinstance(obj, Ponto3D):
-                    cx, cy, cz = obj.coordinates[0]
-                elif isinstance(obj, Objeto3D):
-                    all_points = []
-                    for segment in obj.segments:
-                        all_points.extend(segment)
-                    cx = sum(p[0] for p in all_points) / len(all_points)
-                    cy = sum(p[1] for p in all_points) / len(all_points)
-                    cz = sum(p[2] for p in all_points) / len(all_points)
+                cx, cy, cz = obj.centroid
             
             # Matriz de translação para a origem
             T1 = np.array([
@@ -1127,39 +998,39 @@ class GraphicsSystem:
             combined_matrix = combined_matrix @ matrix
 
         # Aplicar transformação ao objeto selecionado
-        for obj in self.display_file:
-            if obj.name == selected_name:
-                new_coords = []
+        obj = self.registry.get(selected_name)
+        if obj is not None:
+            new_coords = []
                 
-                # Verificar tipo de objeto
-                if isinstance(obj, (Ponto3D, Objeto3D, BezierPatch, BezierSurface)):
-                    # Processar coordenadas 3D
-                    for coord in obj.coordinates:
-                        # Garantir que temos pelo menos 3 coordenadas (x,y,z)
-                        x = coord[0]
-                        y = coord[1] if len(coord) > 1 else 0
-                        z = coord[2] if len(coord) > 2 else 0
+            # Verificar tipo de objeto
+            if isinstance(obj, (Ponto3D, Objeto3D, BezierPatch, BezierSurface, BSplineSurface)):
+                # Processar coordenadas 3D
+                for coord in obj.coordinates:
+                    # Garantir que temos pelo menos 3 coordenadas (x,y,z)
+                    x = coord[0]
+                    y = coord[1] if len(coord) > 1 else 0
+                    z = coord[2] if len(coord) > 2 else 0
                         
-                        # Aplicar transformação
-                        point = np.array([x, y, z, 1])
-                        transformed = combined_matrix @ point
-                        new_coords.append((transformed[0], transformed[1], transformed[2]))
+                    # Aplicar transformação
+                    point = np.array([x, y, z, 1])
+                    transformed = combined_matrix @ point
+                    new_coords.append((transformed[0], transformed[1], transformed[2]))
                         
-                else:
-                    # Processar coordenadas 2D
-                    for coord in obj.coordinates:
-                        # Garantir que temos pelo menos 2 coordenadas (x,y)
-                        x = coord[0]
-                        y = coord[1] if len(coord) > 1 else 0
+            else:
+                # Processar coordenadas 2D
+                for coord in obj.coordinates:
+                    # Garantir que temos pelo menos 2 coordenadas (x,y)
+                    x = coord[0]
+                    y = coord[1] if len(coord) > 1 else 0
                         
-                        # Aplicar transformação com Z=0
-                        point = np.array([x, y, 0, 1])
-                        transformed = combined_matrix @ point
-                        new_coords.append((transformed[0], transformed[1]))
+                    # Aplicar transformação com Z=0
+                    point = np.array([x, y, 0, 1])
+                    transformed = combined_matrix @ point
+                    new_coords.append((transformed[0], transformed[1]))
                 
-                # Atualizar coordenadas do objeto
-                obj.coordinates = new_coords
-                break
+            # Atualizar coordenadas do objeto
+            obj.coordinates = new_coords
+            self._object_changed(obj)
 
         self.redraw()
         window.destroy()
@@ -1168,7 +1039,7 @@ class GraphicsSystem:
         coords = self.parse_input(coords_entry)
         if len(coords) == 1:
             ponto = Point(coords, color=self.selected_color)
-            self.display_file.append(ponto)
+            self._add_object(ponto)
             self._update_object_list()
             self.redraw()
         else:
@@ -1178,7 +1049,7 @@ class GraphicsSystem:
         coords = self.parse_input(coords_entry)
         if len(coords) == 2:
             linha = Line(coords, color=self.selected_color)
-            self.display_file.append(linha)
+            self._add_object(linha)
             self._update_object_list()
             self.redraw()
         else:
@@ -1188,7 +1059,7 @@ class GraphicsSystem:
         coords = self.parse_input(coords_entry)
         if len(coords) >= 3:
             poligono = Polygon(coords, color=self.selected_color, filled=self.fill_var.get())
-            self.display_file.append(poligono)
+            self._add_object(poligono)
             self.fill_var.set(False)
             self._update_object_list()
             self.redraw()
@@ -1199,7 +1070,7 @@ class GraphicsSystem:
         coords = self.parse_input(coords_entry)
         if len(coords) >= 4 and (len(coords) - 4) % 3 == 0:
             curva = Curve2D(coords, color=self.selected_color)
-            self.display_file.append(curva)
+            self._add_object(curva)
             self._update_object_list()
             self.redraw()
         else:
@@ -1208,8 +1079,11 @@ class GraphicsSystem:
     def add_bspline(self, coords_entry):
         coords = self.parse_input(coords_entry)
         try:
-            bspline = BSpline(coords, color=self.selected_color)
-            self.display_file.append(bspline)
+            degree = int(self.bspline_degree_var.get())
+            knots_str = self.bspline_knots_var.get().strip()
+            knots = [float(k) for k in knots_str.split(",")] if knots_str else None
+            bspline = BSpline(coords, color=self.selected_color, degree=degree, knots=knots)
+            self._add_object(bspline)
             self._update_object_list()
             self.redraw()
         except Exception as e:
@@ -1220,7 +1094,7 @@ class GraphicsSystem:
         try:
             if len(coords) == 3:
                 ponto3d = Ponto3D(coords, color=self.selected_color)
-                self.display_file.append(ponto3d)
+                self._add_object(ponto3d)
                 self._update_object_list()
                 self.redraw()
             else:
@@ -1233,7 +1107,7 @@ class GraphicsSystem:
             segments = eval(segments_entry.get().strip())
             if len(segments) > 0 and all(len(seg) == 2 for seg in segments):
                 objeto = Objeto3D(segments, color=self.selected_color)
-                self.display_file.append(objeto)
+                self._add_object(objeto)
                 self._update_object_list()
                 self.redraw()
             else:
@@ -1276,12 +1150,12 @@ class GraphicsSystem:
             if not all(len(row) == num_cols for row in control_matrix):
                 raise ValueError("Todas as linhas da matriz devem ter o mesmo número de pontos.")
 
-            if not (4 <= num_rows <= 20 and 4 <= num_cols <= 20):
-                raise ValueError("As dimensões da matriz devem estar entre 4x4 e 20x20.")
+            if num_rows < 4 or num_cols < 4:
+                raise ValueError("A matriz de controle deve ter dimensão mínima de 4x4.")
 
             # Criação e adição do objeto
             surface = BSplineSurface(control_matrix, self.selected_color)
-            self.display_file.append(surface)
+            self._add_object(surface)
             self._update_object_list()
             self.redraw()
             messagebox.showinfo("Sucesso", f"Superfície B-Spline '{surface.name}' adicionada.")
@@ -1329,133 +1203,13 @@ class GraphicsSystem:
             
             # Cria e adiciona o retalho
             patch = BezierPatch(control_points, self.selected_color)
-            self.display_file.append(patch)
+            self._add_object(patch)
             self._update_object_list()
             self.redraw()
             
         except Exception as e:
             messagebox.showerror("Erro", f"Entrada inválida:\n{str(e)}")
 
-    def clip_object(self, obj):
-        if isinstance(obj, Point): # Objeto 2D Ponto
-            return obj if self.clip_point(obj) else None
-        elif isinstance(obj, Line): # Objeto 2D Linha
-            return self.clip_line(obj)
-        elif isinstance(obj, Polygon): # Objeto 2D Polígono
-            return self.clip_polygon(obj)
-        elif isinstance(obj, Curve2D):
-            obj.clip({
-                "xmin": self.window["xmin"], "ymin": self.window["ymin"],
-                "xmax": self.window["xmax"], "ymax": self.window["ymax"]
-            })
-            return obj
-        elif isinstance(obj, BSpline):
-            obj.clip({
-                "xmin": self.window["xmin"], "ymin": self.window["ymin"],
-                "xmax": self.window["xmax"], "ymax": self.window["ymax"]
-            })
-            return obj
-
-        elif isinstance(obj, Ponto3D):
-            x, y, z = obj.coordinates[0] 
-            projected_coords = self.get_projected_2d_coords(x, y, z)
-            if projected_coords:
-                # Cria um objeto Ponto 2D temporário para clipping
-                # As coordenadas de 'projected_coords' já estão no "espaço da window"
-                temp_point_2d = Point([projected_coords], color=obj.color)
-                if self.clip_point(temp_point_2d): # clip_point usa self.window
-                    # Retorna um novo objeto Point 2D com as coordenadas projetadas
-                    # O nome do objeto original é perdido aqui, mas é para desenho.
-                    return Point([projected_coords], color=obj.color) 
-            return None
-
-        elif isinstance(obj, Objeto3D):
-            clipped_2d_lines = []
-            for p1_3d, p2_3d in obj.segments:
-                # Projeta os dois pontos do segmento 3D para 2D
-                p1_2d_proj = self.get_projected_2d_coords(p1_3d[0], p1_3d[1], p1_3d[2])
-                p2_2d_proj = self.get_projected_2d_coords(p2_3d[0], p2_3d[1], p2_3d[2])
-
-                if p1_2d_proj and p2_2d_proj: # Se ambos os pontos puderam ser projetados
-                    # Cria um objeto Linha 2D temporário com as coordenadas projetadas
-                    line_to_clip = Line([p1_2d_proj, p2_2d_proj], color=obj.color)
-                    # Aplica o clipping 2D (Cohen-Sutherland ou Liang-Barsky)
-                    clipped_line_segment = self.clip_line(line_to_clip) 
-                    if clipped_line_segment:
-                        clipped_2d_lines.append(clipped_line_segment)
-            return clipped_2d_lines # Retorna uma lista de objetos Linha 2D clipados
-        
-        elif isinstance(obj, (BezierPatch, BSplineSurface)):
-            clipped_surface_lines = []
-            
-            # Determina a origem dos pontos da malha (pode ser de um BezierPatch ou BSplineSurface)
-            patches = []
-            if isinstance(obj, BezierPatch):
-                patches.append(obj.surface_points) # BezierPatch tem uma malha
-            elif isinstance(obj, BezierSurface): # Se for uma coleção de patches
-                for patch in obj.patches:
-                    patches.append(patch.surface_points)
-            else: # BSplineSurface
-                patches = obj.surface_patches # BSplineSurface tem uma lista de malhas
-
-            # Processa cada malha de patch
-            for patch_3d_points in patches:
-                # Converte a lista de pontos para um array numpy para fácil indexação
-                patch_grid = np.array(patch_3d_points)
-                res_u, res_v, _ = patch_grid.shape
-                
-                # 1. Projeta todos os pontos 3D da malha para 2D primeiro
-                projected_grid = np.full((res_u, res_v, 2), np.nan)
-                for i in range(res_u):
-                    for j in range(res_v):
-                        pt3d = patch_grid[i, j]
-                        proj_pt = self.get_projected_2d_coords(pt3d[0], pt3d[1], pt3d[2])
-                        if proj_pt:
-                            projected_grid[i, j] = proj_pt
-
-                # 2. Cria e clipa os segmentos de linha da malha projetada
-                # Linhas na direção U (horizontais na malha)
-                for i in range(res_u):
-                    for j in range(res_v - 1):
-                        p1 = projected_grid[i, j]
-                        p2 = projected_grid[i, j + 1]
-                        if not np.isnan(p1).any() and not np.isnan(p2).any():
-                            clipped_segment = self.clip_line(Line([tuple(p1), tuple(p2)], color=obj.color))
-                            if clipped_segment:
-                                clipped_surface_lines.append(clipped_segment)
-
-                # Linhas na direção V (verticais na malha)
-                for j in range(res_v):
-                    for i in range(res_u - 1):
-                        p1 = projected_grid[i, j]
-                        p2 = projected_grid[i + 1, j]
-                        if not np.isnan(p1).any() and not np.isnan(p2).any():
-                            clipped_segment = self.clip_line(Line([tuple(p1), tuple(p2)], color=obj.color))
-                            if clipped_segment:
-                                clipped_surface_lines.append(clipped_segment)
-
-            return clipped_surface_lines
-        
-        return None 
-    
-    def clip_bspline(self, bspline):
-        bspline.clip({
-            "xmin": self.window["xmin"],
-            "ymin": self.window["ymin"],
-            "xmax": self.window["xmax"],
-            "ymax": self.window["ymax"]
-        })
-        return bspline
-    
-    def clip_curve(self, curve):
-        curve.clip({
-            "xmin": self.window["xmin"],
-            "ymin": self.window["ymin"],
-            "xmax": self.window["xmax"],
-            "ymax": self.window["ymax"]
-        })
-        return curve
-
     def pan(self, event, action):
         if action == "start":
             self.last_pan = (event.x, event.y)
@@ -1469,7 +1223,7 @@ class GraphicsSystem:
             self.window["ymax"] += dy
             
             self.last_pan = (event.x, event.y)
-            self.redraw()
+            self.request_redraw()
 
     def zoom(self, event):
         factor = 0.9 if event.delta > 0 else 1.1
@@ -1481,41 +1235,30 @@ class GraphicsSystem:
         self.window["ymin"] = my - (my - self.window["ymin"]) * factor
         self.window["ymax"] = my + (self.window["ymax"] - my) * factor
         
-        self.redraw()
+        self.request_redraw()
 
-    def zoom_manual(self, factor):
-        cx = (self.window["xmin"] + self.window["xmax"]) / 2
-        cy = (self.window["ymin"] + self.window["ymax"]) / 2
-        
-        self.window["xmin"] = cx - (cx - self.window["xmin"]) * factor
-        self.window["xmax"] = cx + (self.window["xmax"] - cx) * factor
-        self.window["ymin"] = cy - (cy - self.window["ymin"]) * factor
-        self.window["ymax"] = cy + (self.window["ymax"] - cy) * factor
-        
-        self.redraw()
+    def request_redraw(self):
+        """
+        Marca a view como suja e agenda um redraw em vez de executá-lo na hora.
+        Rajadas de eventos (pan, zoom, resize) são agrupadas: há no máximo um redraw
+        pendente, executado no próximo idle ou quando o intervalo de 1/max_fps vencer.
+        """
+        self._redraw_pending = True
+        if self._redraw_job is not None:
+            return
 
-    def redraw(self):
-        self.canvas.delete("all")
-        self._draw_viewport()
+        min_interval = 1.0 / self.max_fps
+        elapsed = time.perf_counter() - self._last_redraw_time
+        if elapsed >= min_interval:
+            self._redraw_job = self.root.after_idle(self._run_scheduled_redraw)
+        else:
+            delay_ms = max(1, int((min_interval - elapsed) * 1000))
+            self._redraw_job = self.root.after(delay_ms, self._run_scheduled_redraw)
 
-        for obj_original in self.display_file:
-            # clip_object agora lida com a projeção 3D para 2D e o clipping 2D subsequente.
-            # Para objetos 3D, ele retorna uma lista de primitivas 2D (Lines) ou um Point 2D.
-            # Para objetos 2D, ele retorna o objeto 2D clipado ou None.
-            drawable_primitives = self.clip_object(obj_original)
-
-            if drawable_primitives:
-                if isinstance(drawable_primitives, list): 
-                    # Caso de Objeto3D ou BezierPatch, que retornam lista de Linhas 2D
-                    for primitive_2d in drawable_primitives:
-                        # primitive_2d é um objeto Line (ou Point) com coordenadas já no "espaço da window"
-                        # viewport_transform (parte 2D) fará a conversão de window para viewport
-                        primitive_2d.draw(self.canvas, self.viewport_transform)
-                else: 
-                    # Caso de Point, Line, Polygon, Curve2D, BSpline (2D originais ou Ponto3D projetado)
-                    # As coordenadas já estão no "espaço da window" (para Ponto3D projetado) ou são originais (para 2D)
-                    # viewport_transform (parte 2D) fará a conversão de window para viewport
-                    drawable_primitives.draw(self.canvas, self.viewport_transform)
+    def _run_scheduled_redraw(self):
+        self._redraw_job = None
+        if self._redraw_pending:
+            self.redraw()
 
     def parse_input(self, coords_entry):
         try:
@@ -1527,311 +1270,6 @@ class GraphicsSystem:
             messagebox.showerror("Erro de Entrada", "Coordenadas inválidas! Por favor, insira coordenadas no formato correto.")
             return []
     
-    def clip_point(self, point):
-        x, y = point.coordinates[0]
-        return (self.window["xmin"] <= x <= self.window["xmax"] and
-                self.window["ymin"] <= y <= self.window["ymax"])
-    
-    def clip_point_3d(self, point):
-        x, y, z = point.coordinates[0]
-        return (self.window["xmin"] <= x <= self.window["xmax"] and
-                self.window["ymin"] <= y <= self.window["ymax"])
-
-    def clip_line(self, line):
-        if self.line_clip_method.get() == "CS":
-            return self.clip_line_cohen_sutherland(line)
-        else:
-            return self.clip_line_liang_barsky(line)
-    
-    # Clipagem de polígonos usando o algoritmo Sutherland-Hodgeman
-    def clip_polygon(self, polygon):
-        def is_inside_left(point): return point[0] >= self.window["xmin"]
-        def is_inside_right(point): return point[0] <= self.window["xmax"]
-        def is_inside_bottom(point): return point[1] >= self.window["ymin"]
-        def is_inside_top(point): return point[1] <= self.window["ymax"]
-
-        # Aplica a clipagem do polígono contra uma única borda da window
-        def clip_edge(vertices, edge):
-            clipped_vertices = []
-
-            for i in range(len(vertices)):
-                current = vertices[i]
-                prev = vertices[i - 1]
-
-                current_inside = edge(current)
-                previous_inside = edge(prev)
-
-                if current_inside:
-                    if not previous_inside:
-                        clipped_vertices.append(compute_intersection(prev, current, edge))
-                    clipped_vertices.append(current)
-                elif previous_inside:
-                    clipped_vertices.append(compute_intersection(prev, current, edge))
-            return clipped_vertices
-
-        # Calcula o ponto de interseção entre uma aresta do polígono e uma borda da window
-        def compute_intersection(p1, p2, boundary_check):
-            x1, y1 = p1
-            x2, y2 = p2
-            if x1 == x2:
-                m = float("inf")
-            else:
-                m = (y2 - y1) / (x2 - x1)
-            
-            if boundary_check == is_inside_left:
-                x = self.window["xmin"]
-                y = m * (x - x1) + y1
-            elif boundary_check == is_inside_right:
-                x = self.window["xmax"]
-                y = m * (x - x1) + y1
-            elif boundary_check == is_inside_bottom:
-                y = self.window["ymin"]
-                x = x1 + (y - y1) / m
-            elif boundary_check == is_inside_top:
-                y = self.window["ymax"]
-                x = x1 + (y - y1) / m
-            return (x, y)
-
-        # Aplica o algoritmo em todas as bordas da window
-        clipped_vertices = polygon.coordinates
-        for edge in [is_inside_left, is_inside_right, is_inside_bottom, is_inside_top]:
-            clipped_vertices = clip_edge(clipped_vertices, edge)
-            if not clipped_vertices:
-                return None
-        return Polygon(clipped_vertices, polygon.color, polygon.filled)
-
-    def compute_out_code(self, x, y):
-        code = self.INSIDE
-        if x < self.window["xmin"]:
-            code |= self.LEFT
-        elif x > self.window["xmax"]:
-            code |= self.RIGHT
-        if y < self.window["ymin"]:
-            code |= self.BOTTOM
-        elif y > self.window["ymax"]:
-            code |= self.TOP
-        return code
-
-    def world_to_window_local(self, x, y):
-        """ Converte coordenadas mundiais para o sistema local da window (considera rotação)"""
-        cx = (self.window["xmin"] + self.window["xmax"]) / 2
-        cy = (self.window["ymin"] + self.window["ymax"]) / 2
-        theta = -self.window["rotation"]
-        
-        # Translada e rotaciona
-        x_rot = (x - cx) * math.cos(theta) - (y - cy) * math.sin(theta) + cx
-        y_rot = (x - cx) * math.sin(theta) + (y - cy) * math.cos(theta) + cy
-        
-        return x_rot, y_rot
-
-    def window_local_to_world(self, x_local, y_local):
-        """Converte coordenadas locais da window de volta para o sistema mundial"""
-        cx = (self.window["xmin"] + self.window["xmax"]) / 2
-        cy = (self.window["ymin"] + self.window["ymax"]) / 2
-        theta = self.window["rotation"]
-        
-        # Rotaciona e translada
-        x_world = (x_local - cx) * math.cos(theta) - (y_local - cy) * math.sin(theta) + cx
-        y_world = (x_local - cx) * math.sin(theta) + (y_local - cy) * math.cos(theta) + cy
-        
-        return x_world, y_world
-
-    def clip_line_cohen_sutherland(self, line):
-        (x1, y1), (x2, y2) = line.coordinates
-
-        # Converte para coordenadas locais da window
-        x1w, y1w = self.world_to_window_local(x1, y1)
-        x2w, y2w = self.world_to_window_local(x2, y2)
-
-        code_start = self.compute_out_code(x1w, y1w)
-        code_end = self.compute_out_code(x2w, y2w)
-        
-        while True:
-            if not (code_start | code_end):
-                # Converte de volta para coordenadas mundiais
-                x1f, y1f = self.window_local_to_world(x1w, y1w)
-                x2f, y2f = self.window_local_to_world(x2w, y2w)
-                return Line([(x1f, y1f), (x2f, y2f)], color=line.color)
-            
-            elif code_start & code_end:
-                return None
-            
-            else:
-                code_out = code_start if code_start else code_end
-                
-                if code_out & self.TOP:
-                    x = x1w + (x2w - x1w) * (self.window["ymax"] - y1w) / (y2w - y1w) if y2w != y1w else x1w
-                    y = self.window["ymax"]
-                elif code_out & self.BOTTOM:
-                    x = x1w + (x2w - x1w) * (self.window["ymin"] - y1w) / (y2w - y1w) if y2w != y1w else x1w
-                    y = self.window["ymin"]
-                elif code_out & self.RIGHT:
-                    y = y1w + (y2w - y1w) * (self.window["xmax"] - x1w) / (x2w - x1w) if x2w != x1w else y1w
-                    x = self.window["xmax"]
-                elif code_out & self.LEFT:
-                    y = y1w + (y2w - y1w) * (self.window["xmin"] - x1w) / (x2w - x1w) if x2w != x1w else y1w
-                    x = self.window["xmin"]
-
-                if code_out == code_start:
-                    x1w, y1w = x, y
-                    code_start = self.compute_out_code(x1w, y1w)
-                else:
-                    x2w, y2w = x, y
-                    code_end = self.compute_out_code(x2w, y2w)
-
-    def clip_line_liang_barsky(self, line):
-        (x1, y1), (x2, y2) = line.coordinates
-
-        # Converte para coordenadas locais da window
-        x1w, y1w = self.world_to_window_local(x1, y1)
-        x2w, y2w = self.world_to_window_local(x2, y2)
-
-        dx = x2w - x1w
-        dy = y2w - y1w
-        p = [-dx, dx, -dy, dy]
-        q = [
-            x1w - self.window["xmin"],
-            self.window["xmax"] - x1w,
-            y1w - self.window["ymin"],
-            self.window["ymax"] - y1w
-        ]
-        
-        u1, u2 = 0.0, 1.0
-        for i in range(4):
-            if p[i] == 0:
-                if q[i] < 0:
-                    return None
-            else:
-                u = q[i]/p[i]
-                if p[i] < 0:
-                    u1 = max(u1, u)
-                else:
-                    u2 = min(u2, u)
-
-        if u1 > u2:
-            return None
-
-        # Calcula pontos clipados em coordenadas locais
-        x1c = x1w + u1 * dx
-        y1c = y1w + u1 * dy
-        x2c = x1w + u2 * dx
-        y2c = y1w + u2 * dy
-
-        # Converte de volta para coordenadas mundiais
-        x1f, y1f = self.window_local_to_world(x1c, y1c)
-        x2f, y2f = self.window_local_to_world(x2c, y2c)
-
-        return Line([(x1f, y1f), (x2f, y2f)], color=line.color)
-    
-    def get_projected_2d_coords(self, x_world, y_world, z_world):
-        """
-        Transforma um ponto 3D do mundo para coordenadas 2D no plano de projeção,
-        compatíveis com self.window para clipping 2D.
-        Retorna (x_proj, y_proj) ou None se a projeção não for possível.
-
-        DOC IAgen:
-        Foi usado IA entender como representrar um objeto com cordenadas 3D em 2D no plano de projecao em Python
-        DeepSeek https://chat.deepseek.com
-
-        Prompt usado:
-        Como representrar um objeto com cordenadas 3D em 2D no plano de projecao em Python, demos o contexto do codigo atual antes da implementacao
-        """
-        try:
-            d = float(self.d_entry.get())
-            if d <= 1e-6: # d deve ser positivo e não muito pequeno
-                # messagebox.showwarning("Aviso", "Distância de projeção 'd' muito pequena ou inválida. Usando valor padrão.")
-                d = 200 
-        except ValueError:
-            d = 200
-
-        # VRP (View Reference Point) - Centro da window, no plano z=0 do mundo
-        vrp = np.array([
-            (self.window["xmin"] + self.window["xmax"]) / 2,
-            (self.window["ymin"] + self.window["ymax"]) / 2,
-            0  # Assumindo VRP no plano XY do mundo para simplificar a câmera canônica inicial
-        ])
-        
-        # VPN (View Plane Normal) - Olhando ao longo do eixo Z do mundo
-        vpn = np.array([0, 0, 1])
-        
-        # VUP (View Up Vector) - Eixo Y do mundo como "para cima"
-        vup = np.array([0, 1, 0])
-        
-        # Normalizar VPN
-        n = vpn / np.linalg.norm(vpn)
-        # Calcular u (eixo x da view)
-        u = np.cross(vup, n)
-        if np.linalg.norm(u) < 1e-6: # vup e n são colineares
-            # Tentar um vup alternativo se o padrão for problemático (ex: olhando reto para cima/baixo)
-            if abs(n[1]) > 0.99: # n é próximo de (0, +/-1, 0)
-                u = np.cross(np.array([0,0,1]), n) # Usar Z global como up temporário
-            else: 
-                u = np.cross(np.array([1,0,0]), n) # Usar X global como up temporário
-
-        u = u / np.linalg.norm(u)
-        # Calcular v (eixo y da view)
-        v = np.cross(n, u)
-
-        # Matriz de Translação para levar VRP à origem
-        T_vrp = np.array([
-            [1, 0, 0, 0],
-            [0, 1, 0, 0],
-            [0, 0, 1, 0],
-            [-vrp[0], -vrp[1], -vrp[2], 1]
-        ])
-
-        # Matriz de Rotação para alinhar eixos do mundo com eixos da view
-        R_view = np.array([
-            [u[0], v[0], n[0], 0], # Colunas são os eixos da view no sistema do mundo
-            [u[1], v[1], n[1], 0],
-            [u[2], v[2], n[2], 0],
-            [0,    0,    0,    1]
-        ])
-  
-        R_align = np.array([
-            [u[0], v[0], n[0], 0],
-            [u[1], v[1], n[1], 0],
-            [u[2], v[2], n[2], 0],
-            [0,    0,    0,    1]
-        ])
-
-        R_matrix_original_style = np.array([
-            [u[0], u[1], u[2], 0],
-            [v[0], v[1], v[2], 0],
-            [n[0], n[1], n[2], 0],
-            [0,    0,    0,    1]
-        ])
-        T_matrix_original_style = np.array([
-            [1, 0, 0, -vrp[0]],
-            [0, 1, 0, -vrp[1]],
-            [0, 0, 1, -vrp[2]],
-            [0, 0, 0, 1]
-        ])
-        M_view_transform_col = R_matrix_original_style @ T_matrix_original_style # Para P_view_col = M @ P_world_col
-
-        point_world_col = np.array([x_world, y_world, z_world, 1]).reshape(4,1)
-        transformed_view_col = M_view_transform_col @ point_world_col
-        
-        x_v, y_v, z_v = transformed_view_col[0,0], transformed_view_col[1,0], transformed_view_col[2,0]
-
-        if self.projection_type.get() == "parallel":
-            x_proj = x_v
-            y_proj = y_v
-        elif self.projection_type.get() == "perspective":
-            # COP está em (0,0,-d) no sistema da view, plano de projeção em z_view=0
-            denominator = z_v + d 
-            if abs(denominator) < 1e-6: # Evita divisão por zero
-                return None
-            if denominator <= 0: # Ponto está no COP ou atrás dele (inválido para esta projeção)
-                 return None
-
-            x_proj = (x_v * d) / denominator
-            y_proj = (y_v * d) / denominator
-        else:
-            return None # Tipo de projeção desconhecido
-            
-        return x_proj, y_proj
-
 if __name__ == "__main__":
     root = tk.Tk()
     root.title("Sistema Gráfico 2D com Lista de Objetos")
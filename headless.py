@@ -0,0 +1,421 @@
+import argparse
+import math
+import struct
+import zlib
+import numpy as np
+from scene import Scene
+from renderer import RetainedCanvas
+from viewing import Camera
+from descritor_obj import DescritorOBJ
+
+_NAMED_COLORS = {
+    "white": (255, 255, 255),
+    "black": (0, 0, 0),
+    "red": (255, 0, 0),
+    "green": (0, 255, 0),
+    "blue": (0, 0, 255),
+    "yellow": (255, 255, 0),
+    "cyan": (0, 255, 255),
+    "magenta": (255, 0, 255),
+    "gray": (190, 190, 190),
+    "grey": (190, 190, 190),
+}
+
+
+def parse_color(color):
+    """Converte '#rgb', '#rrggbb' ou um nome básico do Tk em (r, g, b); '' (sem cor) vira None."""
+    if not color:
+        return None
+    if color.startswith("#"):
+        digits = color[1:]
+        if len(digits) == 3:
+            digits = "".join(c * 2 for c in digits)
+        if len(digits) == 6:
+            return tuple(int(digits[i:i+2], 16) for i in (0, 2, 4))
+    # Cores desconhecidas caem no branco, como um traço visível em vez de um erro no meio do lote
+    return _NAMED_COLORS.get(color.lower(), (255, 255, 255))
+
+
+def _flatten_coords(args):
+    if not args:
+        return np.empty(0)
+    return np.hstack([np.ravel(np.asarray(arg, dtype=float)) for arg in args])
+
+
+class _CanvasRecord:
+    __slots__ = ("kind", "coords", "options", "state")
+
+    def __init__(self, kind, coords, options):
+        self.kind = kind
+        self.coords = coords
+        self.options = options
+        self.state = "normal"
+
+
+class _Setting:
+    """Substituto mínimo de tk.StringVar / ttk.Entry: guarda um valor lido com get()."""
+
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+class RasterCanvas:
+    """
+    Canvas em memória com a mesma interface create_* / coords / itemconfigure / delete do
+    tk.Canvas usada pelo RetainedCanvas e pelos métodos draw dos objetos.
+    Os itens são guardados como uma display list e rasterizados sob demanda em um array
+    NumPy RGB (to_array), que pode ser salvo como PNG ou PPM, ou exportados como SVG.
+    Opções sem efeito na rasterização (smooth, splinesteps, capstyle) são aceitas e ignoradas;
+    textos (como o overlay de estatísticas) só aparecem no SVG.
+    """
+
+    def __init__(self, width, height, bg="#1a1a1a"):
+        self.width = int(width)
+        self.height = int(height)
+        self.bg = bg
+        self._items = {}  # id -> _CanvasRecord, na ordem de empilhamento
+        self._next_id = 1
+
+    def _create(self, kind, args, options):
+        item_id = self._next_id
+        self._next_id += 1
+        self._items[item_id] = _CanvasRecord(kind, _flatten_coords(args), dict(options))
+        return item_id
+
+    def create_line(self, *args, **options):
+        return self._create("line", args, options)
+
+    def create_oval(self, *args, **options):
+        return self._create("oval", args, options)
+
+    def create_polygon(self, *args, **options):
+        return self._create("polygon", args, options)
+
+    def create_rectangle(self, *args, **options):
+        return self._create("rectangle", args, options)
+
+    def create_text(self, *args, **options):
+        return self._create("text", args, options)
+
+    def coords(self, item_id, *args):
+        record = self._items[item_id]
+        if not args:
+            return record.coords.tolist()
+        record.coords = _flatten_coords(args)
+
+    def itemconfigure(self, item_id, **options):
+        record = self._items[item_id]
+        state = options.pop("state", None)
+        if state is not None:
+            record.state = state
+        record.options.update(options)
+
+    itemconfig = itemconfigure
+
+    def delete(self, item_id):
+        if item_id == "all":
+            self._items.clear()
+        else:
+            self._items.pop(item_id, None)
+
+    def tag_raise(self, item_id, above=None):
+        """Move o item para logo acima de 'above' (ou para o topo) na ordem de empilhamento."""
+        ids = reversed(self._items)
+        if next(ids, None) == item_id and (above is None or next(ids, None) == above):
+            return  # Caso comum: item recém-criado já está logo acima do anterior
+        record = self._items.pop(item_id)
+        if above is None:
+            self._items[item_id] = record
+            return
+        stack = list(self._items.items())
+        position = next(i for i, (other_id, _) in enumerate(stack) if other_id == above) + 1
+        stack.insert(position, (item_id, record))
+        self._items = dict(stack)
+
+    def tag_lower(self, item_id):
+        """Move o item para a base da ordem de empilhamento."""
+        record = self._items.pop(item_id)
+        self._items = {item_id: record, **self._items}
+
+    def find_all(self):
+        return tuple(self._items)
+
+    def _visible_records(self):
+        return [record for record in self._items.values() if record.state != "hidden"]
+
+    # ---------------------------------------------------------------- raster
+
+    def to_array(self):
+        """Rasteriza os itens visíveis em um array (altura, largura, 3) uint8."""
+        image = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        image[:] = parse_color(self.bg) or (0, 0, 0)
+        for record in self._visible_records():
+            points = record.coords.reshape(-1, 2)
+            options = record.options
+            width = float(options.get("width", 1))
+            if record.kind == "line":
+                self._stroke(image, points, parse_color(options.get("fill", "black")), width, options.get("dash"))
+            elif record.kind == "polygon":
+                self._fill_polygon(image, points, parse_color(options.get("fill", "black")))
+                outline = parse_color(options.get("outline", ""))
+                if len(points):
+                    self._stroke(image, np.vstack([points, points[:1]]), outline, width, options.get("dash"))
+            elif record.kind == "oval":
+                self._draw_oval(image, points, parse_color(options.get("fill", "")),
+                                parse_color(options.get("outline", "black")), width)
+            elif record.kind == "rectangle":
+                (x1, y1), (x2, y2) = points
+                corners = np.array([(x1, y1), (x2, y1), (x2, y2), (x1, y2)])
+                self._fill_polygon(image, corners, parse_color(options.get("fill", "")))
+                self._stroke(image, np.vstack([corners, corners[:1]]), parse_color(options.get("outline", "black")),
+                             width, options.get("dash"))
+        return image
+
+    def _stamp(self, image, points, color, width):
+        """Pinta um disco de diâmetro 'width' em cada ponto (N,2)."""
+        radius = max(width, 1.0) / 2
+        r = int(math.floor(radius))
+        dx, dy = np.meshgrid(np.arange(-r, r + 1), np.arange(-r, r + 1))
+        disc = (dx ** 2 + dy ** 2) <= radius ** 2
+        offsets = np.stack([dx[disc], dy[disc]], axis=1)
+
+        pixels = np.floor(points).astype(np.intp)
+        pixels = (pixels[:, None, :] + offsets[None, :, :]).reshape(-1, 2)
+        inside = ((pixels[:, 0] >= 0) & (pixels[:, 0] < self.width) &
+                  (pixels[:, 1] >= 0) & (pixels[:, 1] < self.height))
+        pixels = pixels[inside]
+        image[pixels[:, 1], pixels[:, 0]] = color
+
+    def _stroke(self, image, points, color, width=1.0, dash=None):
+        """Desenha uma polilinha amostrando cada segmento a cada meio pixel."""
+        if color is None:
+            return
+        points = points[~np.isnan(points).any(axis=1)]
+        if len(points) < 2:
+            if len(points) == 1:
+                self._stamp(image, points, color, width)
+            return
+
+        starts, deltas = points[:-1], np.diff(points, axis=0)
+        lengths = np.hypot(deltas[:, 0], deltas[:, 1])
+        counts = np.ceil(lengths * 2).astype(np.intp) + 1
+        segment = np.repeat(np.arange(len(starts)), counts)
+        first = np.cumsum(counts) - counts
+        t = (np.arange(counts.sum()) - first[segment]) / np.maximum(counts[segment] - 1, 1)
+        samples = starts[segment] + deltas[segment] * t[:, None]
+
+        if dash:
+            # Posição ao longo da polilinha, comparada com o padrão (traço, espaço, ...)
+            arc = (np.cumsum(lengths) - lengths)[segment] + t * lengths[segment]
+            pattern = np.cumsum(dash)
+            phase = np.searchsorted(pattern, arc % pattern[-1], side="right")
+            samples = samples[phase % 2 == 0]
+
+        self._stamp(image, samples, color, width)
+
+    def _fill_polygon(self, image, points, color):
+        """Preenchimento por scanline (regra par-ímpar) de todas as linhas do polígono de uma vez."""
+        if color is None:
+            return
+        points = points[~np.isnan(points).any(axis=1)]
+        if len(points) < 3:
+            return
+        x0, y0 = points[:, 0], points[:, 1]
+        x1, y1 = np.roll(x0, -1), np.roll(y0, -1)
+
+        row_min = max(int(math.floor(y0.min())), 0)
+        row_max = min(int(math.ceil(y0.max())), self.height - 1)
+        if row_min > row_max:
+            return
+        rows = np.arange(row_min, row_max + 1)
+        yc = rows[:, None] + 0.5
+
+        crosses = (y0 <= yc) != (y1 <= yc)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            xs = x0 + (yc - y0) * (x1 - x0) / (y1 - y0)
+        xs = np.sort(np.where(crosses, xs, np.inf), axis=1)
+        if xs.shape[1] % 2:
+            xs = np.hstack([xs, np.full((len(rows), 1), np.inf)])
+
+        # Intervalos [entrada, saída) de cada linha, acumulados com um array de diferenças
+        enter, leave = xs[:, 0::2], xs[:, 1::2]
+        valid = np.isfinite(enter) & np.isfinite(leave)
+        row_idx = np.broadcast_to(np.arange(len(rows))[:, None], enter.shape)[valid]
+        start = np.clip(np.ceil(enter[valid] - 0.5), 0, self.width).astype(np.intp)
+        end = np.clip(np.floor(leave[valid] - 0.5) + 1, 0, self.width).astype(np.intp)
+
+        diff = np.zeros((len(rows), self.width + 1), dtype=np.int32)
+        np.add.at(diff, (row_idx, start), 1)
+        np.add.at(diff, (row_idx, end), -1)
+        mask = np.cumsum(diff, axis=1)[:, :self.width] > 0
+        image[row_min:row_max + 1][mask] = color
+
+    def _draw_oval(self, image, points, fill, outline, width):
+        if np.isnan(points).any():
+            return
+        (x1, y1), (x2, y2) = points
+        cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+        rx, ry = abs(x2 - x1) / 2, abs(y2 - y1) / 2
+        if rx == 0 or ry == 0:
+            return
+        pad = width / 2 + 1
+        col0, col1 = max(int(cx - rx - pad), 0), min(int(cx + rx + pad) + 1, self.width)
+        row0, row1 = max(int(cy - ry - pad), 0), min(int(cy + ry + pad) + 1, self.height)
+        if col0 >= col1 or row0 >= row1:
+            return
+        X, Y = np.meshgrid(np.arange(col0, col1) + 0.5, np.arange(row0, row1) + 0.5)
+        distance = np.sqrt(((X - cx) / rx) ** 2 + ((Y - cy) / ry) ** 2)
+        region = image[row0:row1, col0:col1]
+        if fill is not None:
+            region[distance <= 1] = fill
+        if outline is not None:
+            region[np.abs(distance - 1) * min(rx, ry) <= max(width, 1) / 2] = outline
+
+    # ---------------------------------------------------------------- saída
+
+    def to_svg(self):
+        def color(value):
+            rgb = parse_color(value)
+            return "none" if rgb is None else "#%02x%02x%02x" % rgb
+
+        def point_list(points):
+            points = points[~np.isnan(points).any(axis=1)]
+            return " ".join(f"{x:.2f},{y:.2f}" for x, y in points)
+
+        parts = [
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{self.width}" height="{self.height}" '
+            f'viewBox="0 0 {self.width} {self.height}">',
+            f'<rect width="100%" height="100%" fill="{color(self.bg)}"/>'
+        ]
+        for record in self._visible_records():
+            points = record.coords.reshape(-1, 2)
+            options = record.options
+            stroke = f'stroke-width="{options.get("width", 1)}"'
+            if options.get("dash"):
+                stroke += f' stroke-dasharray="{",".join(str(v) for v in options["dash"])}"'
+            if record.kind == "line":
+                if options.get("capstyle") == "round":
+                    stroke += ' stroke-linecap="round"'
+                parts.append(f'<polyline points="{point_list(points)}" fill="none" '
+                             f'stroke="{color(options.get("fill", "black"))}" {stroke}/>')
+            elif record.kind == "polygon":
+                parts.append(f'<polygon points="{point_list(points)}" fill="{color(options.get("fill", "black"))}" '
+                             f'stroke="{color(options.get("outline", ""))}" {stroke}/>')
+            elif record.kind in ("oval", "rectangle"):
+                if np.isnan(points).any():
+                    continue
+                (x1, y1), (x2, y2) = points
+                fill, outline = color(options.get("fill", "")), color(options.get("outline", "black"))
+                if record.kind == "oval":
+                    parts.append(f'<ellipse cx="{(x1 + x2) / 2:.2f}" cy="{(y1 + y2) / 2:.2f}" '
+                                 f'rx="{abs(x2 - x1) / 2:.2f}" ry="{abs(y2 - y1) / 2:.2f}" '
+                                 f'fill="{fill}" stroke="{outline}" {stroke}/>')
+                else:
+                    parts.append(f'<rect x="{min(x1, x2):.2f}" y="{min(y1, y2):.2f}" '
+                                 f'width="{abs(x2 - x1):.2f}" height="{abs(y2 - y1):.2f}" '
+                                 f'fill="{fill}" stroke="{outline}" {stroke}/>')
+            elif record.kind == "text" and len(points):
+                x, y = points[0]
+                text = str(options.get("text", "")).replace("&", "&amp;").replace("<", "&lt;")
+                parts.append(f'<text x="{x:.2f}" y="{y:.2f}" dominant-baseline="hanging" '
+                             f'fill="{color(options.get("fill", "black"))}" font-family="monospace">{text}</text>')
+        parts.append("</svg>")
+        return "\n".join(parts) + "\n"
+
+    def to_png(self):
+        """Codifica o raster como PNG RGB de 8 bits, sem depender de bibliotecas de imagem."""
+        image = self.to_array()
+        height, width, _ = image.shape
+        # Cada linha começa com o byte de filtro 0 (nenhum)
+        raw = np.hstack([np.zeros((height, 1), dtype=np.uint8), image.reshape(height, -1)]).tobytes()
+
+        def chunk(tag, data):
+            return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xffffffff)
+
+        return (b"\x89PNG\r\n\x1a\n" +
+                chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)) +
+                chunk(b"IDAT", zlib.compress(raw)) +
+                chunk(b"IEND", b""))
+
+    def to_ppm(self):
+        image = self.to_array()
+        return f"P6\n{self.width} {self.height}\n255\n".encode("ascii") + image.tobytes()
+
+    def save(self, filename):
+        """Salva o quadro atual; o formato (.png, .ppm ou .svg) vem da extensão do arquivo."""
+        extension = filename.rsplit(".", 1)[-1].lower()
+        if extension == "svg":
+            with open(filename, "w", encoding="utf-8") as f:
+                f.write(self.to_svg())
+            return
+        if extension == "png":
+            data = self.to_png()
+        elif extension == "ppm":
+            data = self.to_ppm()
+        else:
+            raise ValueError(f"Formato de saída não suportado: .{extension}")
+        with open(filename, "wb") as f:
+            f.write(data)
+
+
+class HeadlessRenderer(Scene):
+    """
+    Renderiza um display file sem interface gráfica, e sem importar o Tk.
+    Usa o mesmo pipeline da Scene que o GraphicsSystem (índice espacial, clipping, câmera e
+    transformada de viewport), com um RasterCanvas no lugar do tk.Canvas e valores simples no
+    lugar dos widgets de configuração, de modo que a imagem gerada é a mesma que a janela mostraria.
+    """
+
+    def __init__(self, display_file=(), width=Scene.CANVAS_WIDTH, height=Scene.CANVAS_HEIGHT,
+                 window=None, projection="parallel", d=Camera.DEFAULT_D, clip_method="CS",
+                 curve_clip_method="analytic", background="#1a1a1a"):
+        self.CANVAS_WIDTH = width
+        self.CANVAS_HEIGHT = height
+        self._init_scene()
+        if window is not None:
+            self.window.update(window)
+        self.projection_type = _Setting(projection)
+        self.d_entry = _Setting(str(d))
+        self.line_clip_method = _Setting(clip_method)
+        self.curve_clip_method = _Setting(curve_clip_method)
+
+        self.canvas = RasterCanvas(width, height, background)
+        self.renderer = RetainedCanvas(self.canvas)
+        self._set_display_file(list(display_file))
+
+    def render(self):
+        """Redesenha a cena e retorna o raster (altura, largura, 3) uint8."""
+        self.redraw()
+        return self.canvas.to_array()
+
+    def save(self, filename):
+        self.redraw()
+        self.canvas.save(filename)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Renderiza um arquivo .obj sem interface gráfica.")
+    parser.add_argument("input", help="arquivo .obj de entrada")
+    parser.add_argument("output", help="imagem de saída (.png, .ppm ou .svg)")
+    parser.add_argument("--width", type=int, default=Scene.CANVAS_WIDTH)
+    parser.add_argument("--height", type=int, default=Scene.CANVAS_HEIGHT)
+    parser.add_argument("--projection", choices=["parallel", "perspective"], default="parallel")
+    parser.add_argument("--d", type=float, default=Camera.DEFAULT_D, help="distância do centro de projeção")
+    parser.add_argument("--clip", choices=sorted(Scene.SEGMENT_CLIPPERS), default="CS")
+    parser.add_argument("--curve-clip", choices=["analytic", "subdivision"], default="analytic")
+    args = parser.parse_args(argv)
+
+    renderer = HeadlessRenderer(DescritorOBJ.read_obj(args.input), args.width, args.height,
+                                projection=args.projection, d=args.d, clip_method=args.clip,
+                                curve_clip_method=args.curve_clip)
+    renderer.save(args.output)
+
+
+if __name__ == "__main__":
+    main()
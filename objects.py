@@ -1,8 +1,9 @@
-import tkinter as tk
 from abc import ABC, abstractmethod
+from functools import lru_cache
 import numpy as np
 from enum import Enum
 import math
+from clipping import bezier_visible_intervals, classify_bounds, clip_polylines, world_to_window_local, BOUNDS_INSIDE
 
 class ObjectType(Enum):
     PONTO = "Ponto"
@@ -15,14 +16,205 @@ class ObjectType(Enum):
     SUPERFICIE_BEZIER = "Superfície Bézier"
     SUPERFICIE_BSPLINE = "Superfície B-Spline"
 
+@lru_cache(maxsize=None)
+def bernstein_matrix(steps):
+    """Base de Bernstein cúbica (steps, 4) amostrada em 'steps' valores de t em [0, 1], em cache por 'steps'."""
+    t = np.linspace(0, 1, steps)[:, None]
+    s = 1 - t
+    matrix = np.hstack([s**3, 3 * s**2 * t, 3 * s * t**2, t**3])
+    matrix.flags.writeable = False
+    return matrix
+
+# Matriz da B-Spline cúbica uniforme (M_bs)
+BSPLINE_MATRIX = np.array([
+    [-1,  3, -3, 1],
+    [ 3, -6,  3, 0],
+    [-3,  0,  3, 0],
+    [ 1,  4,  1, 0]
+]) / 6
+BSPLINE_MATRIX.flags.writeable = False
+
+@lru_cache(maxsize=None)
+def bspline_basis_matrix(steps):
+    """
+    Produto (steps, 4) das potências [t³, t², t, 1], com t = k/steps para k = 0..steps-1,
+    pela matriz da B-Spline cúbica uniforme; em cache por 'steps'.
+    """
+    t = np.arange(steps)[:, None] / steps
+    powers = np.hstack([t**3, t**2, t, np.ones_like(t)])
+    matrix = powers @ BSPLINE_MATRIX
+    matrix.flags.writeable = False
+    return matrix
+
+@lru_cache(maxsize=None)
+def forward_difference_matrix(steps):
+    """Matriz E das diferenças adiante para passo delta = 1/steps, em cache por 'steps'."""
+    delta = 1.0 / steps
+    matrix = np.array([
+        [0, 0, 0, 1],
+        [delta**3, delta**2, delta, 0],
+        [6*delta**3, 2*delta**2, 0, 0],
+        [6*delta**3, 0, 0, 0]
+    ])
+    matrix.flags.writeable = False
+    return matrix
+
+def forward_difference_sequence(differences, count):
+    """
+    Valores f(0), f(δ), ..., f((count-1)δ) de cúbicas dadas pelas diferenças adiante iniciais
+    [f, Δf, Δ²f, Δ³f] no último eixo de 'differences'. As atualizações passo a passo
+    (f += Δf; Δf += Δ²f; Δ²f += Δ³f) viram três somas cumulativas ao longo do novo eixo 0.
+    """
+    differences = np.asarray(differences, dtype=float)
+    f, d1, d2, d3 = np.moveaxis(differences, -1, 0)
+    increments = np.broadcast_to(d3, (count,) + d3.shape).copy()
+    increments[0] = d2
+    second = np.cumsum(increments, axis=0)
+    for initial in (d1, f):
+        increments[0] = initial
+        increments[1:] = second[:-1]
+        second = np.cumsum(increments, axis=0)
+    return second
+
+def bspline_basis(knots, degree, spans, params):
+    """
+    Funções de base não nulas (Cox-de Boor) de grau 'degree' em todos os parâmetros de uma vez.
+    'spans[k]' é o intervalo de nós não vazio que contém params[k]. Retorna (m, degree+1), os pesos
+    dos pontos de controle spans[k]-degree .. spans[k]; o laço percorre só os níveis do triângulo.
+    """
+    knots = np.asarray(knots, dtype=float)
+    m = len(params)
+    basis = np.zeros((m, degree + 1))
+    basis[:, 0] = 1.0
+    left = np.empty((m, degree + 1))
+    right = np.empty((m, degree + 1))
+    for j in range(1, degree + 1):
+        left[:, j] = params - knots[spans + 1 - j]
+        right[:, j] = knots[spans + j] - params
+        saved = 0.0
+        for r in range(j):
+            temp = basis[:, r] / (right[:, r + 1] + left[:, j - r])
+            basis[:, r] = saved + right[:, r + 1] * temp
+            saved = left[:, j - r] * temp
+        basis[:, j] = saved
+    return basis
+
+def simplify_screen_polyline(points):
+    """
+    Remove de uma polilinha (N,2) em coordenadas de tela os pontos que caem no mesmo pixel do
+    ponto anterior, mantendo sempre o primeiro e o último.
+    """
+    pixels = np.rint(points)
+    keep = np.ones(len(points), dtype=bool)
+    keep[1:] = (pixels[1:] != pixels[:-1]).any(axis=1)
+    keep[-1] = True
+    return points[keep]
+
 class GraphicObject(ABC):
     _counter = 0  # Contador estático compartilhado
     
     def __init__(self, coordinates, color="#00aaff"):
-        self.coordinates = coordinates
+        self._coordinates = coordinates
+        self._geometry_version = 0
+        self._extent_cache = None
+        self._centroid_cache = None
+        self._clip_key = None  # (método, window, versão da geometria) do último clip
+        self._clip_inside = False  # bbox inteira dentro da window no último clip
         self.color = color
         self._name = None
         self._generate_name()
+
+    @property
+    def coordinates(self):
+        return self._coordinates
+
+    @coordinates.setter
+    def coordinates(self, coordinates):
+        # A geometria derivada é montada antes da atribuição: se as novas coordenadas forem
+        # inválidas, a exceção deixa o objeto inalterado
+        self._coordinates_changed(coordinates)
+        self._coordinates = coordinates
+        self.invalidate_geometry()
+
+    def _coordinates_changed(self, coordinates):
+        """
+        Recalcula a geometria derivada (curva, malha...) a partir das novas coordenadas, antes de
+        elas serem atribuídas; subclasses sobrescrevem e validam tudo antes de alterar o objeto.
+        """
+        pass
+
+    def invalidate_geometry(self):
+        """Descarta bounding box e centróide em cache. Chamar após alterar as coordenadas in-place."""
+        self._geometry_version += 1
+        self._extent_cache = None
+        self._centroid_cache = None
+
+    @property
+    def geometry_version(self):
+        """Incrementado a cada mudança de geometria; serve de chave para caches externos."""
+        return self._geometry_version
+
+    def _geometry_points(self):
+        """Pontos que delimitam o objeto desenhado; por padrão, as próprias coordenadas."""
+        return self.coordinates
+
+    def _extent(self):
+        """(mínimos, máximos) 3D da geometria, ou None se vazia; objetos 2D têm z = 0."""
+        if self._extent_cache is None:
+            points = np.asarray(self._geometry_points(), dtype=float)
+            if points.size == 0:
+                self._extent_cache = ()
+            else:
+                points = points.reshape(-1, points.shape[-1])
+                padded = np.zeros((len(points), 3))
+                padded[:, :min(points.shape[1], 3)] = points[:, :3]
+                self._extent_cache = (padded.min(axis=0).tolist(), padded.max(axis=0).tolist())
+        return self._extent_cache or None
+
+    def _clip_cached(self, method, window):
+        """
+        Consulta o cache do último clip do objeto. Retorna True se o resultado anterior ainda vale:
+        mesma window e mesma geometria, ou a bbox estava inteira dentro da window anterior e continua
+        inteira dentro da nova. Em caso de falha, _clip_inside diz se o objeto pode ser aceito inteiro.
+        """
+        key = (method, window["xmin"], window["ymin"], window["xmax"], window["ymax"],
+               window.get("rotation", 0), self._geometry_version)
+        if key == self._clip_key:
+            return True
+        bbox = self.bounding_box
+        inside = bbox is not None and classify_bounds(bbox, window) == BOUNDS_INSIDE
+        previous = self._clip_key
+        hit = (inside and self._clip_inside and previous is not None and
+               previous[0] == method and previous[-1] == self._geometry_version)
+        self._clip_key = key
+        self._clip_inside = inside
+        return hit
+
+    @property
+    def bounding_box(self):
+        """Bounding box 2D (xmin, ymin, xmax, ymax) em cache, ou None se o objeto não tem geometria."""
+        extent = self._extent()
+        if extent is None:
+            return None
+        mins, maxs = extent
+        return (mins[0], mins[1], maxs[0], maxs[1])
+
+    @property
+    def bounding_box_3d(self):
+        """Bounding box 3D (xmin, ymin, zmin, xmax, ymax, zmax) em cache, ou None."""
+        extent = self._extent()
+        if extent is None:
+            return None
+        mins, maxs = extent
+        return tuple(mins) + tuple(maxs)
+
+    @property
+    def centroid(self):
+        """Média das coordenadas (cx, cy) ou (cx, cy, cz), em cache; None se não há coordenadas."""
+        if self._centroid_cache is None:
+            points = np.asarray(self.coordinates, dtype=float)
+            self._centroid_cache = tuple(points.reshape(-1, points.shape[-1]).mean(axis=0).tolist()) if points.size else ()
+        return self._centroid_cache or None
         
     def _generate_name(self):
         GraphicObject._counter += 1
@@ -47,26 +239,18 @@ class GraphicObject(ABC):
         pass
 
     def get_coordinates(self, transform):
-        coords = []
-        for x, y in self.coordinates:
-            vx, vy = transform(x, y)
-            coords.extend([vx, vy])
+        """Transforma todos os vértices em uma chamada; 'transform' recebe (N,2) e retorna (N,2)."""
+        points = transform(np.asarray(self.coordinates, dtype=float).reshape(-1, 2))
         if len(self.coordinates) >= 3:
-            x0, y0 = self.coordinates[0]
-            vx0, vy0 = transform(x0, y0)
-            coords.extend([vx0, vy0])
-        return coords
+            points = np.vstack([points, points[:1]])
+        return points.ravel().tolist()
     
     def get_coordinates_3d(self, transform):
-        coords = []
-        for x, y, z in self.coordinates:
-            vx, vy = transform(x, y, z)
-            coords.extend([vx, vy])
+        """Transforma todos os vértices 3D em uma chamada; 'transform' recebe (N,3) e retorna (N,2)."""
+        points = transform(np.asarray(self.coordinates, dtype=float).reshape(-1, 3))
         if len(self.coordinates) >= 3:
-            x0, y0, z0 = self.coordinates[0]
-            vx0, vy0 = transform(x0, y0, z0)
-            coords.extend([vx0, vy0])
-        return coords
+            points = np.vstack([points, points[:1]])
+        return points.ravel().tolist()
     
     @classmethod
     def reset_counter(cls):
@@ -100,7 +284,47 @@ class Line(GraphicObject):
     def draw(self, canvas, transform):
         vx1, vy1, vx2, vy2 = self.get_coordinates(transform)
         canvas.create_line(vx1, vy1, vx2, vy2, 
-                         fill=self.color, width=3, capstyle=tk.ROUND)
+                         fill=self.color, width=3, capstyle="round")
+
+class LineSegments:
+    """
+    Primitiva de desenho com um lote (N,2,2) de segmentos já clipados em coordenadas da window.
+    Não é um GraphicObject: não recebe nome nem incrementa o contador global.
+    """
+    def __init__(self, segments, color="#00aaff"):
+        self.segments = np.asarray(segments, dtype=float).reshape(-1, 2, 2)
+        self.color = color
+
+    def __len__(self):
+        return len(self.segments)
+
+    def draw(self, canvas, transform):
+        if not len(self.segments):
+            return
+        projected = transform(self.segments.reshape(-1, 2)).reshape(-1, 2, 2)
+        for (vx1, vy1), (vx2, vy2) in projected:
+            canvas.create_line(vx1, vy1, vx2, vy2, 
+                             fill=self.color, width=3, capstyle="round")
+
+class Polylines:
+    """
+    Primitiva de desenho com trechos de polilinha já clipados (lista de arrays (M,2)) em
+    coordenadas da window, desenhados com um create_line por trecho.
+    Assim como LineSegments, não recebe nome nem incrementa o contador global.
+    """
+    def __init__(self, runs, color="#00aaff", width=3):
+        self.runs = [np.asarray(run, dtype=float).reshape(-1, 2) for run in runs]
+        self.color = color
+        self.width = width
+
+    def __len__(self):
+        return len(self.runs)
+
+    def draw(self, canvas, transform):
+        for run in self.runs:
+            screen = simplify_screen_polyline(transform(run))
+            if len(screen) >= 2:
+                canvas.create_line(*screen.ravel().tolist(), fill=self.color, width=self.width, capstyle="round")
 
 class Polygon(GraphicObject):
     prefix = "W"
@@ -117,12 +341,32 @@ class Polygon(GraphicObject):
         coords = self.get_coordinates(transform)
         canvas.create_polygon(coords, fill=self.color if self.filled else "", outline=self.color, width=2)
 
+class PolygonShape:
+    """
+    Primitiva de desenho de um polígono já clipado, em coordenadas da window.
+    Assim como LineSegments, não recebe nome nem incrementa o contador global.
+    """
+    def __init__(self, coordinates, color="#ffaa00", filled=False):
+        self.coordinates = np.asarray(coordinates, dtype=float).reshape(-1, 2)
+        self.color = color
+        self.filled = filled
+
+    def draw(self, canvas, transform):
+        if len(self.coordinates) < 3:
+            return
+        points = transform(self.coordinates)
+        coords = np.vstack([points, points[:1]]).ravel().tolist()
+        canvas.create_polygon(coords, fill=self.color if self.filled else "", outline=self.color, width=2)
+
 class Curve2D(GraphicObject):
     prefix = "C"
+    FLATNESS_TOLERANCE = 0.5  # Distância máxima entre a polilinha e a curva, em pixels da viewport
+    MAX_STEPS = 256
     
     def __init__(self, coordinates, color="#00aaff"):
         super().__init__(coordinates, color)
         self.clipped_segments = []
+        self.visible_intervals = []  # (índice do segmento, t0, t1) do último clip_analytic
     
     @property
     def type(self):
@@ -130,14 +374,21 @@ class Curve2D(GraphicObject):
     
     def draw(self, canvas, transform):
         for segment in self.clipped_segments:
-            points = self.compute_bezier_points(segment)
-            for i in range(len(points) - 1):
-                x1, y1 = points[i]
-                x2, y2 = points[i+1]
-                vx1, vy1 = transform(x1, y1)
-                vx2, vy2 = transform(x2, y2)
-                canvas.create_line(vx1, vy1, vx2, vy2, 
-                                 fill=self.color, width=3, capstyle=tk.ROUND)
+            # A transformada de viewport é afim: basta levar os pontos de controle para a tela
+            screen = transform(np.asarray(segment, dtype=float))
+            points = self.compute_bezier_points(screen, self.screen_steps(screen) + 1)
+            canvas.create_line(*points.ravel().tolist(), 
+                             fill=self.color, width=3, capstyle="round")
+
+    def screen_steps(self, screen_points, tolerance=None):
+        """
+        Número de subdivisões para que a polilinha fique a menos de 'tolerance' pixels da curva,
+        pela fórmula de Wang: n = sqrt(3/4 * max|P[i] - 2P[i+1] + P[i+2]| / tolerância).
+        """
+        tolerance = tolerance or self.FLATNESS_TOLERANCE
+        second_differences = screen_points[:-2] - 2 * screen_points[1:-1] + screen_points[2:]
+        deviation = np.hypot(second_differences[:, 0], second_differences[:, 1]).max()
+        return int(min(max(math.ceil(math.sqrt(0.75 * deviation / tolerance)), 1), self.MAX_STEPS))
 
     def get_bezier_segments(self):
         segments = []
@@ -151,25 +402,56 @@ class Curve2D(GraphicObject):
         return segments
 
     def compute_bezier_points(self, control_points, steps=20):
-        points = []
-        for t in np.linspace(0, 1, steps):
-            x = ( (1-t)**3 * control_points[0][0] +
-                  3*(1-t)**2 * t * control_points[1][0] +
-                  3*(1-t)*t**2 * control_points[2][0] +
-                  t**3 * control_points[3][0] )
-            y = ( (1-t)**3 * control_points[0][1] +
-                  3*(1-t)**2 * t * control_points[1][1] +
-                  3*(1-t)*t**2 * control_points[2][1] +
-                  t**3 * control_points[3][1] )
-            points.append((x, y))
-        return points
+        """Avalia 'steps' pontos do segmento cúbico como um produto da base de Bernstein pelos pontos de controle."""
+        return bernstein_matrix(steps) @ np.asarray(control_points, dtype=float)
+
+    def _accept_all_segments(self):
+        self.clipped_segments = self.get_bezier_segments()
+        self.visible_intervals = [(index, 0.0, 1.0) for index in range(len(self.clipped_segments))]
 
     def clip(self, clip_window, max_depth=8):
+        if self._clip_cached("subdivision", clip_window):
+            return
+        if self._clip_inside:
+            self._accept_all_segments()
+            return
         self.clipped_segments = []
         segments = self.get_bezier_segments()
         for segment in segments:
             self._clip_segment(segment, clip_window, max_depth)
 
+    def clip_analytic(self, clip_window):
+        """
+        Clipagem exata: resolve as interseções de cada segmento cúbico com as bordas da window
+        (considerando rotação) e guarda um sub-segmento por trecho visível.
+        """
+        if self._clip_cached("analytic", clip_window):
+            return
+        if self._clip_inside:
+            self._accept_all_segments()
+            return
+        self.clipped_segments = []
+        self.visible_intervals = []
+        for index, segment in enumerate(self.get_bezier_segments()):
+            for t0, t1 in bezier_visible_intervals(segment, clip_window):
+                self.visible_intervals.append((index, t0, t1))
+                self.clipped_segments.append(self._sub_segment(segment, t0, t1))
+
+    @staticmethod
+    def _sub_segment(control_points, t0, t1):
+        """Pontos de controle do trecho [t0, t1] de um segmento cúbico, pela forma polar (blossom)."""
+        points = np.asarray(control_points, dtype=float)
+        if t0 == 0 and t1 == 1:
+            return [tuple(p) for p in points.tolist()]
+
+        def blossom(*params):
+            pts = points
+            for u in params:
+                pts = (1 - u) * pts[:-1] + u * pts[1:]
+            return tuple(pts[0].tolist())
+
+        return [blossom(t0, t0, t0), blossom(t0, t0, t1), blossom(t0, t1, t1), blossom(t1, t1, t1)]
+
     def _clip_segment(self, segment, clip_window, depth):
         if depth == 0:
             if self._is_visible(segment, clip_window):
@@ -230,151 +512,122 @@ class Curve2D(GraphicObject):
 
 class BSpline(GraphicObject):
     prefix = "B"
+    STEPS_PER_SEGMENT = 100
     
-    def __init__(self, coordinates, color="#00aaff", degree=3):
+    def __init__(self, coordinates, color="#00aaff", degree=3, knots=None):
+        """
+        B-Spline de grau 'degree' com vetor de nós opcional ('knots', com len(coordinates) + degree + 1
+        valores não decrescentes). Sem nós, a curva é uniforme.
+        """
         super().__init__(coordinates, color)
-        self.degree = degree
-        self._validate_input()
-        self.curve_points = []
-        self._compute_entire_curve()
+        self.curve_points = np.empty((0, 2))
+        self.visible_runs = []  # Trechos visíveis da polilinha da curva, após o clipping
+        self.set_knots(degree, knots)
+
+    def set_knots(self, degree, knots=None):
+        """Altera grau e vetor de nós, validando-os, e recalcula a curva."""
+        knots = None if knots is None else np.asarray(knots, dtype=float)
+        self._validate_input(self.coordinates, degree, knots)
+        self.degree, self.knots = degree, knots
+        self.curve_points = self._compute_entire_curve(self.coordinates)
+        self.invalidate_geometry()
         
-    def _validate_input(self):
-        if len(self.coordinates) < 4:
-            raise ValueError("B-Spline requer pelo menos 4 pontos de controle")
-        if len(self.coordinates) < self.degree + 1:
-            raise ValueError(f"Grau {self.degree} requer pelo menos {self.degree + 1} pontos")
-
-    def _compute_entire_curve(self):
-        """Pré-computa todos os pontos da curva usando Forward Differences"""
-        n = len(self.coordinates)
-        self.curve_points = []
-        
-        for i in range(n - self.degree):
-            segment = self.coordinates[i:i+self.degree+1]
-            self.curve_points.extend(self._compute_segment(segment))
-            
-        self._remove_duplicate_points()
-
-    def _compute_segment(self, control_points, steps=100):
-        """Calcula um segmento da curva com Forward Differences"""
-        if len(control_points) != 4:
-            return []
-            
-        coeffs = self._calculate_coefficients(control_points)
-        points = []
-        
-        # Parâmetros de diferença
-        delta = 1.0 / steps
-        delta2 = delta * delta
-        delta3 = delta * delta * delta
-        
-        # Inicialização para X
-        x = coeffs['dx']  # Termo constante dx (d)
-        dx = (
-            coeffs['cx'] * delta +
-            coeffs['bx'] * delta2 +
-            coeffs['ax'] * delta3
-        )
-        d2x = (
-            2 * coeffs['bx'] * delta2 +
-            6 * coeffs['ax'] * delta3
-        )
-        d3x = 6 * coeffs['ax'] * delta3
-        
-        # Inicialização para Y
-        y = coeffs['dy']  # Termo constante dy (d)
-        dy = (
-            coeffs['cy'] * delta +
-            coeffs['by'] * delta2 +
-            coeffs['ay'] * delta3
-        )
-        d2y = (
-            2 * coeffs['by'] * delta2 +
-            6 * coeffs['ay'] * delta3
-        )
-        d3y = 6 * coeffs['ay'] * delta3
-        
-        # Geração dos pontos
-        for _ in range(steps):
-            points.append((x, y))
-            x += dx
-            dx += d2x
-            d2x += d3x
-            
-            y += dy
-            dy += d2y
-            d2y += d3y
-            
-        return points
-
-
-    def _calculate_coefficients(self, control_points):
-        """Calcula os coeficientes para B-Spline cúbica uniforme"""
-        p0, p1, p2, p3 = control_points
-        
-        return {
-            # Coeficientes para X
-            'ax': (-p0[0] + 3*p1[0] - 3*p2[0] + p3[0]) / 6,
-            'bx': (3*p0[0] - 6*p1[0] + 3*p2[0]) / 6,
-            'cx': (-3*p0[0] + 3*p2[0]) / 6,
-            'dx': (p0[0] + 4*p1[0] + p2[0]) / 6,
-            
-            # Coeficientes para Y
-            'ay': (-p0[1] + 3*p1[1] - 3*p2[1] + p3[1]) / 6,
-            'by': (3*p0[1] - 6*p1[1] + 3*p2[1]) / 6,
-            'cy': (-3*p0[1] + 3*p2[1]) / 6,
-            'dy': (p0[1] + 4*p1[1] + p2[1]) / 6
-        }
-
-    def _remove_duplicate_points(self):
-        """Remove pontos duplicados para suavização"""
-        unique_points = []
-        prev = None
-        for p in self.curve_points:
-            if prev is None or abs(p[0]-prev[0]) > 1e-6 or abs(p[1]-prev[1]) > 1e-6:
-                unique_points.append(p)
-                prev = p
-        self.curve_points = unique_points
+    @staticmethod
+    def _validate_input(coordinates, degree, knots):
+        if degree < 1:
+            raise ValueError("O grau da B-Spline deve ser pelo menos 1")
+        if len(coordinates) < degree + 1:
+            raise ValueError(f"Grau {degree} requer pelo menos {degree + 1} pontos")
+        if knots is not None:
+            expected = len(coordinates) + degree + 1
+            if knots.shape != (expected,):
+                raise ValueError(f"O vetor de nós deve ter {expected} valores")
+            if np.any(np.diff(knots) < 0):
+                raise ValueError("O vetor de nós deve ser não decrescente")
+            if not knots[len(coordinates)] > knots[degree]:
+                raise ValueError("O vetor de nós define um domínio vazio")
+
+    def _compute_entire_curve(self, coordinates):
+        """
+        Calcula todos os pontos da curva dos pontos de controle 'coordinates': STEPS_PER_SEGMENT
+        amostras por segmento, mais o extremo final, qualquer que seja o caminho. A B-Spline cúbica
+        uniforme é avaliada em um único produto matricial: (potências de t × matriz da B-Spline) ×
+        janelas de 4 pontos de controle empilhadas. Outros graus e vetores de nós usam
+        _compute_general_curve.
+        """
+        control = np.asarray(coordinates, dtype=float).reshape(-1, 2)
+        if self.degree != 3 or self.knots is not None:
+            return self._remove_duplicate_points(self._compute_general_curve(control))
+        # (S, 4, 2): uma janela de pontos de controle por segmento
+        windows = np.lib.stride_tricks.sliding_window_view(control, 4, axis=0).transpose(0, 2, 1)
+        points = bspline_basis_matrix(self.STEPS_PER_SEGMENT) @ windows
+        # Extremo final (t = 1 no último segmento), como em _compute_general_curve
+        end = BSPLINE_MATRIX.sum(axis=0) @ windows[-1]
+        return self._remove_duplicate_points(np.vstack([points.reshape(-1, 2), end]))
+
+    def _compute_general_curve(self, control):
+        """
+        Amostra STEPS_PER_SEGMENT parâmetros por intervalo de nós não vazio do domínio
+        [knots[degree], knots[n]], mais o extremo final. As bases de todas as amostras saem de uma
+        vez (bspline_basis) e cada intervalo é combinado com sua janela de degree+1 pontos de controle.
+        """
+        n, degree = len(control), self.degree
+        knots = self.knots if self.knots is not None else np.arange(n + degree + 1, dtype=float)
+        spans = np.arange(degree, n)
+        spans = spans[knots[spans + 1] > knots[spans]]
+        steps = np.arange(self.STEPS_PER_SEGMENT) / self.STEPS_PER_SEGMENT
+
+        params = knots[spans, None] + steps * (knots[spans + 1] - knots[spans])[:, None]
+        params = np.append(params.ravel(), knots[n])
+        sample_spans = np.append(np.repeat(spans, self.STEPS_PER_SEGMENT), spans[-1])
+        basis = bspline_basis(knots, degree, sample_spans, params)
+
+        windows = control[spans[:, None] + np.arange(-degree, 1)]  # (S, degree+1, 2)
+        body = basis[:-1].reshape(len(spans), self.STEPS_PER_SEGMENT, degree + 1) @ windows
+        return np.vstack([body.reshape(-1, 2), basis[-1] @ windows[-1]])
+
+    def _coordinates_changed(self, coordinates):
+        self._validate_input(coordinates, self.degree, self.knots)
+        self.curve_points = self._compute_entire_curve(coordinates)
+
+    def _geometry_points(self):
+        # A curva fica dentro do fecho convexo dos pontos de controle: a bbox da curva é mais justa
+        return self.curve_points
+
+    @staticmethod
+    def _remove_duplicate_points(points):
+        """Remove pontos consecutivos coincidentes (tolerância de 1e-6)"""
+        keep = np.ones(len(points), dtype=bool)
+        keep[1:] = (np.abs(np.diff(points, axis=0)) > 1e-6).any(axis=1)
+        return points[keep]
 
     @property
     def type(self):
         return "B-Spline"
 
     def draw(self, canvas, transform):
-        if not self.curve_points:
-            return
-            
-        visible_points = []
-        for x, y in self.curve_points:
-            if self._point_inside_clip_window(x, y):
-                tx, ty = transform(x, y)
-                visible_points.extend([tx, ty])
-        
-        if len(visible_points) >= 4:
-            canvas.create_line(
-                *visible_points,
-                fill=self.color,
-                width=3,
-                smooth=True,
-                splinesteps=100
-            )
-
-    def _point_inside_clip_window(self, x, y):
-        return (self.window["xmin"] <= x <= self.window["xmax"] and
-                self.window["ymin"] <= y <= self.window["ymax"])
-
-    def clip(self, clip_window):
-        """Clipagem otimizada usando bounding box dos pontos de controle"""
-        x_coords = [p[0] for p in self.coordinates]
-        y_coords = [p[1] for p in self.coordinates]
-        
-        self.visible = not (
-            max(x_coords) < clip_window["xmin"] or
-            min(x_coords) > clip_window["xmax"] or
-            max(y_coords) < clip_window["ymin"] or
-            min(y_coords) > clip_window["ymax"]
-        )
+        # A polilinha pré-computada já é densa: cada trecho visível vira uma linha simples, sem smooth
+        for run in self.visible_runs:
+            screen = simplify_screen_polyline(transform(run))
+            if len(screen) >= 2:
+                canvas.create_line(*screen.ravel().tolist(), fill=self.color, width=3, capstyle="round")
+
+    def clip(self, clip_window, clipper=None, stats=None):
+        """
+        Clipa a polilinha da curva em trechos visíveis (clip_polylines), com os pontos exatos de
+        entrada/saída. Sem 'clipper' usa Liang-Barsky; com ele, o clipador de segmentos em lote
+        recebido. O resultado fica em cache por técnica, window e geometria.
+        """
         self.window = clip_window
+        method = "polyline" if clipper is None else f"polyline:{clipper.__name__}"
+        if self._clip_cached(method, clip_window):
+            return
+        points = np.asarray(self.curve_points, dtype=float).reshape(-1, 2)
+        if self._clip_inside:
+            self.visible_runs = [points] if len(points) else []
+        else:
+            self.visible_runs = clip_polylines(points, [0, len(points)], clip_window, clipper, stats)
+        self.visible = len(self.visible_runs) > 0
 
 ####################### Objetos 3D #######################
 
@@ -398,33 +651,71 @@ class Ponto3D(GraphicObject):
 class Objeto3D(GraphicObject):
     prefix = "O3D"
     
-    def __init__(self, segments, color="#00aaff"):
-        self.segments = segments  # Lista de segmentos [(p1, p2), ...] onde p1 e p2 são tuplas (x,y,z)
-        # Extrai todas as coordenadas únicas para a lista de coordenadas
-        all_points = []
-        for p1, p2 in segments:
-            all_points.extend([p1, p2])
-        # Remove duplicatas mantendo a ordem
-        unique_points = []
-        seen = set()
-        for point in all_points:
-            if point not in seen:
-                seen.add(point)
-                unique_points.append(point)
-        super().__init__(unique_points, color)
+    def __init__(self, segments=(), color="#00aaff", vertices=None, edges=None):
+        """
+        Objeto de arame 3D guardado como vértices únicos (as coordenadas) e um array (E,2) de
+        arestas com os índices dos seus extremos. Pode ser criado a partir de uma lista de
+        segmentos [(p1, p2), ...], com p1 e p2 tuplas (x,y,z), ou diretamente de 'vertices' e 'edges'.
+        """
+        if vertices is None:
+            # Vértices únicos na ordem em que aparecem; cada extremo vira um índice
+            index = {}
+            edges = [[index.setdefault(tuple(p), len(index)) for p in segment] for segment in segments]
+            vertices = list(index)
+        elif edges is None:
+            raise ValueError("Objeto3D criado com 'vertices' requer também 'edges'")
+        self.edges = np.asarray(edges, dtype=np.intp).reshape(-1, 2)
+        if len(self.edges) and (self.edges.min() < 0 or self.edges.max() >= len(vertices)):
+            raise ValueError("As arestas referenciam vértices inexistentes")
+        super().__init__([tuple(p) for p in vertices], color)
+        self._vertex_cache = None
+        self.chains = self._chain_edges(self.edges)
     
     @property
     def type(self):
         return "Objeto3D"
+
+    @property
+    def vertex_array(self):
+        """Vértices únicos como array (V,3), em cache até a próxima mudança das coordenadas."""
+        if self._vertex_cache is None:
+            self._vertex_cache = np.asarray(self.coordinates, dtype=float).reshape(-1, 3)
+        return self._vertex_cache
+
+    def _coordinates_changed(self, coordinates):
+        # As arestas guardam índices, então só o array de vértices precisa ser refeito
+        vertices = np.asarray(coordinates, dtype=float).reshape(-1, 3)
+        if len(vertices) != len(self.coordinates):
+            raise ValueError("O número de vértices não pode mudar: as arestas guardam seus índices")
+        self._vertex_cache = vertices
+
+    @property
+    def segments(self):
+        """Segmentos [(p1, p2), ...] reconstruídos a partir dos vértices e arestas."""
+        return [(self.coordinates[a], self.coordinates[b]) for a, b in self.edges.tolist()]
+
+    @staticmethod
+    def _chain_edges(edges):
+        """
+        Agrupa arestas consecutivas encadeadas (fim de uma = início da seguinte) em polilinhas.
+        Retorna (índices dos vértices das cadeias, offsets), no formato CSR de clip_polylines.
+        """
+        if not len(edges):
+            return np.empty(0, dtype=np.intp), np.zeros(1, dtype=np.intp)
+        begins = np.ones(len(edges), dtype=bool)
+        begins[1:] = edges[1:, 0] != edges[:-1, 1]
+        keep = np.stack([begins, np.ones(len(edges), dtype=bool)], axis=1).ravel()
+        offsets = np.append(np.flatnonzero(begins) + np.arange(begins.sum()), keep.sum())
+        return edges.ravel()[keep], offsets
     
     def draw(self, canvas, transform):
-        for p1, p2 in self.segments:
-            x1, y1, z1 = p1
-            x2, y2, z2 = p2
-            vx1, vy1 = transform(x1, y1, z1)
-            vx2, vy2 = transform(x2, y2, z2)
+        if not len(self.edges):
+            return
+        # Projeta cada vértice único uma vez e reúne os extremos das arestas por índice
+        projected = transform(self.vertex_array)[self.edges]
+        for (vx1, vy1), (vx2, vy2) in projected:
             canvas.create_line(vx1, vy1, vx2, vy2, 
-                             fill=self.color, width=2, capstyle=tk.ROUND)
+                             fill=self.color, width=2, capstyle="round")
 
 
 class BezierPatch(GraphicObject):
@@ -447,55 +738,47 @@ class BezierPatch(GraphicObject):
             raise ValueError("Deve haver 16 pontos de controle (4x4)")
         super().__init__(control_points, color)
         self.resolution = resolution
-        self.surface_points = [] 
-        self._compute_surface_points()
+        self._surface_points = None  # Malha (res, res, 3), calculada sob demanda
 
     @property
     def type(self):
         return "Retalho Bézier"
+
+    @property
+    def surface_points(self):
+        """Malha (resolution, resolution, 3) de pontos da superfície; u varia nas linhas e v nas colunas."""
+        if self._surface_points is None:
+            self._compute_surface_points()
+        return self._surface_points
+
+    def _coordinates_changed(self, coordinates):
+        np.asarray(coordinates, dtype=float).reshape(4, 4, 3)  # valida antes de descartar a malha
+        self._surface_points = None
+
+    def _geometry_points(self):
+        return self.surface_points.reshape(-1, 3)
     
     def _compute_surface_points(self):
         """Calcula os pontos da superfície em 3D."""
-        self.surface_points = []
-        for u in np.linspace(0, 1, self.resolution):
-            for v in np.linspace(0, 1, self.resolution):
-                x, y, z = self._evaluate_bezier(u, v)
-                self.surface_points.append((x, y, z))
-    
-    def _evaluate_bezier(self, u, v):
-        """
-        Avalia a superfície nos parâmetros u e v usando combinação linear.
+        self._surface_points = self.evaluate_patches(self.control_grid()[None], self.resolution)[0]
 
-        DOC IAgen:
-        Foi usado IA para entender melhor como usar a combinação linear para calcular os pontos da superfície
-        DeepSeek https://chat.deepseek.com
+    def control_grid(self):
+        """Pontos de controle como array (4, 4, 3)."""
+        return np.asarray(self.coordinates, dtype=float).reshape(4, 4, 3)
 
-        Prompt usado:
-        Qual a melhor de escrever um codigo para calcular os pontos de uma superficie de bezier usando combinação linear?
-        """
-        B = [(1 - u)**3, 
-             3 * u * (1 - u)**2, 
-             3 * u**2 * (1 - u), 
-             u**3]
-        Bv = [(1 - v)**3, 
-              3 * v * (1 - v)**2, 
-              3 * v**2 * (1 - v), 
-              v**3]
-        
-        x, y, z = 0, 0, 0
-        for i in range(4):
-            for j in range(4):
-                weight = B[i] * Bv[j]
-                px, py, pz = self.coordinates[i*4 + j]
-                x += px * weight
-                y += py * weight
-                z += pz * weight
-        return (x, y, z)
+    @staticmethod
+    def evaluate_patches(control_grids, resolution):
+        """
+        Avalia P retalhos de uma vez pelo produto tensorial B(u) · P · B(v)ᵀ, com a base de
+        Bernstein em cache por resolução. Recebe (P, 4, 4, 3) e retorna (P, res, res, 3).
+        """
+        basis = bernstein_matrix(resolution)
+        return np.einsum("ui,pijk,vj->puvk", basis, np.asarray(control_grids, dtype=float), basis, optimize=True)
     
     def draw(self, canvas, transform):
         """Desenha a superfície usando a transformação 3D para 2D."""
         # Projeta pontos 3D para 2D
-        projected = [transform(x, y, z) for (x, y, z) in self.surface_points]
+        projected = transform(self.surface_points.reshape(-1, 3))
         
         # Desenha linhas na direção U (horizontal)
         for i in range(self.resolution):
@@ -534,9 +817,38 @@ class BezierSurface(GraphicObject):
     @property
     def type(self):
         return "Superfície Bézier"
+
+    def _extent(self):
+        # Sem cache próprio: combina as bboxes em cache dos retalhos, que podem mudar independentemente
+        extents = [patch._extent() for patch in self.patches]
+        extents = [extent for extent in extents if extent is not None]
+        if not extents:
+            return None
+        return (np.min([mins for mins, _ in extents], axis=0).tolist(), np.max([maxs for _, maxs in extents], axis=0).tolist())
+
+    @property
+    def centroid(self):
+        points = [p for patch in self.patches for p in patch.coordinates]
+        return tuple(np.mean(points, axis=0).tolist()) if points else None
     
+    def surface_grids(self):
+        """
+        Malhas (res, res, 3) de todos os retalhos. Os retalhos ainda não avaliados são calculados
+        juntos, em uma única operação empilhada por resolução, e ficam em cache em cada retalho.
+        """
+        stale = {}
+        for patch in self.patches:
+            if patch._surface_points is None:
+                stale.setdefault(patch.resolution, []).append(patch)
+        for resolution, patches in stale.items():
+            grids = BezierPatch.evaluate_patches([patch.control_grid() for patch in patches], resolution)
+            for patch, grid in zip(patches, grids):
+                patch._surface_points = grid
+        return [patch.surface_points for patch in self.patches]
+
     def draw(self, canvas, transform):
         """Desenha todos os retalhos da superfície."""
+        self.surface_grids()
         for patch in self.patches:
             patch.draw(canvas, transform)
 
@@ -560,6 +872,9 @@ class BSplineSurface(GraphicObject):
         copiando codigo base e colando no prompt
     """
     prefix = "BSS"
+    MAX_MESH_POINTS = 1_000_000  # Pontos de malha por quadro; acima disso a resolução dos patches visíveis cai
+    ROW_BLOCK = 8  # Linhas de patches tesseladas por vez em visible_patch_grids
+    MESH_SPACING_PIXELS = 8  # Espaçamento alvo, na tela, entre as linhas da malha de redes grandes
 
     def __init__(self, control_matrix, color="#00aaff", resolution=15):
         """
@@ -580,106 +895,138 @@ class BSplineSurface(GraphicObject):
         super().__init__(all_points, color)
 
         self.resolution = resolution
-        # 'surface_patches' conterá uma lista de malhas de pontos, uma para cada patch 4x4.
-        self.surface_patches = self._compute_all_patches()
+        # Malhas de todos os patches, calculadas sob demanda (ver surface_patches)
+        self._surface_patches = None
 
     @property
     def type(self):
         return "Superfície B-Spline"
 
-    # Em objects.py, DENTRO da classe BSplineSurface, SUBSTITUA o método antigo por este:
-
-    def _compute_patch_points_fd(self, Gx, Gy, Gz):
-        # Matriz base da B-Spline
-        M_bs = (1/6) * np.array([
-            [-1,  3, -3, 1],
-            [ 3, -6,  3, 0],
-            [-3,  0,  3, 0],
-            [ 1,  4,  1, 0]
-        ])
-
-        # Coeficientes da geometria para cada coordenada
-        Cx = M_bs @ Gx @ M_bs.T
-        Cy = M_bs @ Gy @ M_bs.T
-        Cz = M_bs @ Gz @ M_bs.T
-
-        n = self.resolution
-        delta = 1.0 / n
-
-        # Matriz de avaliação das Diferenças Adiante
-        E = np.array([
-            [0, 0, 0, 1],
-            [delta**3, delta**2, delta, 0],
-            [6*delta**3, 2*delta**2, 0, 0],
-            [6*delta**3, 0, 0, 0]
-        ])
-
-        # Matrizes de Diferenças (estado do algoritmo)
-        DD_x = E @ Cx @ E.T
-        DD_y = E @ Cy @ E.T
-        DD_z = E @ Cz @ E.T
-
-        patch_points = np.zeros((n + 1, n + 1, 3))
-
-        # Loop principal na direção U
-        for i in range(n + 1):
-            # Copia o estado atual para gerar a curva na direção V
-            d_x_v = DD_x.copy()
-            d_y_v = DD_y.copy()
-            d_z_v = DD_z.copy()
-
-            # Loop aninhado na direção V
-            for j in range(n + 1):
-                # O ponto atual é o elemento (0,0) da matriz de estado da curva V
-                patch_points[i, j] = [d_x_v[0, 0], d_y_v[0, 0], d_z_v[0, 0]]
-                
-                # Atualiza o estado da curva V (atualização das colunas)
-                d_x_v[:, 0] += d_x_v[:, 1]
-                d_x_v[:, 1] += d_x_v[:, 2]
-                d_x_v[:, 2] += d_x_v[:, 3]
-
-                d_y_v[:, 0] += d_y_v[:, 1]
-                d_y_v[:, 1] += d_y_v[:, 2]
-                d_y_v[:, 2] += d_y_v[:, 3]
-
-                d_z_v[:, 0] += d_z_v[:, 1]
-                d_z_v[:, 1] += d_z_v[:, 2]
-                d_z_v[:, 2] += d_z_v[:, 3]
-            
-            # Atualiza o estado principal para a próxima curva U (atualização das linhas)
-            DD_x[0, :] += DD_x[1, :]
-            DD_x[1, :] += DD_x[2, :]
-            DD_x[2, :] += DD_x[3, :]
-
-            DD_y[0, :] += DD_y[1, :]
-            DD_y[1, :] += DD_y[2, :]
-            DD_y[2, :] += DD_y[3, :]
-
-            DD_z[0, :] += DD_z[1, :]
-            DD_z[1, :] += DD_z[2, :]
-            DD_z[2, :] += DD_z[3, :]
-
-        return patch_points
+    @property
+    def patch_count(self):
+        rows, cols, _ = self.control_matrix.shape
+        return (rows - 3) * (cols - 3)
+
+    @property
+    def surface_patches(self):
+        """Malhas de todos os patches, (patches, n+1, n+1, 3), calculadas na primeira consulta."""
+        if self._surface_patches is None:
+            self._surface_patches = self._compute_all_patches()
+        return self._surface_patches
+
+    def _coordinates_changed(self, coordinates):
+        self.control_matrix = np.array(coordinates, dtype=float).reshape(self.control_matrix.shape)
+        self._surface_patches = None
 
-    def _compute_all_patches(self):
+    # _geometry_points herda os pontos de controle: a superfície fica dentro do fecho convexo deles,
+    # então a bbox é conservadora e não exige tesselar redes grandes
+
+    @staticmethod
+    def _projected_patches(control_matrix, project, window):
         """
-        Itera sobre a matriz de controle, extrai todos os patches 4x4
-        e calcula os pontos de superfície para cada um.
+        Máscara (rows-3, cols-3) dos patches que podem aparecer na window e o tamanho estimado de
+        cada um na window. Cada patch fica dentro do fecho convexo dos seus 16 pontos de controle,
+        então basta projetar os pontos de controle uma vez ('project' recebe (N,3) e retorna (N,2),
+        com NaN onde não há projeção). Patches com pontos não projetáveis são mantidos. O tamanho
+        vem dos 4 pontos centrais, que acompanham o trecho de superfície melhor que o fecho inteiro.
         """
-        all_patch_points = []
-        rows, cols, _ = self.control_matrix.shape
+        rows, cols, _ = control_matrix.shape
+        projected = world_to_window_local(project(control_matrix.reshape(-1, 3)), window).reshape(rows, cols, 2)
+        windows = np.lib.stride_tricks.sliding_window_view(projected, (4, 4), axis=(0, 1))
+        lower, upper = windows.min(axis=(-2, -1)), windows.max(axis=(-2, -1))
+        outside = ((upper[..., 0] < window["xmin"]) | (lower[..., 0] > window["xmax"]) |
+                   (upper[..., 1] < window["ymin"]) | (lower[..., 1] > window["ymax"]))
+        center = windows[..., 1:3, 1:3]
+        size = (center.max(axis=(-2, -1)) - center.min(axis=(-2, -1))).max(axis=-1)
+        return ~outside, size
+
+    def visible_patch_grids(self, project, window, pixel_size=None):
+        """
+        Gera, bloco a bloco, as malhas (k, m+1, m+1, 3) dos patches visíveis.
+        Redes pequenas reaproveitam as malhas em cache, na resolução cheia. Redes grandes são tesseladas
+        ROW_BLOCK linhas de patches por vez, só nos patches visíveis, e o quadro nunca passa de
+        MAX_MESH_POINTS pontos. Com 'pixel_size' (unidades da window por pixel) o nível de detalhe
+        segue a tela: a resolução de cada bloco mira linhas a cada MESH_SPACING_PIXELS e, quando os
+        patches ficam menores que isso, a malha passa a ter menos de uma amostra por patch (ver
+        _knot_grid). Todos os pontos gerados estão sobre a superfície; só o espaçamento entre eles muda,
+        então memória e número de itens ficam limitados mesmo com redes de 200x200.
+        """
+        if self._surface_patches is not None or self.patch_count * (self.resolution + 1) ** 2 <= self.MAX_MESH_POINTS:
+            mask, _ = self._projected_patches(self.control_matrix, project, window)
+            if mask.any():
+                yield self.surface_patches[mask.ravel()]
+            return
+
+        control = self.control_matrix
+        mask, size = self._projected_patches(control, project, window)
+        count = int(mask.sum())
+        if not count:
+            return
+        if pixel_size and not np.isnan(size[mask]).all():
+            pixels = np.nanmedian(size[mask]) / pixel_size
+            stride = int(self.MESH_SPACING_PIXELS // max(pixels, 1e-9))
+            if stride > 1:
+                # Patches menores que o espaçamento alvo: menos de uma amostra por patch
+                yield self._knot_grid(control, mask, stride)
+                return
+
+        budget = max(1, min(self.resolution, math.isqrt(self.MAX_MESH_POINTS // count) - 1))
+        for start in range(0, mask.shape[0], self.ROW_BLOCK):
+            block = mask[start:start + self.ROW_BLOCK]
+            if not block.any():
+                continue
+            n = budget
+            block_size = size[start:start + self.ROW_BLOCK][block]
+            if pixel_size and not np.isnan(block_size).all():
+                pixels = np.nanmax(block_size) / pixel_size
+                n = max(1, min(n, math.ceil(pixels / self.MESH_SPACING_PIXELS)))
+            if n == 1:
+                # Uma amostra por patch: os cantos formam uma única malha contínua, com bem menos itens
+                yield self._knot_grid(control[start:start + len(block) + 3], block, 1)
+            else:
+                yield self._tessellate(control[start:start + len(block) + 3], n, block)
+
+    @staticmethod
+    def _knot_grid(control_matrix, mask, stride):
+        """
+        Malha (1, a, b, 3) com um ponto a cada 'stride' patches, cobrindo o retângulo dos patches
+        marcados em 'mask'. Os pontos são os cantos dos patches, pontos exatos da superfície: na
+        B-Spline cúbica uniforme, S = Σ w_a w_b P[i+a, j+b] com w = (1, 4, 1) / 6. A malha é contínua
+        entre patches, então cada linha da malha vira uma única polilinha.
+        """
+        rows = np.flatnonzero(mask.any(axis=1))
+        cols = np.flatnonzero(mask.any(axis=0))
+        # Cantos do patch (i, j) a (i+1, j+1); a última linha e coluna entram sempre
+        row_idx = np.unique(np.r_[rows[0]:rows[-1] + 2:stride, rows[-1] + 1])
+        col_idx = np.unique(np.r_[cols[0]:cols[-1] + 2:stride, cols[-1] + 1])
+        weights = np.array([1.0, 4.0, 1.0]) / 6
+        corners = sum(weights[a] * weights[b] * control_matrix[row_idx[:, None] + a, col_idx[None, :] + b]
+                      for a in range(3) for b in range(3))
+        return corners[None]
 
-        # Itera para criar (rows-3) x (cols-3) patches
-        for i in range(rows - 3):
-            for j in range(cols - 3):
-                # Extrai a matriz de geometria 4x4 (G)
-                G = self.control_matrix[i:i+4, j:j+4]
-                Gx, Gy, Gz = G[:,:,0], G[:,:,1], G[:,:,2]
+    def _compute_all_patches(self):
+        return self._tessellate(self.control_matrix, self.resolution)
 
-                patch_points = self._compute_patch_points_fd(Gx, Gy, Gz)
-                all_patch_points.append(patch_points)
-                
-        return all_patch_points
+    @staticmethod
+    def _tessellate(control_matrix, n, mask=None):
+        """
+        Calcula as malhas dos patches 4x4 de uma matriz de controle de uma vez pelas diferenças
+        adiante: as matrizes de geometria são empilhadas, C = M_bs · G · M_bsᵀ e DD = E · C · Eᵀ saem
+        em lote e as atualizações de cada passo viram somas cumulativas (forward_difference_sequence).
+        Com 'mask' ((rows-3, cols-3)), só os patches marcados são calculados.
+        Retorna um array (patches, n+1, n+1, 3), com os patches na ordem linha a linha da matriz.
+        """
+        # (rows-3, cols-3, 3, 4, 4): matriz de geometria de cada patch, por coordenada
+        G = np.lib.stride_tricks.sliding_window_view(control_matrix, (4, 4), axis=(0, 1))
+        if mask is not None:
+            G = G[mask]
+        E = forward_difference_matrix(n)
+        DD = E @ (BSPLINE_MATRIX @ G @ BSPLINE_MATRIX.T) @ E.T
+
+        # Direção U: a primeira linha de DD a cada passo dá as diferenças iniciais da curva em V
+        u_curves = forward_difference_sequence(np.swapaxes(DD, -1, -2), n + 1)
+        grid = forward_difference_sequence(u_curves, n + 1)  # (v, u, ..., 3)
+        return np.moveaxis(grid, (0, 1), (-2, -3)).reshape(-1, n + 1, n + 1, 3)
 
     def draw(self, canvas, transform):
         """
@@ -690,8 +1037,7 @@ class BSplineSurface(GraphicObject):
             res_u, res_v, _ = patch_grid.shape
 
             # Projeta todos os pontos 3D da malha para a viewport 2D
-            projected_grid = np.array([transform(p[0], p[1], p[2]) for p in patch_grid.reshape(-1, 3)])
-            projected_grid = projected_grid.reshape(res_u, res_v, 2)
+            projected_grid = transform(patch_grid.reshape(-1, 3)).reshape(res_u, res_v, 2)
 
             # Desenha as linhas da malha na direção U
             for i in range(res_u):
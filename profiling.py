@@ -0,0 +1,82 @@
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+
+class RedrawProfiler:
+    """
+    Instrumentação opcional do redraw do GraphicsSystem.
+    Acumula, a cada quadro, o tempo e os itens de canvas produzidos por etapa (câmera, culling,
+    clipping, desenho) e por tipo de objeto, além de contadores como aceitações/rejeições do
+    clipping e iterações do Cohen-Sutherland. O resumo do último quadro fica em last_frame.
+    """
+    FPS_WINDOW = 30  # Quadros considerados na média de FPS
+
+    def __init__(self, overlay=False):
+        self.overlay = overlay
+        self.last_frame = None
+        self._frame_ends = deque(maxlen=self.FPS_WINDOW)
+        self._frame_start = None
+        self._reset()
+
+    def _reset(self):
+        self.stages = defaultdict(lambda: {"time": 0.0, "items": 0})
+        self.types = defaultdict(lambda: {"count": 0, "clip_time": 0.0, "draw_time": 0.0, "items": 0})
+        self.counters = defaultdict(int)
+
+    def begin_frame(self):
+        self._reset()
+        self._frame_start = time.perf_counter()
+
+    def end_frame(self, item_count):
+        end = time.perf_counter()
+        self._frame_ends.append(end)
+        self.last_frame = {
+            "time": end - self._frame_start,
+            "fps": self.fps,
+            "item_count": item_count,
+            "stages": {name: dict(stats) for name, stats in self.stages.items()},
+            "types": {name: dict(stats) for name, stats in self.types.items()},
+            "counters": dict(self.counters),
+        }
+        return self.last_frame
+
+    @contextmanager
+    def stage(self, name, renderer=None):
+        """Mede o bloco como a etapa 'name'; com o renderer, conta também os itens emitidos."""
+        emitted = renderer.emitted if renderer is not None else 0
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            stats = self.stages[name]
+            stats["time"] += time.perf_counter() - start
+            if renderer is not None:
+                stats["items"] += renderer.emitted - emitted
+
+    def record_object(self, type_name, clip_time, draw_time, items, accepted):
+        """Registra um objeto do quadro; 'accepted' diz se o clipping deixou alguma parte visível."""
+        stats = self.types[type_name]
+        stats["count"] += 1
+        stats["clip_time"] += clip_time
+        stats["draw_time"] += draw_time
+        stats["items"] += items
+        self.stages["clip"]["time"] += clip_time
+        self.stages["draw"]["time"] += draw_time
+        self.stages["draw"]["items"] += items
+        self.counters["clip_accept" if accepted else "clip_reject"] += 1
+
+    def count(self, name, n=1):
+        self.counters[name] += n
+
+    @property
+    def fps(self):
+        """Quadros por segundo efetivamente desenhados, na média dos últimos FPS_WINDOW quadros."""
+        if len(self._frame_ends) < 2:
+            return 0.0
+        span = self._frame_ends[-1] - self._frame_ends[0]
+        return (len(self._frame_ends) - 1) / span if span > 0 else 0.0
+
+    def overlay_text(self, item_count):
+        elapsed = time.perf_counter() - self._frame_start
+        return f"FPS: {self.fps:.1f}  quadro: {elapsed * 1000:.1f} ms  itens: {item_count}"
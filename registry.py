@@ -0,0 +1,47 @@
+from collections import defaultdict
+
+
+class ObjectRegistry:
+    """
+    Registro dos objetos gráficos indexado por nome e por tipo, mantido junto ao display file.
+    Substitui as buscas lineares por nome (seleção, transformações, montagem de superfícies)
+    por consultas O(1) em dicionários.
+    """
+
+    def __init__(self, objects=()):
+        self._by_name = {}
+        self._by_type = defaultdict(dict)  # tipo -> {nome: objeto}, na ordem de inserção
+        for obj in objects:
+            self.add(obj)
+
+    def __len__(self):
+        return len(self._by_name)
+
+    def __contains__(self, name):
+        return name in self._by_name
+
+    def add(self, obj):
+        self._by_name[obj.name] = obj
+        self._by_type[obj.type][obj.name] = obj
+
+    def remove(self, obj):
+        # Só remove se o nome ainda aponta para este objeto
+        if self._by_name.get(obj.name) is obj:
+            del self._by_name[obj.name]
+            del self._by_type[obj.type][obj.name]
+
+    def clear(self):
+        self._by_name.clear()
+        self._by_type.clear()
+
+    def rebuild(self, objects):
+        self.clear()
+        for obj in objects:
+            self.add(obj)
+
+    def get(self, name, default=None):
+        return self._by_name.get(name, default)
+
+    def of_type(self, type_name):
+        """Objetos de um tipo (o valor de obj.type, ex.: "Polígono"), na ordem de inserção."""
+        return list(self._by_type.get(type_name, {}).values())
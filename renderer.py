@@ -0,0 +1,157 @@
+class _CanvasItem:
+    __slots__ = ("kind", "id", "options", "hidden")
+
+    def __init__(self, kind, item_id, options):
+        self.kind = kind
+        self.id = item_id
+        self.options = options
+        self.hidden = False
+
+
+class RetainedCanvas:
+    """
+    Renderizador em modo retido sobre o tk.Canvas.
+    Expõe a mesma interface create_* usada pelos métodos draw dos objetos, mas guarda um
+    mapeamento objeto -> itens do canvas e, a cada quadro, atualiza os itens existentes com
+    coords/itemconfigure em vez de apagar e recriar tudo.
+    Itens de objetos clipados ou descartados pelo índice espacial ficam ocultos; itens só são
+    criados ou apagados quando o número de primitivas de um objeto muda ou quando o objeto
+    sai do display file (forget).
+    O empilhamento dos itens visíveis segue a ordem de emissão do quadro: itens reaproveitados
+    mantêm sua posição, e itens criados, substituídos ou reexibidos são empilhados logo acima
+    do item emitido antes deles.
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self._items = {}  # chave do objeto -> lista de _CanvasItem na ordem de desenho
+        self._key = None
+        self._cursor = 0
+        self._frame_keys = set()
+        self._shown_keys = set()  # objetos com itens visíveis no quadro anterior
+        self._last_id = None  # último item emitido no quadro, referência para o empilhamento
+        self._top_id = None  # item no topo do canvas, quando conhecido
+        self.emitted = 0  # Total de primitivas emitidas, usado pela instrumentação do redraw
+
+    def begin_frame(self):
+        self._end_object()
+        self._frame_keys = set()
+        self._last_id = None
+
+    def begin_object(self, key):
+        """Inicia as primitivas de um objeto; as chamadas create_* seguintes reaproveitam seus itens."""
+        self._end_object()
+        self._key = key
+        self._cursor = 0
+        self._frame_keys.add(key)
+        self._items.setdefault(key, [])
+
+    def end_frame(self):
+        """Finaliza o quadro ocultando os itens dos objetos que não foram desenhados nele."""
+        self._end_object()
+        for key in self._shown_keys - self._frame_keys:
+            for item in self._items.get(key, []):
+                if not item.hidden:
+                    self.canvas.itemconfigure(item.id, state="hidden")
+                    item.hidden = True
+        self._shown_keys = self._frame_keys
+
+    def forget(self, key):
+        """Apaga os itens de um objeto removido do display file."""
+        if key == self._key:
+            self._key = None
+        for item in self._items.pop(key, []):
+            if item.id == self._last_id:
+                self._last_id = None
+            if item.id == self._top_id:
+                self._top_id = None
+            self.canvas.delete(item.id)
+        self._shown_keys.discard(key)
+        self._frame_keys.discard(key)
+
+    def clear(self):
+        self._end_object()
+        for key in list(self._items):
+            self.forget(key)
+
+    @property
+    def item_count(self):
+        return sum(len(items) for items in self._items.values())
+
+    def _end_object(self):
+        if self._key is None:
+            return
+        # Primitivas que sobraram (objeto clipado ou com menos primitivas) ficam ocultas para reuso
+        for item in self._items[self._key][self._cursor:]:
+            if not item.hidden:
+                self.canvas.itemconfigure(item.id, state="hidden")
+                item.hidden = True
+        self._key = None
+
+    def _emit(self, kind, args, options):
+        self.emitted += 1
+        create = getattr(self.canvas, f"create_{kind}")
+        if self._key is None:
+            self._top_id = None  # item avulso criado no topo, fora do controle do renderizador
+            return create(*args, **options)
+
+        items = self._items[self._key]
+        item = items[self._cursor] if self._cursor < len(items) else None
+
+        if item is not None and item.kind == kind and item.options.keys() == options.keys():
+            self.canvas.coords(item.id, *args)
+            changes = {}
+            if item.options != options:
+                changes.update(options)
+                item.options = options
+            restack = item.hidden
+            if item.hidden:
+                changes["state"] = "normal"
+                item.hidden = False
+            if changes:
+                self.canvas.itemconfigure(item.id, **changes)
+        else:
+            new_item = _CanvasItem(kind, create(*args, **options), options)
+            if item is not None:
+                self.canvas.delete(item.id)
+                items[self._cursor] = new_item
+            else:
+                items.append(new_item)
+            # O Tk cria o item no topo: se o item emitido antes dele era o do topo (ou se o canvas
+            # só tem este item), o novo item já está na posição certa e não precisa ser reempilhado
+            if self._last_id is None:
+                restack = self.item_count > 1
+            else:
+                restack = self._last_id != self._top_id
+            item = new_item
+            self._top_id = item.id
+
+        if restack:
+            # Itens novos vão para o topo do canvas e itens reexibidos guardam a posição de quando
+            # foram ocultos: ambos voltam para logo acima do item emitido antes deles
+            if self._last_id is None:
+                self.canvas.tag_lower(item.id)
+            else:
+                self.canvas.tag_raise(item.id, self._last_id)
+            if self._last_id is not None and self._last_id == self._top_id:
+                self._top_id = item.id
+            elif self._top_id == item.id:
+                self._top_id = None
+        self._last_id = item.id
+        self._cursor += 1
+        return item.id
+
+    def create_line(self, *args, **options):
+        return self._emit("line", args, options)
+
+    def create_oval(self, *args, **options):
+        return self._emit("oval", args, options)
+
+    def create_polygon(self, *args, **options):
+        return self._emit("polygon", args, options)
+
+    def create_rectangle(self, *args, **options):
+        return self._emit("rectangle", args, options)
+
+    def create_text(self, *args, **options):
+        return self._emit("text", args, options)
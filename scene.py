@@ -0,0 +1,478 @@
+import time
+from contextlib import nullcontext
+import numpy as np
+from objects import Point, Line, LineSegments, Polylines, Polygon, PolygonShape, Curve2D, BSpline, Ponto3D, Objeto3D, BezierPatch, BezierSurface, BSplineSurface
+from spatial_index import SpatialGrid
+from registry import ObjectRegistry
+from profiling import RedrawProfiler
+from viewing import window_to_viewport, Camera
+from clipping import window_local_to_world, clip_segments_cohen_sutherland, clip_segments_liang_barsky, clip_polygons_sutherland_hodgman, clip_polylines, classify_bounds, BOUNDS_OUTSIDE, BOUNDS_INSIDE, BOUNDS_PARTIAL
+
+
+class Scene:
+    """
+    Estado e pipeline de desenho que não dependem do Tk: viewport, window, display file, índices,
+    câmera, clipping e o laço de redraw. O GraphicsSystem (interface Tkinter) e o HeadlessRenderer
+    herdam desta classe; cada um cria o self.renderer sobre o seu canvas e fornece as configurações
+    lidas a cada quadro (line_clip_method, curve_clip_method, projection_type e d_entry), objetos
+    com get() como tk.StringVar ou ttk.Entry.
+    """
+    CANVAS_WIDTH = 775
+    CANVAS_HEIGHT = 383
+    # Clipadores de segmentos em lote, indexados pela técnica selecionada em line_clip_method
+    SEGMENT_CLIPPERS = {"CS": clip_segments_cohen_sutherland, "LB": clip_segments_liang_barsky}
+
+    def _init_scene(self, max_fps=60):
+        """Estado da cena: viewport, window, display file, índices e câmera."""
+        # Agendamento de redraw: no máximo um redraw por quadro, limitado a max_fps
+        self.max_fps = max_fps
+        self._redraw_job = None
+        self._redraw_pending = False
+        self._last_redraw_time = 0.0
+
+        self.viewport = {"xmin": 20, "ymin": 20, "xmax": self.CANVAS_WIDTH - 20, "ymax": self.CANVAS_HEIGHT - 20}
+
+        vp_width = self.viewport["xmax"] - self.viewport["xmin"]
+        vp_height = self.viewport["ymax"] - self.viewport["ymin"]
+        half_width = vp_width / 2
+        half_height = vp_height / 2
+
+        self.window = {
+            "xmin": -half_width,
+            "ymin": -half_height,
+            "xmax": half_width,
+            "ymax": half_height,
+            "rotation": 0
+        }
+        self.original_window = self.window.copy()
+
+        self.display_file = []
+        self.spatial_index = SpatialGrid()  # Bounding boxes dos objetos 2D para o culling da window
+        self.registry = ObjectRegistry()  # Objetos do display file indexados por nome e tipo
+        self.camera = Camera()  # Matriz de projeção 3D em cache, sincronizada a cada quadro
+        self.profiler = None  # RedrawProfiler quando a instrumentação do redraw está ligada
+
+    def enable_profiling(self, overlay=False):
+        """Liga a instrumentação do redraw; com overlay, mostra FPS e número de itens no canvas."""
+        self.profiler = RedrawProfiler(overlay)
+        self.request_redraw()
+
+    def disable_profiling(self):
+        self.profiler = None
+        self.request_redraw()
+
+    def profiling_stats(self):
+        """Resumo do último quadro instrumentado (tempos e itens por etapa e por tipo, contadores) ou None."""
+        return self.profiler.last_frame if self.profiler is not None else None
+
+    def _stage(self, name):
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.stage(name, self.renderer)
+
+    def _count(self, name, n=1):
+        if self.profiler is not None:
+            self.profiler.count(name, n)
+
+    def _object_bounds(self, obj):
+        """
+        Bounding box 2D (xmin, ymin, xmax, ymax) usada pelo índice espacial.
+        Objetos 3D retornam None: sua posição na window depende da câmera, então são sempre candidatos.
+        """
+        if isinstance(obj, (Ponto3D, Objeto3D, BezierPatch, BezierSurface, BSplineSurface)):
+            return None
+        return obj.bounding_box
+
+    def _add_object(self, obj):
+        self.display_file.append(obj)
+        self.registry.add(obj)
+        self.spatial_index.insert(obj, self._object_bounds(obj))
+
+    def _remove_object(self, obj):
+        self.display_file.remove(obj)
+        self.registry.remove(obj)
+        self.spatial_index.remove(obj)
+        self.renderer.forget(obj)
+
+    def _object_changed(self, obj):
+        """Deve ser chamado sempre que as coordenadas de um objeto mudam."""
+        self.spatial_index.update(obj, self._object_bounds(obj))
+
+    def _set_display_file(self, display_file):
+        self.display_file = display_file
+        self.renderer.clear()
+        self._rebuild_indexes()
+
+    def _rebuild_indexes(self):
+        self.registry.rebuild(self.display_file)
+        self.spatial_index.rebuild((obj, self._object_bounds(obj)) for obj in self.display_file)
+
+    def _visible_objects(self):
+        """
+        Consulta o índice espacial com a bounding box (no mundo) da window, possivelmente rotacionada.
+        O índice é mantido pelos métodos acima; toda alteração do display file ou das coordenadas
+        de um objeto deve passar por eles.
+        """
+        corners = window_local_to_world([
+            (self.window["xmin"], self.window["ymin"]),
+            (self.window["xmax"], self.window["ymin"]),
+            (self.window["xmax"], self.window["ymax"]),
+            (self.window["xmin"], self.window["ymax"])
+        ], self.window)
+        xmin, ymin = corners.min(axis=0)
+        xmax, ymax = corners.max(axis=0)
+        return self.spatial_index.query(xmin, ymin, xmax, ymax)
+
+    def zoom_manual(self, factor):
+        cx = (self.window["xmin"] + self.window["xmax"]) / 2
+        cy = (self.window["ymin"] + self.window["ymax"]) / 2
+        
+        self.window["xmin"] = cx - (cx - self.window["xmin"]) * factor
+        self.window["xmax"] = cx + (self.window["xmax"] - cx) * factor
+        self.window["ymin"] = cy - (cy - self.window["ymin"]) * factor
+        self.window["ymax"] = cy + (self.window["ymax"] - cy) * factor
+        
+        self.request_redraw()
+
+    def request_redraw(self):
+        """
+        Marca a view como suja. Sem laço de eventos, o quadro fica pendente até o próximo redraw();
+        o GraphicsSystem sobrescreve este método para agendar o redraw no Tk.
+        """
+        self._redraw_pending = True
+
+    def _sync_camera(self):
+        """Lê 'd' e o tipo de projeção uma vez por quadro e atualiza a câmera se algo mudou."""
+        try:
+            d = float(self.d_entry.get())
+        except ValueError:
+            d = Camera.DEFAULT_D
+        self.camera.update(self.window, self.projection_type.get(), d)
+
+    def redraw(self):
+        self._redraw_pending = False
+        self._last_redraw_time = time.perf_counter()
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.begin_frame()
+
+        with self._stage("camera"):
+            self._sync_camera()
+        self.renderer.begin_frame()
+        self._draw_viewport()
+
+        # Só os objetos cuja bounding box intersecta a window seguem para o clipping
+        with self._stage("cull"):
+            visible_objects = self._visible_objects()
+        self._count("culled", len(self.display_file) - len(visible_objects))
+
+        # Os polígonos são clipados todos de uma vez, antes do laço de desenho; na instrumentação,
+        # cada polígono recebe uma parte igual do tempo do lote como seu tempo de clipping
+        polygons = [obj for obj in visible_objects if isinstance(obj, Polygon)]
+        batch_start = time.perf_counter()
+        clipped_polygons = iter(self.clip_polygons(polygons))
+        polygon_clip_time = (time.perf_counter() - batch_start) / len(polygons) if polygons else 0.0
+
+        for obj_original in visible_objects:
+            self.renderer.begin_object(obj_original)
+            if profiler is not None:
+                clip_start = time.perf_counter()
+
+            if isinstance(obj_original, Polygon):
+                drawable_primitives = next(clipped_polygons)
+                if profiler is not None:
+                    clip_start -= polygon_clip_time
+            else:
+                # clip_object faz a projeção 3D -> 2D e o clipping; retorna None quando nada do objeto
+                # fica visível. Objetos 3D e superfícies viram trechos 2D (Polylines) ou um Point 2D.
+                drawable_primitives = self.clip_object(obj_original)
+
+            if profiler is not None:
+                draw_start = time.perf_counter()
+                emitted = self.renderer.emitted
+
+            if drawable_primitives is not None:
+                # Point, Line/LineSegments, PolygonShape, Curve2D, BSpline ou Polylines, todos com as
+                # coordenadas no "espaço da window"; viewport_transform_points as leva para a viewport
+                drawable_primitives.draw(self.renderer, self.viewport_transform_points)
+
+            if profiler is not None:
+                profiler.record_object(obj_original.type, draw_start - clip_start,
+                                       time.perf_counter() - draw_start, self.renderer.emitted - emitted,
+                                       drawable_primitives is not None)
+
+        if profiler is not None and profiler.overlay:
+            self._draw_stats_overlay()
+        self.renderer.end_frame()
+        if profiler is not None:
+            profiler.end_frame(self.renderer.item_count)
+
+    def _draw_viewport(self):
+        self.renderer.begin_object("viewport")
+        self.renderer.create_rectangle(
+            self.viewport["xmin"], self.viewport["ymin"],
+            self.viewport["xmax"], self.viewport["ymax"],
+            outline="white", dash=(4, 2))
+
+    def _draw_stats_overlay(self):
+        self.renderer.begin_object("overlay")
+        self.renderer.create_text(
+            self.viewport["xmin"] + 6, self.viewport["ymin"] + 6,
+            text=self.profiler.overlay_text(self.renderer.item_count),
+            anchor="nw", fill="#00ff00", font=("Courier", 9))
+
+    def viewport_transform(self, x, y, z=None):
+        point = [[x, y]] if z is None else [[x, y, z]]
+        vx, vy = self.viewport_transform_points(point)[0]
+        return (vx, vy)
+
+    def viewport_transform_points(self, points):
+        """
+        Versão vetorizada de viewport_transform: recebe um array (N,2) ou (N,3) e
+        retorna as (N,2) coordenadas de viewport, calculando as constantes uma única vez.
+
+        Solicitamos a ajuda de IA para aprender a fazer transformações 3D
+
+        DOC IAgen:
+        DeepSeek https://chat.deepseek.com
+
+        Prompt usado:
+        "Como fazer a transformação de um ponto 3D para uma viewport 2D, considerando rotação e perspectiva?"
+        """
+        points = np.asarray(points, dtype=float)
+        if points.size == 0:
+            return np.empty((0, 2))
+        if points.ndim == 1:
+            points = points.reshape(1, -1)
+
+        if points.shape[1] == 2:  # Transformação 2D
+            return window_to_viewport(points, self.window, self.viewport)
+
+        # Transformação 3D: a matriz mundo -> view -> projeção vem da câmera do quadro atual
+        projected = self.project_points(points[:, :3])
+        return window_to_viewport(projected, self.window, self.viewport, rotate=False)
+
+    def _classify_object(self, obj):
+        """Aceitação/rejeição trivial de um objeto 2D pela sua bounding box em cache."""
+        bbox = obj.bounding_box
+        relation = BOUNDS_OUTSIDE if bbox is None else classify_bounds(bbox, self.window)
+        if relation == BOUNDS_INSIDE:
+            self._count("trivial_accept")
+        elif relation == BOUNDS_OUTSIDE:
+            self._count("trivial_reject")
+        return relation
+
+    def clip_object(self, obj):
+        if isinstance(obj, (Line, Curve2D, BSpline)):
+            relation = self._classify_object(obj)
+            if relation == BOUNDS_OUTSIDE:
+                return None
+            if relation == BOUNDS_INSIDE and isinstance(obj, Line):
+                # Inteiramente dentro da window: dispensa o clipping por vértice
+                # (curvas fazem o mesmo teste no cache do próprio clip)
+                return obj
+
+        if isinstance(obj, Point): # Objeto 2D Ponto
+            return obj if self.clip_point(obj) else None
+        elif isinstance(obj, Line): # Objeto 2D Linha
+            return self.clip_line(obj)
+        elif isinstance(obj, Polygon): # Objeto 2D Polígono
+            return self.clip_polygon(obj)
+        elif isinstance(obj, Curve2D):
+            if self.curve_clip_method.get() == "analytic":
+                obj.clip_analytic(self.window)
+            else:
+                obj.clip({
+                    "xmin": self.window["xmin"], "ymin": self.window["ymin"],
+                    "xmax": self.window["xmax"], "ymax": self.window["ymax"]
+                })
+            return obj if obj.clipped_segments else None
+        elif isinstance(obj, BSpline):
+            self.clip_bspline(obj)
+            return obj if obj.visible_runs else None
+
+        elif isinstance(obj, Ponto3D):
+            projected_coords = self.get_projected_2d_coords(*obj.coordinates[0])
+            if projected_coords:
+                # Cria um objeto Ponto 2D temporário para clipping
+                # As coordenadas de 'projected_coords' já estão no "espaço da window"
+                temp_point_2d = Point([projected_coords], color=obj.color)
+                if self.clip_point(temp_point_2d): # clip_point usa self.window
+                    # Retorna um novo objeto Point 2D com as coordenadas projetadas
+                    # O nome do objeto original é perdido aqui, mas é para desenho.
+                    return Point([projected_coords], color=obj.color) 
+            return None
+
+        elif isinstance(obj, Objeto3D):
+            if not len(obj.edges):
+                return None
+            # Projeta cada vértice único uma vez; as cadeias de arestas são reunidas por índice
+            projected = self.project_points(obj.vertex_array)
+            chain_indices, chain_offsets = obj.chains
+            runs = self.clip_polylines(projected[chain_indices], chain_offsets)
+            return Polylines(runs, color=obj.color) if runs else None
+        
+        elif isinstance(obj, (BezierPatch, BezierSurface, BSplineSurface)):
+            return self.clip_surface(obj)
+        
+        return None
+
+    def _surface_blocks(self, obj):
+        """Malhas 3D de uma superfície em blocos empilhados (k, res_u, res_v, 3)."""
+        if isinstance(obj, BezierPatch):
+            return [obj.surface_points[None]]
+        if isinstance(obj, BezierSurface):
+            # Retalhos de mesma resolução são empilhados em um único bloco
+            by_shape = {}
+            for grid in obj.surface_grids():
+                by_shape.setdefault(grid.shape, []).append(grid)
+            return [np.stack(grids) for grids in by_shape.values()]
+        # BSplineSurface: só as malhas dos patches visíveis, geradas em blocos
+        pixel_size = (self.window["xmax"] - self.window["xmin"]) / (self.viewport["xmax"] - self.viewport["xmin"])
+        return obj.visible_patch_grids(self.project_points, self.window, pixel_size)
+
+    def clip_surface(self, obj):
+        """
+        Clipa a malha de BezierPatch, BezierSurface ou BSplineSurface. Cada bloco de malhas é
+        projetado em uma única chamada; as linhas da malha nas direções U e V saem por fatiamento da
+        malha projetada e são clipadas em lote como polilinhas. Retorna um Polylines com os trechos visíveis.
+        """
+        runs = []
+        for block in self._surface_blocks(obj):
+            k, res_u, res_v, _ = block.shape
+            # Projeta todos os pontos 3D do bloco para 2D de uma vez (NaN onde não há projeção)
+            projected = self.project_points(block.reshape(-1, 3)).reshape(k, res_u, res_v, 2)
+            # Linhas na direção U (linhas da malha, res_v pontos) e na direção V (colunas, res_u pontos)
+            u_lines = projected.reshape(-1, 2)
+            v_lines = projected.transpose(0, 2, 1, 3).reshape(-1, 2)
+            offsets = np.concatenate([np.arange(0, k * res_u + 1) * res_v,
+                                      k * res_u * res_v + np.arange(1, k * res_v + 1) * res_u])
+            runs.extend(self.clip_polylines(np.concatenate([u_lines, v_lines]), offsets))
+        return Polylines(runs, color=obj.color) if runs else None
+
+    def clip_polylines(self, points, offsets):
+        """
+        Clipa polilinhas em formato CSR contra a window com a técnica selecionada e retorna a lista de
+        trechos visíveis. Liang-Barsky usa os parâmetros u1/u2 direto sobre as arestas; Cohen-Sutherland
+        clipa as arestas como segmentos em lote e as reúne em trechos.
+        """
+        clipper, stats = self._polyline_clipper()
+        runs = clip_polylines(points, offsets, self.window, clipper, stats)
+        self._count("polyline_runs", len(runs))
+        return runs
+
+    def _polyline_clipper(self):
+        """(clipador de segmentos, contadores) de clip_polylines para a técnica selecionada; None é Liang-Barsky."""
+        method = self.line_clip_method.get()
+        clipper = None if method == "LB" else self.SEGMENT_CLIPPERS[method]
+        stats = self.profiler.counters if self.profiler is not None else None
+        return clipper, stats
+
+    def clip_bspline(self, bspline):
+        bspline.clip(self.window, *self._polyline_clipper())
+        return bspline
+
+    def clip_curve(self, curve):
+        curve.clip({
+            "xmin": self.window["xmin"],
+            "ymin": self.window["ymin"],
+            "xmax": self.window["xmax"],
+            "ymax": self.window["ymax"]
+        })
+        return curve
+
+    def clip_point(self, point):
+        x, y = point.coordinates[0]
+        return (self.window["xmin"] <= x <= self.window["xmax"] and
+                self.window["ymin"] <= y <= self.window["ymax"])
+
+    def clip_point_3d(self, point):
+        x, y, z = point.coordinates[0]
+        return (self.window["xmin"] <= x <= self.window["xmax"] and
+                self.window["ymin"] <= y <= self.window["ymax"])
+
+    def clip_segments(self, segments):
+        """
+        Clipa um array (N,2,2) de segmentos com a técnica selecionada.
+        Segmentos com extremos não projetáveis (NaN) são marcados como invisíveis.
+        Retorna (segmentos clipados, máscara de visibilidade).
+        """
+        segments = np.asarray(segments, dtype=float).reshape(-1, 2, 2)
+        clipped = segments.copy()
+        visible = np.zeros(len(segments), dtype=bool)
+        valid = ~np.isnan(segments).any(axis=(1, 2))
+
+        clipper = self.SEGMENT_CLIPPERS[self.line_clip_method.get()]
+        stats = self.profiler.counters if self.profiler is not None else None
+        clipped[valid], visible[valid] = clipper(segments[valid], self.window, stats)
+        if stats is not None:
+            accepted = int(visible.sum())
+            stats["segment_accept"] += accepted
+            stats["segment_reject"] += len(segments) - accepted
+        return clipped, visible
+
+    def clip_line(self, line):
+        """
+        Clipa uma linha com o clipador em lote selecionado, como um lote de um único segmento.
+        Retorna um LineSegments (sem criar um novo Line nem avançar o contador de nomes) ou None.
+        """
+        clipped, visible = self.clip_segments(line.coordinates)
+        return LineSegments(clipped, color=line.color) if visible[0] else None
+
+    # Clipagem de polígonos usando o algoritmo Sutherland-Hodgeman
+    def clip_polygon(self, polygon):
+        return self.clip_polygons([polygon])[0]
+
+    def clip_polygons(self, polygons):
+        """
+        Clipa vários polígonos de uma só vez com o Sutherland-Hodgman em lote.
+        Retorna, para cada polígono, uma PolygonShape clipada ou None se ficou fora da window.
+        """
+        results = [None] * len(polygons)
+        # Aceitação/rejeição trivial pela bbox; só os polígonos que cruzam a borda vão para o lote
+        partial = []
+        for i, polygon in enumerate(polygons):
+            relation = self._classify_object(polygon)
+            if relation == BOUNDS_INSIDE:
+                results[i] = PolygonShape(polygon.coordinates, polygon.color, polygon.filled)
+            elif relation == BOUNDS_PARTIAL:
+                partial.append(i)
+        if not partial:
+            return results
+
+        counts = [len(polygons[i].coordinates) for i in partial]
+        vertices = np.concatenate([np.asarray(polygons[i].coordinates, dtype=float).reshape(-1, 2) for i in partial])
+        offsets = np.concatenate([[0], np.cumsum(counts)])
+
+        clipped, clipped_offsets = clip_polygons_sutherland_hodgman(vertices, offsets, self.window)
+
+        for i, start, end in zip(partial, clipped_offsets[:-1], clipped_offsets[1:]):
+            if start != end:
+                polygon = polygons[i]
+                results[i] = PolygonShape(clipped[start:end], polygon.color, polygon.filled)
+        return results
+
+    def get_projected_2d_coords(self, x_world, y_world, z_world):
+        """
+        Transforma um ponto 3D do mundo para coordenadas 2D no plano de projeção,
+        compatíveis com self.window para clipping 2D.
+        Retorna (x_proj, y_proj) ou None se a projeção não for possível.
+
+        DOC IAgen:
+        Foi usado IA entender como representrar um objeto com cordenadas 3D em 2D no plano de projecao em Python
+        DeepSeek https://chat.deepseek.com
+
+        Prompt usado:
+        Como representrar um objeto com cordenadas 3D em 2D no plano de projecao em Python, demos o contexto do codigo atual antes da implementacao
+        """
+        x_proj, y_proj = self.project_points([[x_world, y_world, z_world]])[0]
+        if np.isnan(x_proj):  # Ponto no COP ou atrás dele
+            return None
+        return x_proj, y_proj
+
+    def project_points(self, points):
+        """
+        Projeta um array (N,3) de pontos do mundo com a matriz em cache da câmera.
+        Retorna um array (N,2) compatível com self.window; pontos não projetáveis viram NaN.
+        """
+        return self.camera.project(points)
@@ -0,0 +1,116 @@
+import math
+from collections import defaultdict
+
+
+class SpatialGrid:
+    """
+    Índice espacial em grade uniforme sobre as bounding boxes 2D dos objetos do display file.
+    Cada objeto é registrado nas células que sua bounding box cobre, e query() devolve só os
+    candidatos que intersectam a região pedida, na ordem em que foram inseridos.
+    Objetos sem bounding box fixa no mundo (ex.: 3D, cuja posição projetada depende da câmera)
+    e objetos grandes demais para a grade são sempre devolvidos como candidatos.
+    """
+    MAX_CELLS_PER_OBJECT = 1024
+
+    def __init__(self, cell_size=128.0):
+        self.cell_size = cell_size
+        self._cells = defaultdict(set)  # (i, j) -> objetos
+        self._entries = {}  # objeto -> (bbox, faixa de células ou None, ordem de inserção)
+        self._always = set()  # objetos devolvidos em toda consulta
+        self._next_order = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, obj):
+        return obj in self._entries
+
+    def _cell_range(self, xmin, ymin, xmax, ymax):
+        size = self.cell_size
+        return (math.floor(xmin / size), math.floor(ymin / size),
+                math.floor(xmax / size), math.floor(ymax / size))
+
+    def insert(self, obj, bbox, order=None):
+        """Registra 'obj' com a bbox (xmin, ymin, xmax, ymax); bbox None o torna sempre candidato."""
+        if order is None:
+            order = self._next_order
+            self._next_order += 1
+
+        cells = None
+        if bbox is not None:
+            i0, j0, i1, j1 = self._cell_range(*bbox)
+            if (i1 - i0 + 1) * (j1 - j0 + 1) <= self.MAX_CELLS_PER_OBJECT:
+                cells = (i0, j0, i1, j1)
+                for i in range(i0, i1 + 1):
+                    for j in range(j0, j1 + 1):
+                        self._cells[(i, j)].add(obj)
+
+        if cells is None:
+            self._always.add(obj)
+        self._entries[obj] = (bbox, cells, order)
+
+    def remove(self, obj):
+        entry = self._entries.pop(obj, None)
+        if entry is None:
+            return
+        _, cells, _ = entry
+        if cells is None:
+            self._always.discard(obj)
+            return
+        i0, j0, i1, j1 = cells
+        for i in range(i0, i1 + 1):
+            for j in range(j0, j1 + 1):
+                bucket = self._cells[(i, j)]
+                bucket.discard(obj)
+                if not bucket:
+                    del self._cells[(i, j)]
+
+    def update(self, obj, bbox):
+        """Reindexa um objeto cujas coordenadas mudaram, mantendo sua ordem original."""
+        entry = self._entries.get(obj)
+        order = entry[2] if entry is not None else None
+        self.remove(obj)
+        self.insert(obj, bbox, order)
+
+    def clear(self):
+        self._cells.clear()
+        self._entries.clear()
+        self._always.clear()
+        self._next_order = 0
+
+    def rebuild(self, items):
+        """Reconstrói o índice a partir de pares (objeto, bbox), na ordem dada."""
+        self.clear()
+        for obj, bbox in items:
+            self.insert(obj, bbox)
+
+    def query(self, xmin, ymin, xmax, ymax):
+        """Retorna os objetos cuja bbox intersecta a região, na ordem de inserção."""
+        i0, j0, i1, j1 = self._cell_range(xmin, ymin, xmax, ymax)
+        n_cells = (i1 - i0 + 1) * (j1 - j0 + 1)
+
+        if n_cells > len(self._cells):
+            # Região grande (zoom out): é mais barato percorrer as células ocupadas
+            candidates = set()
+            for (i, j), bucket in self._cells.items():
+                if i0 <= i <= i1 and j0 <= j <= j1:
+                    candidates |= bucket
+        else:
+            candidates = set()
+            for i in range(i0, i1 + 1):
+                for j in range(j0, j1 + 1):
+                    bucket = self._cells.get((i, j))
+                    if bucket:
+                        candidates |= bucket
+
+        result = [obj for obj in candidates if self._intersects(self._entries[obj][0], xmin, ymin, xmax, ymax)]
+        result.extend(obj for obj in self._always if self._intersects(self._entries[obj][0], xmin, ymin, xmax, ymax))
+        result.sort(key=lambda obj: self._entries[obj][2])
+        return result
+
+    @staticmethod
+    def _intersects(bbox, xmin, ymin, xmax, ymax):
+        if bbox is None:
+            return True
+        bxmin, bymin, bxmax, bymax = bbox
+        return not (bxmax < xmin or bxmin > xmax or bymax < ymin or bymin > ymax)
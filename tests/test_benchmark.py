@@ -0,0 +1,18 @@
+import benchmark
+
+
+def test_warm_cases_run_once_before_timing():
+    calls = []
+    result = benchmark._time(lambda: calls.append(1), 1, warmup=True)
+    assert len(calls) == 2 and result["min"] >= 0
+
+
+def test_failing_case_makes_main_fail(monkeypatch, capsys):
+    def broken():
+        raise RuntimeError("quebrado")
+
+    monkeypatch.setattr(benchmark, "_redraw_cases", lambda scene, display_file: {"redraw.warm.x": (broken, 1)})
+    assert benchmark.main(["--scales", "2", "--repeat", "1", "--only", "redraw."]) == 1
+    assert "redraw.warm.x" in capsys.readouterr().err
+    monkeypatch.undo()
+    assert benchmark.main(["--scales", "2", "--repeat", "1", "--only", "clip.CS"]) == 0
@@ -0,0 +1,148 @@
+import math
+import numpy as np
+import pytest
+
+from clipping import (
+    clip_segments_cohen_sutherland, clip_segments_liang_barsky, clip_polygons_sutherland_hodgman,
+    clip_polyline, clip_polylines, classify_bounds, BOUNDS_INSIDE, BOUNDS_OUTSIDE, BOUNDS_PARTIAL,
+    bezier_visible_intervals, world_to_window_local
+)
+
+WINDOW = {"xmin": -10, "ymin": -10, "xmax": 10, "ymax": 10, "rotation": 0}
+SEGMENT_CLIPPERS = [clip_segments_cohen_sutherland, clip_segments_liang_barsky]
+
+
+@pytest.mark.parametrize("clipper", SEGMENT_CLIPPERS)
+def test_segments_inside_are_unchanged(clipper):
+    segments = np.array([[(-5, -5), (5, 5)], [(0, 0), (10, 0)]], dtype=float)
+    clipped, visible = clipper(segments, WINDOW)
+    assert visible.all()
+    np.testing.assert_allclose(clipped, segments)
+
+
+@pytest.mark.parametrize("clipper", SEGMENT_CLIPPERS)
+def test_segments_outside_are_rejected(clipper):
+    segments = np.array([[(-20, 15), (20, 15)], [(11, -20), (11, 20)], [(-30, -30), (-20, -11)]], dtype=float)
+    _, visible = clipper(segments, WINDOW)
+    assert not visible.any()
+
+
+@pytest.mark.parametrize("clipper", SEGMENT_CLIPPERS)
+def test_segments_crossing_are_cut_at_the_borders(clipper):
+    segments = np.array([[(-20, 0), (20, 0)], [(0, -20), (0, 5)], [(-20, -20), (20, 20)]], dtype=float)
+    clipped, visible = clipper(segments, WINDOW)
+    assert visible.all()
+    np.testing.assert_allclose(clipped[0], [(-10, 0), (10, 0)])
+    np.testing.assert_allclose(clipped[1], [(0, -10), (0, 5)])
+    np.testing.assert_allclose(clipped[2], [(-10, -10), (10, 10)])
+
+
+def test_cohen_sutherland_and_liang_barsky_agree():
+    rng = np.random.default_rng(0)
+    segments = rng.uniform(-30, 30, size=(500, 2, 2))
+    window = dict(WINDOW, rotation=math.radians(30))
+    cs, cs_visible = clip_segments_cohen_sutherland(segments, window)
+    lb, lb_visible = clip_segments_liang_barsky(segments, window)
+    np.testing.assert_array_equal(cs_visible, lb_visible)
+    np.testing.assert_allclose(cs[cs_visible], lb[lb_visible], atol=1e-9)
+
+
+def test_cohen_sutherland_counts_iterations():
+    stats = {}
+    clip_segments_cohen_sutherland([[(-20, 0), (20, 0)]], WINDOW, stats)
+    assert stats["cs_iterations"] == 3
+
+
+def test_rotated_window_clips_in_window_coordinates():
+    window = dict(WINDOW, rotation=math.radians(45))
+    clipped, visible = clip_segments_liang_barsky([[(-20, 0), (20, 0)]], window)
+    assert visible.all()
+    np.testing.assert_allclose(np.abs(clipped[0, :, 0]), 10 * math.sqrt(2))
+
+
+def test_sutherland_hodgman_clips_each_polygon():
+    vertices = [(-5, -5), (5, -5), (5, 5), (-5, 5),
+                (0, 0), (20, 0), (20, 5), (0, 5),
+                (30, 30), (40, 30), (40, 40)]
+    clipped, offsets = clip_polygons_sutherland_hodgman(vertices, [0, 4, 8, 11], WINDOW)
+    np.testing.assert_array_equal(np.diff(offsets), [4, 4, 0])
+    np.testing.assert_allclose(clipped[:4], vertices[:4])
+    np.testing.assert_allclose(clipped[4:8, 0].max(), 10)
+
+
+def test_polyline_splits_into_visible_runs():
+    points = [(-5, 0), (5, 0), (15, 0), (15, 5), (5, 5), (0, 5)]
+    runs = clip_polyline(points, WINDOW)
+    assert len(runs) == 2
+    np.testing.assert_allclose(runs[0], [(-5, 0), (5, 0), (10, 0)])
+    np.testing.assert_allclose(runs[1], [(10, 5), (5, 5), (0, 5)])
+
+
+def test_polylines_do_not_join_across_polylines():
+    points = [(-5, 0), (5, 0), (5, 5), (-5, 5)]
+    runs = clip_polylines(points, [0, 2, 4], WINDOW)
+    assert len(runs) == 2
+    np.testing.assert_allclose(runs[0], points[:2])
+    np.testing.assert_allclose(runs[1], points[2:])
+
+
+def test_polylines_skip_unprojectable_vertices():
+    points = [(-5, 0), (0, 0), (np.nan, np.nan), (0, 5), (5, 5)]
+    runs = clip_polylines(points, [0, 5], WINDOW)
+    assert len(runs) == 2
+    np.testing.assert_allclose(runs[0], points[:2])
+    np.testing.assert_allclose(runs[1], points[3:])
+
+
+def test_classify_bounds():
+    assert classify_bounds((-5, -5, 5, 5), WINDOW) == BOUNDS_INSIDE
+    assert classify_bounds((20, 20, 30, 30), WINDOW) == BOUNDS_OUTSIDE
+    assert classify_bounds((5, 5, 15, 15), WINDOW) == BOUNDS_PARTIAL
+
+
+def test_polylines_with_empty_polylines_at_the_ends():
+    points = [(-5, 0), (0, 0), (5, 0)]
+    for offsets in ([0, 0, 3], [0, 3, 3], [0, 0, 3, 3]):
+        runs = clip_polylines(points, offsets, WINDOW)
+        assert len(runs) == 1
+        np.testing.assert_allclose(runs[0], points)
+
+
+@pytest.mark.parametrize("rotation", [0, math.radians(30)])
+def test_polylines_with_segment_clipper_match_liang_barsky(rotation):
+    rng = np.random.default_rng(1)
+    points = rng.uniform(-25, 25, size=(300, 2))
+    offsets = [0, 0, 40, 41, 150, 300]
+    window = dict(WINDOW, rotation=rotation)
+    stats = {}
+    expected = clip_polylines(points, offsets, window)
+    runs = clip_polylines(points, offsets, window, clip_segments_cohen_sutherland, stats)
+    assert stats["cs_iterations"] > 0
+    assert len(runs) == len(expected)
+    for run, other in zip(runs, expected):
+        np.testing.assert_allclose(run, other, atol=1e-9)
+
+
+@pytest.mark.parametrize("rotation", [0, 30])
+def test_bezier_visible_intervals_match_sampled_visibility(rotation):
+    window = dict(WINDOW, rotation=rotation)
+    control = np.array([(-5, -5), (60, 0), (-60, 0), (5, 5)], dtype=float)
+    intervals = bezier_visible_intervals(control, window)
+    assert len(intervals) > 1
+
+    t = np.linspace(0, 1, 2001)[:, None]
+    s = 1 - t
+    points = np.hstack([s**3, 3 * s**2 * t, 3 * s * t**2, t**3]) @ control
+    local = world_to_window_local(points, window)
+    inside = (np.abs(local) <= 10).all(axis=1)
+    in_interval = np.zeros(len(t), dtype=bool)
+    for t0, t1 in intervals:
+        in_interval |= (t[:, 0] >= t0) & (t[:, 0] <= t1)
+        # Os extremos internos dos intervalos são interseções com a borda da window
+        for param in (t0, t1):
+            if 0 < param < 1:
+                u = 1 - param
+                point = np.array([u**3, 3 * u**2 * param, 3 * u * param**2, param**3]) @ control
+                edge = np.abs(world_to_window_local(point[None], window)).max()
+                assert abs(edge - 10) < 1e-9
+    np.testing.assert_array_equal(inside, in_interval)
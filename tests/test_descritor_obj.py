@@ -0,0 +1,42 @@
+import numpy as np
+
+from descritor_obj import DescritorOBJ
+from objects import BSpline, BSplineSurface, Line, Objeto3D
+
+
+def _bsplines(display_file):
+    return [obj for obj in display_file if isinstance(obj, BSpline)]
+
+
+def test_bspline_degree_and_knots_round_trip(tmp_path):
+    cube = Objeto3D([((0, 0, 0), (1, 0, 0)), ((1, 0, 0), (1, 1, 0))])
+    surface = BSplineSurface(np.arange(48, dtype=float).reshape(4, 4, 3).tolist())
+    quadratic = BSpline([(0, 0), (10, 20), (20, 0), (30, 20)], degree=2)
+    clamped = BSpline([(0, 0), (10, 20), (20, 0), (30, 20), (40, 0)], degree=3,
+                      knots=[0, 0, 0, 0, 0.5, 1, 1, 1, 1])
+    cubic = BSpline([(5, 5), (15, 25), (25, 5), (35, 25)])
+    path = tmp_path / "cena.obj"
+    DescritorOBJ.write_obj([cube, surface, quadratic, Line([(0, 0), (1, 1)]), clamped, cubic], path)
+
+    loaded = _bsplines(DescritorOBJ.read_obj(path))
+    assert [b.degree for b in loaded] == [2, 3, 3]
+    assert loaded[0].knots is None and loaded[2].knots is None
+    np.testing.assert_allclose(loaded[1].knots, clamped.knots)
+    np.testing.assert_allclose(loaded[1].curve_points, clamped.curve_points)
+
+
+def test_directives_apply_only_to_the_preceding_b(tmp_path):
+    path = tmp_path / "cena.obj"
+    path.write_text("v 0 0\nv 10 10\nv 20 0\nv 30 10\n"
+                    "b 1 2 3\ndeg 2\n"
+                    "l 1 2\ndeg 1\n"
+                    "b 1 2 3 4\n")
+    loaded = _bsplines(DescritorOBJ.read_obj(path))
+    assert [b.degree for b in loaded] == [2, 3]
+
+
+def test_b_with_too_few_points_for_its_degree_is_rejected(tmp_path):
+    path = tmp_path / "cena.obj"
+    path.write_text("v 0 0\nv 10 10\nv 20 0\nb 1 2\nb 1 2 3\nb 1 2 3\ndeg 2\n")
+    loaded = _bsplines(DescritorOBJ.read_obj(path))
+    assert [b.degree for b in loaded] == [2]
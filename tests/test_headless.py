@@ -0,0 +1,74 @@
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from descritor_obj import DescritorOBJ
+from headless import HeadlessRenderer
+from objects import BSpline, Line, Polygon
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_headless_does_not_import_tkinter():
+    # Com 'tkinter' bloqueado em sys.modules, qualquer import do Tk levanta ImportError
+    code = ("import sys; sys.modules['tkinter'] = None; "
+            "import headless, benchmark; "
+            "from descritor_obj import DescritorOBJ; "
+            "headless.HeadlessRenderer(DescritorOBJ.read_obj('testes/1.8teste/paparelepipedo.obj')).render()")
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
+
+
+def test_render_draws_the_scene():
+    renderer = HeadlessRenderer(DescritorOBJ.read_obj(ROOT / "testes/1.8teste/paparelepipedo.obj"))
+    image = renderer.render()
+    assert image.shape == (renderer.CANVAS_HEIGHT, renderer.CANVAS_WIDTH, 3)
+    assert (image != image[0, 0]).any(axis=2).sum() > 0
+
+
+def test_later_objects_are_drawn_on_top():
+    renderer = HeadlessRenderer([Line([(-50, 0), (50, 0)], color="#ff0000")], width=200, height=120)
+    renderer.render()
+    renderer._add_object(Line([(0, -50), (0, 50)], color="#0000ff"))
+    # Redesenhar com a primeira linha reaproveitada não pode colocá-la sobre a nova
+    image = renderer.render()
+    center = image[60, 100]
+    np.testing.assert_array_equal(center, (0, 0, 255))
+
+
+def test_polygons_are_charged_the_batch_clip_time():
+    polygons = [Polygon([(-400 + i, -10), (400 + i, -10), (i, 300)]) for i in range(20)]
+    renderer = HeadlessRenderer(polygons, width=200, height=120)
+    batch = renderer.clip_polygons
+
+    def slow_batch(objects):
+        time.sleep(0.05)
+        return batch(objects)
+
+    renderer.clip_polygons = slow_batch
+    renderer.enable_profiling()
+    renderer.render()
+    frame = renderer.profiler.last_frame
+    polygon = frame["types"]["Polígono"]
+    assert polygon["count"] == 20
+    assert polygon["clip_time"] >= 0.05
+    assert frame["stages"]["clip"]["time"] >= polygon["clip_time"]
+
+
+def test_bspline_follows_the_line_clip_method():
+    curve = BSpline([(-300, -20), (-100, 80), (0, -80), (100, 80), (300, 20)])
+    window = {"xmin": -50, "ymin": -50, "xmax": 50, "ymax": 50, "rotation": 0}
+    renderer = HeadlessRenderer([curve], width=200, height=200, window=window, clip_method="LB")
+    renderer.enable_profiling()
+    renderer.render()
+    lb_runs = [run.copy() for run in curve.visible_runs]
+    assert "cs_iterations" not in renderer.profiler.last_frame["counters"]
+
+    renderer.line_clip_method.set("CS")
+    renderer.render()
+    assert renderer.profiler.last_frame["counters"]["cs_iterations"] > 0
+    assert len(curve.visible_runs) == len(lb_runs) > 0
+    for cs_run, lb_run in zip(curve.visible_runs, lb_runs):
+        np.testing.assert_allclose(cs_run, lb_run, atol=1e-9)
@@ -0,0 +1,163 @@
+import numpy as np
+import pytest
+
+from objects import BSpline, BSplineSurface, Curve2D, Objeto3D, BSPLINE_MATRIX, bspline_basis_matrix, bspline_basis
+
+WINDOW = {"xmin": -10, "ymin": -10, "xmax": 10, "ymax": 10, "rotation": 0}
+
+
+def _bezier(control, t):
+    t = np.asarray(t, dtype=float)[:, None]
+    s = 1 - t
+    return np.hstack([s**3, 3 * s**2 * t, 3 * s * t**2, t**3]) @ np.asarray(control, dtype=float)
+
+
+def test_invalid_coordinates_leave_the_surface_unchanged():
+    control = np.arange(4 * 5 * 3, dtype=float).reshape(4, 5, 3)
+    surface = BSplineSurface(control.tolist())
+    coordinates, version = surface.coordinates, surface._geometry_version
+    with pytest.raises(ValueError):
+        surface.coordinates = [(x, y) for x, y, _ in coordinates]
+    assert surface.coordinates is coordinates
+    assert surface._geometry_version == version
+    np.testing.assert_array_equal(surface.control_matrix, control)
+
+
+def test_coordinates_update_the_derived_curve():
+    curve = BSpline([(0, 0), (1, 2), (2, 0), (3, 2)])
+    with pytest.raises(ValueError):
+        curve.coordinates = [(0, 0), (1, 1)]
+    assert len(curve.coordinates) == 4
+    curve.coordinates = [(x + 10, y) for x, y in curve.coordinates]
+    assert curve.curve_points[:, 0].min() >= 10
+
+
+def test_sub_segment_matches_de_casteljau_split():
+    curve = Curve2D([(0, 0), (1, 3), (4, -2), (5, 1)])
+    segment = curve.coordinates
+    left, right = curve._de_casteljau_split(segment)
+    np.testing.assert_allclose(Curve2D._sub_segment(segment, 0.0, 0.5), left, rtol=0, atol=1e-13)
+    np.testing.assert_allclose(Curve2D._sub_segment(segment, 0.5, 1.0), right, rtol=0, atol=1e-13)
+
+
+def test_sub_segment_reparametrizes_the_curve():
+    control = [(0, 0), (1, 3), (4, -2), (5, 1)]
+    t0, t1 = 0.2, 0.7
+    s = np.linspace(0, 1, 11)
+    sub = Curve2D._sub_segment(control, t0, t1)
+    np.testing.assert_allclose(_bezier(sub, s), _bezier(control, t0 + s * (t1 - t0)), rtol=0, atol=1e-13)
+
+
+def test_clip_analytic_keeps_the_visible_arcs():
+    control = [(-15, -5), (-5, 30), (5, -30), (5, 5), (6, 0), (0, 5), (0, 0)]
+    curve = Curve2D(control)
+    curve.clip_analytic(WINDOW)
+    assert len(curve.clipped_segments) == len(curve.visible_intervals) > 1
+    segments = curve.get_bezier_segments()
+    s = np.linspace(0, 1, 11)
+    for (index, t0, t1), sub in zip(curve.visible_intervals, curve.clipped_segments):
+        original = _bezier(segments[index], t0 + s * (t1 - t0))
+        np.testing.assert_allclose(_bezier(sub, s), original, rtol=0, atol=1e-12)
+        assert (np.abs(original) <= 10 + 1e-9).all()
+    # Segmento inteiramente dentro da window fica inteiro
+    assert curve.visible_intervals[-1] == (1, 0.0, 1.0)
+    assert curve.clipped_segments[-1] == [tuple(map(float, p)) for p in control[3:]]
+
+
+def _forward_difference_bspline(control, steps=100):
+    """Laço escalar de diferenças adiante que gerava os segmentos da B-Spline cúbica uniforme."""
+    points = []
+    for i in range(len(control) - 3):
+        a, b, c, d = BSPLINE_MATRIX @ np.asarray(control[i:i + 4], dtype=float)
+        delta = 1.0 / steps
+        f, d1 = d.copy(), c * delta + b * delta**2 + a * delta**3
+        d2, d3 = 2 * b * delta**2 + 6 * a * delta**3, 6 * a * delta**3
+        for _ in range(steps):
+            points.append(f.copy())
+            f += d1
+            d1 += d2
+            d2 += d3
+    return np.array(points)
+
+
+def test_bspline_basis_matrix_matches_forward_differences():
+    control = np.random.default_rng(1).uniform(-1, 1, (9, 2))
+    windows = np.lib.stride_tricks.sliding_window_view(control, 4, axis=0).transpose(0, 2, 1)
+    points = (bspline_basis_matrix(100) @ windows).reshape(-1, 2)
+    np.testing.assert_allclose(points, _forward_difference_bspline(control), rtol=0, atol=1e-13)
+
+
+def test_uniform_bspline_curve_matches_forward_differences():
+    control = np.random.default_rng(2).uniform(-1, 1, (7, 2))
+    curve = BSpline(control.tolist())
+    np.testing.assert_allclose(curve.curve_points[:-1], _forward_difference_bspline(control), rtol=0, atol=1e-13)
+
+
+def _cox_de_boor(knots, i, degree, t):
+    """Definição recursiva de N_{i,degree}(t), com intervalos [knots[i], knots[i+1])."""
+    if degree == 0:
+        return 1.0 if knots[i] <= t < knots[i + 1] else 0.0
+    value = 0.0
+    if knots[i + degree] > knots[i]:
+        value += (t - knots[i]) / (knots[i + degree] - knots[i]) * _cox_de_boor(knots, i, degree - 1, t)
+    if knots[i + degree + 1] > knots[i + 1]:
+        value += ((knots[i + degree + 1] - t) / (knots[i + degree + 1] - knots[i + 1]) *
+                  _cox_de_boor(knots, i + 1, degree - 1, t))
+    return value
+
+
+@pytest.mark.parametrize("degree", [1, 2, 3, 4])
+def test_bspline_basis_matches_cox_de_boor_recursion(degree):
+    knots = np.array([0, 0, 0.5, 1, 1, 2.5, 3, 4.25, 5, 5, 6, 7], dtype=float)
+    spans = np.array([s for s in range(degree, len(knots) - degree - 1) if knots[s + 1] > knots[s]])
+    params = np.concatenate([np.linspace(knots[s], knots[s + 1], 7, endpoint=False) for s in spans])
+    sample_spans = np.repeat(spans, 7)
+    basis = bspline_basis(knots, degree, sample_spans, params)
+    expected = [[_cox_de_boor(knots, span - degree + r, degree, t) for r in range(degree + 1)]
+                for span, t in zip(sample_spans, params)]
+    np.testing.assert_allclose(basis, expected, rtol=0, atol=1e-13)
+    np.testing.assert_allclose(basis.sum(axis=1), 1, rtol=0, atol=1e-13)
+
+
+def test_uniform_knots_match_the_cubic_matrix_path():
+    control = np.random.default_rng(3).uniform(-1, 1, (8, 2)).tolist()
+    uniform = BSpline(control)
+    general = BSpline(control, knots=np.arange(len(control) + 4))
+    assert len(uniform.curve_points) == len(general.curve_points) == 5 * 100 + 1
+    np.testing.assert_allclose(uniform.curve_points, general.curve_points, rtol=0, atol=1e-13)
+
+
+def test_curve_ends_at_the_end_of_the_domain():
+    control = np.array([(0, 0), (1, 1), (2, 0), (3, 1)], dtype=float)
+    cubic, quadratic = BSpline(control.tolist()), BSpline(control.tolist(), degree=2)
+    np.testing.assert_allclose(cubic.curve_points[-1], (control[1] + 4 * control[2] + control[3]) / 6,
+                               rtol=0, atol=1e-13)
+    np.testing.assert_allclose(quadratic.curve_points[-1], (control[2] + control[3]) / 2, rtol=0, atol=1e-13)
+
+
+def test_segments_share_vertices_by_index():
+    segments = [((0, 0, 0), (1, 0, 0)), ((1, 0, 0), (1, 1, 0)), ((1, 1, 0), (0, 0, 0)), ((0, 0, 1), (1, 0, 0))]
+    obj = Objeto3D(segments)
+    assert obj.coordinates == [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 0, 1)]
+    np.testing.assert_array_equal(obj.edges, [[0, 1], [1, 2], [2, 0], [3, 1]])
+    assert obj.segments == segments
+    np.testing.assert_array_equal(obj.vertex_array[obj.edges], np.array(segments, dtype=float))
+
+
+def test_chain_edges_groups_connected_runs():
+    indices, offsets = Objeto3D._chain_edges(np.array([[0, 1], [1, 2], [2, 0], [3, 1], [4, 5], [5, 6]]))
+    np.testing.assert_array_equal(indices, [0, 1, 2, 0, 3, 1, 4, 5, 6])
+    np.testing.assert_array_equal(offsets, [0, 4, 6, 9])
+    indices, offsets = Objeto3D._chain_edges(np.empty((0, 2), dtype=np.intp))
+    assert len(indices) == 0 and offsets.tolist() == [0]
+
+
+def test_vertices_require_valid_edges():
+    vertices = [(0, 0, 0), (1, 0, 0), (0, 1, 0)]
+    with pytest.raises(ValueError):
+        Objeto3D(vertices=vertices)
+    with pytest.raises(ValueError):
+        Objeto3D(vertices=vertices, edges=[(0, 3)])
+    obj = Objeto3D(vertices=vertices, edges=[(0, 1), (1, 2)])
+    assert obj.segments == [(vertices[0], vertices[1]), (vertices[1], vertices[2])]
+    np.testing.assert_array_equal(obj.chains[0], [0, 1, 2])
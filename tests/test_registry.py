@@ -0,0 +1,33 @@
+from registry import ObjectRegistry
+
+
+class _Obj:
+    def __init__(self, name, type_):
+        self.name = name
+        self.type = type_
+
+
+def test_lookup_by_name_and_type():
+    a, b, c = _Obj("a", "Reta"), _Obj("b", "Ponto"), _Obj("c", "Reta")
+    registry = ObjectRegistry([a, b, c])
+    assert len(registry) == 3 and "b" in registry
+    assert registry.get("c") is c
+    assert registry.get("missing") is None
+    assert registry.of_type("Reta") == [a, c]
+    assert registry.of_type("Polígono") == []
+
+
+def test_remove_only_drops_the_registered_object():
+    old, new = _Obj("a", "Reta"), _Obj("a", "Reta")
+    registry = ObjectRegistry([old])
+    registry.add(new)
+    registry.remove(old)
+    assert registry.get("a") is new
+    registry.remove(new)
+    assert "a" not in registry and registry.of_type("Reta") == []
+
+
+def test_rebuild_replaces_contents():
+    registry = ObjectRegistry([_Obj("a", "Reta")])
+    registry.rebuild([_Obj("b", "Ponto")])
+    assert "a" not in registry and registry.get("b").type == "Ponto"
@@ -0,0 +1,126 @@
+from renderer import RetainedCanvas
+
+
+class StackCanvas:
+    """Canvas mínimo que guarda a ordem de empilhamento e o estado dos itens, como o tk.Canvas."""
+
+    def __init__(self):
+        self.stack = []
+        self.state = {}
+        self.coords_of = {}
+        self._next_id = 1
+        self.raised = 0
+
+    def create_line(self, *args, **options):
+        item_id = self._next_id
+        self._next_id += 1
+        self.stack.append(item_id)
+        self.state[item_id] = "normal"
+        self.coords_of[item_id] = args
+        return item_id
+
+    def coords(self, item_id, *args):
+        self.coords_of[item_id] = args
+
+    def itemconfigure(self, item_id, **options):
+        if "state" in options:
+            self.state[item_id] = options["state"]
+
+    def delete(self, item_id):
+        self.stack.remove(item_id)
+        del self.state[item_id], self.coords_of[item_id]
+
+    def tag_raise(self, item_id, above):
+        self.raised += 1
+        self.stack.remove(item_id)
+        self.stack.insert(self.stack.index(above) + 1, item_id)
+
+    def tag_lower(self, item_id):
+        self.stack.remove(item_id)
+        self.stack.insert(0, item_id)
+
+    def visible_coords(self):
+        return [self.coords_of[i] for i in self.stack if self.state[i] != "hidden"]
+
+
+def draw(renderer, frame):
+    renderer.begin_frame()
+    for key, lines in frame:
+        renderer.begin_object(key)
+        for line in lines:
+            renderer.create_line(*line, fill="white")
+    renderer.end_frame()
+
+
+def test_items_are_reused_between_frames():
+    canvas = StackCanvas()
+    renderer = RetainedCanvas(canvas)
+    draw(renderer, [("a", [(0, 0, 1, 1)]), ("b", [(1, 1, 2, 2)])])
+    ids = list(canvas.stack)
+    draw(renderer, [("a", [(0, 0, 3, 3)]), ("b", [(1, 1, 4, 4)])])
+    assert canvas.stack == ids
+    assert canvas.visible_coords() == [(0, 0, 3, 3), (1, 1, 4, 4)]
+
+
+def test_new_items_are_stacked_in_emit_order():
+    canvas = StackCanvas()
+    renderer = RetainedCanvas(canvas)
+    draw(renderer, [("a", [(0,)]), ("b", [(1,)]), ("c", [(2,)])])
+    # 'a' ganha uma primitiva e 'b' muda de tipo de opções: os itens novos não podem ir para o topo
+    renderer.begin_frame()
+    renderer.begin_object("a")
+    renderer.create_line(0, fill="white")
+    renderer.create_line(0.5, fill="white")
+    renderer.begin_object("b")
+    renderer.create_line(1, fill="white", width=2)
+    renderer.begin_object("c")
+    renderer.create_line(2, fill="white")
+    renderer.end_frame()
+    assert canvas.visible_coords() == [(0,), (0.5,), (1,), (2,)]
+
+
+def test_first_new_item_goes_to_the_bottom():
+    canvas = StackCanvas()
+    renderer = RetainedCanvas(canvas)
+    draw(renderer, [("b", [(1,)])])
+    draw(renderer, [("a", [(0,)]), ("b", [(1,)])])
+    assert canvas.visible_coords() == [(0,), (1,)]
+
+
+def test_reshown_items_are_restacked():
+    canvas = StackCanvas()
+    renderer = RetainedCanvas(canvas)
+    draw(renderer, [("a", [(0,)]), ("b", [(1,)]), ("c", [(2,)])])
+    # 'b' é descartado e, enquanto oculto, o item de 'c' é substituído logo acima do de 'a'
+    renderer.begin_frame()
+    renderer.begin_object("a")
+    renderer.create_line(0, fill="white")
+    renderer.begin_object("c")
+    renderer.create_line(2, fill="white", width=2)
+    renderer.end_frame()
+    renderer.begin_frame()
+    for key, value in (("a", 0), ("b", 1)):
+        renderer.begin_object(key)
+        renderer.create_line(value, fill="white")
+    renderer.begin_object("c")
+    renderer.create_line(2, fill="white", width=2)
+    renderer.end_frame()
+    assert canvas.visible_coords() == [(0,), (1,), (2,)]
+
+
+def test_forget_deletes_items():
+    canvas = StackCanvas()
+    renderer = RetainedCanvas(canvas)
+    draw(renderer, [("a", [(0,), (1,)]), ("b", [(2,)])])
+    renderer.forget("a")
+    assert renderer.item_count == 1
+    assert canvas.visible_coords() == [(2,)]
+
+
+def test_items_created_in_order_are_not_restacked():
+    canvas = StackCanvas()
+    renderer = RetainedCanvas(canvas)
+    draw(renderer, [("a", [(0,), (1,)]), ("b", [(2,)])])
+    draw(renderer, [("a", [(0,), (1,)]), ("b", [(2,), (3,)]), ("c", [(4,)])])
+    assert canvas.raised == 0
+    assert canvas.visible_coords() == [(0,), (1,), (2,), (3,), (4,)]
@@ -0,0 +1,37 @@
+from spatial_index import SpatialGrid
+
+
+def test_query_returns_intersecting_objects_in_insertion_order():
+    grid = SpatialGrid(cell_size=10)
+    grid.insert("far", (100, 100, 110, 110))
+    grid.insert("b", (5, 5, 15, 15))
+    grid.insert("a", (0, 0, 2, 2))
+    assert grid.query(0, 0, 20, 20) == ["b", "a"]
+    assert grid.query(-1000, -1000, 1000, 1000) == ["far", "b", "a"]
+
+
+def test_objects_without_bbox_are_always_candidates():
+    grid = SpatialGrid(cell_size=10)
+    grid.insert("3d", None)
+    grid.insert("huge", (-1e6, -1e6, 1e6, 1e6))
+    assert grid.query(500, 500, 510, 510) == ["3d", "huge"]
+
+
+def test_update_keeps_order_and_moves_cells():
+    grid = SpatialGrid(cell_size=10)
+    grid.insert("a", (0, 0, 1, 1))
+    grid.insert("b", (0, 0, 1, 1))
+    grid.update("a", (50, 50, 51, 51))
+    assert grid.query(0, 0, 5, 5) == ["b"]
+    assert grid.query(0, 0, 60, 60) == ["a", "b"]
+
+
+def test_remove_and_rebuild():
+    grid = SpatialGrid(cell_size=10)
+    grid.insert("a", (0, 0, 1, 1))
+    grid.remove("a")
+    grid.remove("a")
+    assert len(grid) == 0 and grid.query(0, 0, 5, 5) == []
+    grid.rebuild([("x", (0, 0, 1, 1)), ("y", None)])
+    assert "x" in grid and len(grid) == 2
+    assert grid.query(0, 0, 5, 5) == ["x", "y"]
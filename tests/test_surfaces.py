@@ -0,0 +1,103 @@
+import numpy as np
+
+from objects import BezierPatch, BSplineSurface, BSPLINE_MATRIX, forward_difference_matrix, forward_difference_sequence
+from viewing import Camera
+
+WINDOW = {"xmin": -100, "ymin": -50, "xmax": 100, "ymax": 50, "rotation": 0}
+
+
+def _net(rows, cols, seed=0):
+    x, y = np.meshgrid(np.linspace(-80, 80, cols), np.linspace(-40, 40, rows))
+    z = np.random.default_rng(seed).uniform(-5, 5, x.shape)
+    return np.stack([x, y, z], axis=-1)
+
+
+def _camera():
+    camera = Camera()
+    camera.update(WINDOW, "parallel", Camera.DEFAULT_D)
+    return camera
+
+
+def test_knot_grid_points_are_patch_corners():
+    control = _net(9, 8)
+    mask = np.ones((6, 5), dtype=bool)
+    grid = BSplineSurface._knot_grid(control, mask, 1)[0]
+    patches = BSplineSurface._tessellate(control, 1).reshape(6, 5, 2, 2, 3)
+    np.testing.assert_allclose(grid[:-1, :-1], patches[:, :, 0, 0], atol=1e-12)
+    np.testing.assert_allclose(grid[-1, -1], patches[-1, -1, 1, 1], atol=1e-12)
+
+
+def test_coarse_level_of_detail_samples_the_same_surface():
+    control = _net(60, 60)
+    surface = BSplineSurface(control.tolist(), resolution=40)
+    assert surface.patch_count * 41 ** 2 > surface.MAX_MESH_POINTS
+    # Patches de bem menos de um pixel: a malha pula patches, mas sem mudar a superfície
+    grids = list(surface.visible_patch_grids(_camera().project, WINDOW, pixel_size=50.0))
+    assert len(grids) == 1 and grids[0].shape[0] == 1
+    corners = BSplineSurface._knot_grid(control, np.ones((57, 57), dtype=bool), 1)[0]
+    points = grids[0][0].reshape(-1, 3)
+    distances = np.abs(corners.reshape(-1, 1, 3) - points[None]).max(axis=-1).min(axis=0)
+    assert distances.max() < 1e-9
+    assert len(points) < len(corners.reshape(-1, 3))
+
+
+def test_small_nets_use_the_cached_full_resolution_patches():
+    surface = BSplineSurface(_net(5, 6).tolist(), resolution=6)
+    grids = list(surface.visible_patch_grids(_camera().project, WINDOW, pixel_size=0.5))
+    assert len(grids) == 1
+    np.testing.assert_allclose(grids[0], surface.surface_patches)
+
+
+def _bernstein_point(control, u, v):
+    """Avaliação ponto a ponto da superfície de Bézier por combinação linear dos 16 pontos."""
+    bu = [(1 - u)**3, 3 * u * (1 - u)**2, 3 * u**2 * (1 - u), u**3]
+    bv = [(1 - v)**3, 3 * v * (1 - v)**2, 3 * v**2 * (1 - v), v**3]
+    point = np.zeros(3)
+    for i in range(4):
+        for j in range(4):
+            point += bu[i] * bv[j] * np.asarray(control[i * 4 + j], dtype=float)
+    return point
+
+
+def test_evaluate_patches_matches_pointwise_bernstein():
+    control = np.random.default_rng(4).uniform(-10, 10, (16, 3)).tolist()
+    patch = BezierPatch(control, resolution=9)
+    params = np.linspace(0, 1, 9)
+    expected = [[_bernstein_point(control, u, v) for v in params] for u in params]
+    np.testing.assert_allclose(patch.surface_points, expected, rtol=0, atol=1e-13)
+
+
+def _forward_difference_patch(G, n):
+    """Laço por patch das diferenças adiante, com G (3, 4, 4): uma matriz de geometria por coordenada."""
+    DD = forward_difference_matrix(n) @ (BSPLINE_MATRIX @ G @ BSPLINE_MATRIX.T) @ forward_difference_matrix(n).T
+    points = np.zeros((n + 1, n + 1, 3))
+    for i in range(n + 1):
+        curve = DD.copy()
+        for j in range(n + 1):
+            points[i, j] = curve[:, 0, 0]
+            curve[:, :, 0] += curve[:, :, 1]
+            curve[:, :, 1] += curve[:, :, 2]
+            curve[:, :, 2] += curve[:, :, 3]
+        DD[:, 0, :] += DD[:, 1, :]
+        DD[:, 1, :] += DD[:, 2, :]
+        DD[:, 2, :] += DD[:, 3, :]
+    return points
+
+
+def test_tessellate_matches_per_patch_forward_differences():
+    control = _net(6, 7, seed=5)
+    patches = BSplineSurface._tessellate(control, 8)
+    expected = [_forward_difference_patch(np.moveaxis(control[i:i + 4, j:j + 4], -1, 0), 8)
+                for i in range(3) for j in range(4)]
+    np.testing.assert_allclose(patches, expected, rtol=0, atol=1e-13)
+
+
+def test_forward_difference_sequence_matches_stepwise_updates():
+    differences = np.random.default_rng(6).uniform(-1, 1, (5, 4))
+    values = forward_difference_sequence(differences, 12)
+    state = differences.copy()
+    for k in range(12):
+        np.testing.assert_allclose(values[k], state[:, 0], rtol=0, atol=1e-13)
+        state[:, 0] += state[:, 1]
+        state[:, 1] += state[:, 2]
+        state[:, 2] += state[:, 3]
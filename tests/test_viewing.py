@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from viewing import Camera, window_to_viewport
+
+WINDOW = {"xmin": -100, "ymin": -50, "xmax": 100, "ymax": 50, "rotation": 0}
+VIEWPORT = {"xmin": 20, "ymin": 20, "xmax": 420, "ymax": 220}
+
+
+def test_window_to_viewport_maps_corners():
+    points = [(-100, -50), (100, 50), (0, 0)]
+    result = window_to_viewport(points, WINDOW, VIEWPORT)
+    np.testing.assert_allclose(result, [(20, 220), (420, 20), (220, 120)])
+
+
+def test_camera_must_be_updated_before_projecting():
+    with pytest.raises(RuntimeError):
+        Camera().project([(0, 0, 0)])
+
+
+def test_camera_caches_the_matrix_until_the_view_changes():
+    camera = Camera()
+    assert camera.update(WINDOW, "parallel", Camera.DEFAULT_D)
+    matrix = camera.matrix
+    assert not camera.update(dict(WINDOW), "parallel", Camera.DEFAULT_D)
+    assert camera.matrix is matrix
+    assert camera.update(WINDOW, "perspective", Camera.DEFAULT_D)
+    assert camera.update(dict(WINDOW, xmin=-90), "perspective", Camera.DEFAULT_D)
+
+
+def test_parallel_projection_drops_z_relative_to_window_center():
+    camera = Camera()
+    window = dict(WINDOW, xmin=0, xmax=200)
+    camera.update(window, "parallel", Camera.DEFAULT_D)
+    projected = camera.project([(100, 0, 0), (150, 20, 500)])
+    np.testing.assert_allclose(projected, [(0, 0), (50, 20)])
+
+
+def test_perspective_projection_divides_by_depth():
+    camera = Camera()
+    camera.update(WINDOW, "perspective", 100)
+    projected = camera.project([(50, 20, 0), (50, 20, 100)])
+    np.testing.assert_allclose(projected, [(50, 20), (25, 10)])
+
+
+def test_perspective_points_behind_the_cop_are_nan():
+    camera = Camera()
+    camera.update(WINDOW, "perspective", 100)
+    projected = camera.project([(0, 0, -100), (0, 0, -200), (0, 0, 0)])
+    assert np.isnan(projected[:2]).all()
+    assert np.isfinite(projected[2]).all()
+
+
+def test_invalid_d_falls_back_to_default():
+    camera = Camera()
+    camera.update(WINDOW, "perspective", 0)
+    assert camera.d == Camera.DEFAULT_D
@@ -0,0 +1,134 @@
+import math
+import numpy as np
+
+
+def window_to_viewport(points, window, viewport, rotate=True):
+    """
+    Mapeia um array (N,2) de coordenadas da window para a viewport em uma única passada.
+    O centro da window, o seno/cosseno da rotação e a escala são calculados uma só vez.
+    Com rotate=False a rotação da window é ignorada (pontos já projetados do 3D).
+    Retorna um array (N,2) com as coordenadas na viewport.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+
+    window_width = window["xmax"] - window["xmin"]
+    window_height = window["ymax"] - window["ymin"]
+    viewport_width = viewport["xmax"] - viewport["xmin"]
+    viewport_height = viewport["ymax"] - viewport["ymin"]
+    scale = min(viewport_width / window_width, viewport_height / window_height)
+
+    x = points[:, 0]
+    y = points[:, 1]
+
+    if rotate and window.get("rotation", 0):
+        # Aplica a rotação inversa em torno do centro da window
+        cx = (window["xmin"] + window["xmax"]) / 2
+        cy = (window["ymin"] + window["ymax"]) / 2
+        theta = -window["rotation"]
+        cos_t, sin_t = math.cos(theta), math.sin(theta)
+        dx = x - cx
+        dy = y - cy
+        x = dx * cos_t - dy * sin_t + cx
+        y = dx * sin_t + dy * cos_t + cy
+
+    result = np.empty_like(points)
+    result[:, 0] = viewport["xmin"] + (x - window["xmin"]) * scale
+    result[:, 1] = viewport["ymax"] - (y - window["ymin"]) * scale
+    return result
+
+
+def view_matrix(window):
+    """
+    Monta a matriz 4x4 (convenção de vetor coluna) que leva o mundo para o sistema da view:
+    VRP no centro da window, VPN ao longo de Z e VUP ao longo de Y.
+    """
+    vrp = np.array([
+        (window["xmin"] + window["xmax"]) / 2,
+        (window["ymin"] + window["ymax"]) / 2,
+        0
+    ])
+    vpn = np.array([0, 0, 1])
+    vup = np.array([0, 1, 0])
+
+    n = vpn / np.linalg.norm(vpn)
+    u = np.cross(vup, n)
+    u = u / np.linalg.norm(u)
+    v = np.cross(n, u)
+
+    R = np.array([
+        [u[0], u[1], u[2], 0],
+        [v[0], v[1], v[2], 0],
+        [n[0], n[1], n[2], 0],
+        [0,    0,    0,    1]
+    ])
+    T = np.array([
+        [1, 0, 0, -vrp[0]],
+        [0, 1, 0, -vrp[1]],
+        [0, 0, 1, -vrp[2]],
+        [0, 0, 0, 1]
+    ])
+    return R @ T
+
+
+class Camera:
+    """
+    Câmera sintética que guarda em cache a matriz completa mundo -> view -> projeção.
+    A matriz é montada uma vez por quadro e só é invalidada quando a window,
+    o tipo de projeção ou a distância 'd' mudam.
+    """
+    DEFAULT_D = 200
+
+    def __init__(self):
+        self.projection = "parallel"
+        self.d = self.DEFAULT_D
+        self._key = None
+        self._matrix = None
+
+    def update(self, window, projection, d):
+        """Sincroniza a câmera com o estado atual; retorna True se a matriz foi recalculada."""
+        if d <= 1e-6:  # d deve ser positivo e não muito pequeno
+            d = self.DEFAULT_D
+        key = (window["xmin"], window["ymin"], window["xmax"], window["ymax"], projection, d)
+        if key == self._key:
+            return False
+
+        self._key = key
+        self.projection = projection
+        self.d = d
+        self._matrix = self._projection_matrix() @ view_matrix(window)
+        return True
+
+    @property
+    def matrix(self):
+        return self._matrix
+
+    def _projection_matrix(self):
+        if self.projection == "perspective":
+            # COP em (0,0,-d) no sistema da view, plano de projeção em z_view=0
+            d = self.d
+            return np.array([
+                [d, 0, 0, 0],
+                [0, d, 0, 0],
+                [0, 0, 0, 0],
+                [0, 0, 1, d]
+            ], dtype=float)
+        # Projeção Paralela Ortogonal - descarta a coordenada Z
+        return np.diag([1.0, 1.0, 0.0, 1.0])
+
+    def project(self, points):
+        """
+        Projeta um array (N,3) de pontos do mundo em uma única multiplicação de matrizes.
+        Retorna um array (N,2) no plano de projeção; pontos no COP ou atrás dele viram NaN.
+        """
+        if self._matrix is None:
+            raise RuntimeError("Câmera não sincronizada: chame update() antes de projetar")
+
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        M = self._matrix
+        homogeneous = points @ M[:, :3].T + M[:, 3]
+        w = homogeneous[:, 3]
+
+        projected = np.full((len(points), 2), np.nan)
+        valid = w >= 1e-6
+        projected[valid] = homogeneous[valid, :2] / w[valid, None]
+        return projected